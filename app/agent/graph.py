@@ -56,10 +56,13 @@ Guidelines:
 
 
 def run_agent(
-    user_message: str, db: Optional[Session] = None, current_user: Optional[User] = None
+    user_message: str,
+    db: Optional[Session] = None,
+    current_user: Optional[User] = None,
+    read_db: Optional[Session] = None,
 ) -> str:
     if db and current_user:
-        ToolContext.set_context(db, current_user)
+        ToolContext.set_context(db, current_user, read_db=read_db)
 
     try:
         agent_executor = get_agent_executor()
@@ -1,24 +1,73 @@
 """Base utilities for agent tools."""
 
+from contextvars import ContextVar
 from typing import Optional
 
 from sqlalchemy.orm import Session
 
 from app.models.user import User
 
+_current: "ContextVar[Optional[ToolContext]]" = ContextVar(
+    "tool_context", default=None
+)
 
-class ToolContext:
-    """Thread-local context for database session and current user."""
 
-    db: Optional[Session] = None
-    current_user: Optional[User] = None
+class _CurrentContext(type):
+    """Class attribute access (``ToolContext.db``) to the current run's context."""
+
+    @property
+    def db(cls) -> Optional[Session]:
+        context = _current.get()
+        return context.db if context else None
+
+    @property
+    def read_db(cls) -> Optional[Session]:
+        context = _current.get()
+        return context.read_db if context else None
+
+    @property
+    def current_user(cls) -> Optional[User]:
+        context = _current.get()
+        return context.current_user if context else None
+
+    @property
+    def has_written(cls) -> bool:
+        context = _current.get()
+        return context.has_written if context else False
+
+
+class ToolContext(metaclass=_CurrentContext):
+    """Database sessions and current user of one agent run.
+
+    Each run gets its own instance, held in a context variable, so runs in
+    other threads or tasks never see its sessions or its ``has_written``.
+    """
+
+    def __init__(
+        self, db: Session, user: User, read_db: Optional[Session] = None
+    ):
+        self.db = db
+        self.read_db = read_db
+        self.current_user = user
+        self.has_written = False
 
     @classmethod
-    def set_context(cls, db: Session, user: User):
-        cls.db = db
-        cls.current_user = user
+    def set_context(cls, db: Session, user: User, read_db: Optional[Session] = None):
+        _current.set(cls(db, user, read_db=read_db))
 
     @classmethod
     def clear_context(cls):
-        cls.db = None
-        cls.current_user = None
+        _current.set(None)
+
+    @classmethod
+    def reader(cls) -> Optional[Session]:
+        """Session for read-only tools; the primary once this run has written."""
+        if cls.has_written or cls.read_db is None:
+            return cls.db
+        return cls.read_db
+
+    @classmethod
+    def mark_written(cls):
+        context = _current.get()
+        if context is not None:
+            context.has_written = True
@@ -2,9 +2,10 @@
 
 from langchain_core.tools import tool
 
-from app.models.task import Task, TaskStatus
 from app.models.project import Project
 from app.agent.tools.base import ToolContext
+from app.core.response_cache import response_cache
+from app.repositories import task_stats_repository
 
 
 @tool
@@ -13,7 +14,7 @@ def get_project_tool(project_name: str) -> str:
     if not ToolContext.db or not ToolContext.current_user:
         return "Error: Database context not available."
 
-    db = ToolContext.db
+    db = ToolContext.reader()
     user = ToolContext.current_user
 
     project = (
@@ -28,7 +29,8 @@ def get_project_tool(project_name: str) -> str:
     if not project:
         return f"❌ Project containing '{project_name}' not found."
 
-    task_count = db.query(Task).filter(Task.project_id == project.id).count()
+    stats = task_stats_repository.get_stats(db, [project.id]).get(project.id)
+    task_count = task_stats_repository.as_dict(stats)["total"]
     member_count = len(project.members) if project.members else 0
 
     return (
@@ -72,6 +74,8 @@ def create_project_tool(name: str, description: str = "") -> str:
     )
     db.add(new_project)
     db.commit()
+    ToolContext.mark_written()
+    response_cache.invalidate(user.organization_id, "projects")
     db.refresh(new_project)
 
     return f"✅ Created project '{new_project.name}' (ID: {new_project.id})"
@@ -117,6 +121,8 @@ def update_project_tool(
         return "❌ No updates provided. Specify new_name or new_description."
 
     db.commit()
+    ToolContext.mark_written()
+    response_cache.invalidate(user.organization_id, "projects")
     return f"✅ Updated project '{project.name}': {', '.join(updates)}"
 
 
@@ -126,7 +132,7 @@ def project_stats_tool(project_name: str = "") -> str:
     if not ToolContext.db or not ToolContext.current_user:
         return "Error: Database context not available."
 
-    db = ToolContext.db
+    db = ToolContext.reader()
     user = ToolContext.current_user
 
     projects_query = db.query(Project).filter(
@@ -141,28 +147,14 @@ def project_stats_tool(project_name: str = "") -> str:
     if not projects:
         return "No projects found."
 
+    stats = task_stats_repository.get_stats(db, [p.id for p in projects])
     stats_lines = []
     for p in projects:
-        todo_count = (
-            db.query(Task)
-            .filter(Task.project_id == p.id, Task.status == TaskStatus.TODO)
-            .count()
-        )
-        in_progress_count = (
-            db.query(Task)
-            .filter(Task.project_id == p.id, Task.status == TaskStatus.IN_PROGRESS)
-            .count()
-        )
-        done_count = (
-            db.query(Task)
-            .filter(Task.project_id == p.id, Task.status == TaskStatus.DONE)
-            .count()
-        )
-
-        total = todo_count + in_progress_count + done_count
+        counts = task_stats_repository.as_dict(stats.get(p.id))
         stats_lines.append(
-            f"📁 {p.name}: Todo={todo_count}, In Progress={in_progress_count}, "
-            f"Done={done_count}, Total={total}"
+            f"📁 {p.name}: Todo={counts['todo']}, "
+            f"In Progress={counts['in-progress']}, Done={counts['done']}, "
+            f"Overdue={counts['overdue']}, Total={counts['total']}"
         )
 
     return "📊 Project Statistics:\n" + "\n".join(stats_lines)
@@ -5,9 +5,10 @@ from datetime import datetime
 from langchain_core.tools import tool
 
 from app.core.rag import search_tasks
-from app.models.task import Task, TaskStatus, TaskPriority
+from app.models.task import Task, TaskStatus, TaskPriority, task_is_open
 from app.models.project import Project
 from app.agent.tools.base import ToolContext
+from app.core.response_cache import response_cache
 
 
 @tool
@@ -22,7 +23,7 @@ def list_tasks_tool(filter_type: str = "all") -> str:
     if not ToolContext.db or not ToolContext.current_user:
         return "Error: Database context not available."
 
-    db = ToolContext.db
+    db = ToolContext.reader()
     user = ToolContext.current_user
 
     tasks_query = (
@@ -32,9 +33,7 @@ def list_tasks_tool(filter_type: str = "all") -> str:
     )
 
     if filter_type == "overdue":
-        tasks_query = tasks_query.filter(
-            Task.due_date < datetime.now(), Task.status != TaskStatus.DONE
-        )
+        tasks_query = tasks_query.filter(Task.overdue_at.is_not(None), task_is_open)
     elif filter_type == "high-priority":
         tasks_query = tasks_query.filter(Task.priority == TaskPriority.HIGH)
     elif filter_type == "my-tasks":
@@ -131,6 +130,8 @@ def create_task_tool(
     )
     db.add(new_task)
     db.commit()
+    ToolContext.mark_written()
+    response_cache.invalidate(user.organization_id, "tasks")
     db.refresh(new_task)
 
     assignee_name_final = assignee.full_name if assignee else user.full_name
@@ -178,6 +179,8 @@ def update_task_tool(task_title: str, new_status: str) -> str:
 
     task.status = status_map[new_status_lower]
     db.commit()
+    ToolContext.mark_written()
+    response_cache.invalidate(user.organization_id, "tasks")
 
     return f"✅ Task '{task.title}' status updated to {new_status_lower}"
 
@@ -188,7 +191,7 @@ def get_task_tool(task_identifier: str) -> str:
     if not ToolContext.db or not ToolContext.current_user:
         return "Error: Database context not available."
 
-    db = ToolContext.db
+    db = ToolContext.reader()
     user = ToolContext.current_user
 
     task = (
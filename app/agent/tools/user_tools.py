@@ -2,6 +2,9 @@
 
 from langchain_core.tools import tool
 
+from app.core.membership_cache import membership_cache
+from app.core.principal_cache import principal_cache
+from app.core.response_cache import response_cache
 from app.models.user import User
 from app.agent.tools.base import ToolContext
 
@@ -12,7 +15,7 @@ def get_user_tool(user_identifier: str) -> str:
     if not ToolContext.db or not ToolContext.current_user:
         return "Error: Database context not available."
 
-    db = ToolContext.db
+    db = ToolContext.reader()
     current_user = ToolContext.current_user
 
     user = (
@@ -42,7 +45,7 @@ def list_users_tool(role_filter: str = "") -> str:
     if not ToolContext.db or not ToolContext.current_user:
         return "Error: Database context not available."
 
-    db = ToolContext.db
+    db = ToolContext.reader()
     current_user = ToolContext.current_user
 
     from app.models.user import UserRole
@@ -111,6 +114,7 @@ def create_user_tool(
     )
     db.add(new_user)
     db.commit()
+    ToolContext.mark_written()
     db.refresh(new_user)
 
     return f"✅ Created user '{new_user.full_name}' ({new_user.email}) with role {user_role.value}"
@@ -171,6 +175,10 @@ def update_user_tool(
         return "❌ No updates provided."
 
     db.commit()
+    ToolContext.mark_written()
+    principal_cache.invalidate(user.id)
+    membership_cache.invalidate(user.id)
+    response_cache.invalidate(user.organization_id, "users")
     return f"✅ Updated user '{user.full_name}': {', '.join(updates)}"
 
 
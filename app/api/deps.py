@@ -1,15 +1,21 @@
-from typing import Generator, Optional
+from datetime import datetime
+from typing import AsyncGenerator, Callable, Generator, List, Optional
 
-from fastapi import Cookie, Depends, HTTPException, Request, status
+from fastapi import Cookie, Depends, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core import security
 from app.config import settings
-from app.db.session import SessionLocal
+from app.core.cookie_utils import READ_PRIMARY_COOKIE
+from app.core.principal_cache import Principal, principal_cache
+from app.core.tokens import TokenError, token_verifier
+from app.db.session import AsyncSessionLocal, ReplicaSessionLocal, SessionLocal
 from app.models.user import User
+from app.schemas.fieldsets import Fieldset, SparseSchema
+from app.schemas.task import TaskFilters
 from app.schemas.token import TokenPayload
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -25,6 +31,28 @@ def get_db() -> Generator:
         db.close()
 
 
+def get_read_db(request: Request, db: Session = Depends(get_db)) -> Generator:
+    """Session for read-only work: a replica unless the client recently wrote.
+
+    Sessions open their connection lazily, so the primary ``db`` costs
+    nothing when the replica is used.
+    """
+    if not ReplicaSessionLocal.enabled or request.cookies.get(READ_PRIMARY_COOKIE):
+        yield db
+        return
+
+    replica = ReplicaSessionLocal()
+    try:
+        yield replica
+    finally:
+        replica.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def get_token_from_cookie_or_header(
     request: Request,
     token_header: Optional[str] = Depends(reusable_oauth2),
@@ -44,20 +72,29 @@ def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(get_token_from_cookie_or_header),
 ) -> User:
+    """The authenticated user as a detached ``User`` built from its principal.
+
+    Cache hits and misses return the same representation: only the columns
+    of ``Principal`` are set. Endpoints that return or modify the user load
+    it from the database.
+    """
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
+        payload = token_verifier.decode(token)
         token_data = TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
+    except (TokenError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(User).filter(User.id == int(token_data.sub)).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
+    user_id = int(token_data.sub)
+    principal = principal_cache.get(user_id, token)
+    if principal is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal = Principal.from_user(user)
+        principal_cache.set(user_id, token, principal, token_exp=payload.get("exp"))
+    return principal.to_user()
 
 
 def get_current_active_user(
@@ -78,3 +115,42 @@ def get_current_active_admin(
             status_code=400, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+def fieldset_params(resource: SparseSchema) -> Callable[..., Fieldset]:
+    """``fields=`` and ``expand=`` query parameters for a list endpoint."""
+
+    def dependency(
+        fields: Optional[str] = None, expand: Optional[str] = None
+    ) -> Fieldset:
+        try:
+            return resource.parse(fields, expand)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return dependency
+
+
+def task_filters(
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    status: List[str] = Query([]),
+    priority: List[str] = Query([]),
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    overdue: Optional[bool] = None,
+    q: Optional[str] = None,
+    sort: str = "id",
+) -> TaskFilters:
+    """Task list filters from the query string; see ``TaskFilters``."""
+    params = locals()
+    try:
+        return TaskFilters(**params)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("query", *error["loc"])} for error in e.errors()]
+        )
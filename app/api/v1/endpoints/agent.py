@@ -32,6 +32,7 @@ def sync_knowledge_base(
 def chat_with_agent(
     request: ChatRequest,
     db: Session = Depends(deps.get_db),
+    read_db: Session = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     if not settings.GEMINI_API_KEY:
@@ -39,7 +40,10 @@ def chat_with_agent(
 
     try:
         response_text = run_agent(
-            user_message=request.message, db=db, current_user=current_user
+            user_message=request.message,
+            db=db,
+            current_user=current_user,
+            read_db=read_db,
         )
 
         data = ChatResponse(response=response_text, actions=[])
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Cookie, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api import deps
@@ -12,13 +13,17 @@ router = APIRouter()
 
 
 @router.post("/login")
-def login_access_token(
+async def login_access_token(
     response: Response,
     login_data: LoginRequest,
     db: Session = Depends(deps.get_db),
 ):
-    user = db.query(User).filter(User.email == login_data.email).first()
-    if not user or not security.verify_password(
+    # bcrypt is awaited on the hasher pool so a burst of logins does not
+    # hold request threadpool slots while it runs.
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == login_data.email).first()
+    )
+    if not user or not await security.averify_password(
         login_data.password, user.hashed_password
     ):
         raise HTTPException(
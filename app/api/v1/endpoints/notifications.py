@@ -1,9 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.config import settings
+from app.core.notification_broker import format_sse, notification_broker
 from app.models.extras import Notification as NotificationModel
 from app.models.user import User
+from app.repositories.aio import async_notification_repository
+from app.repositories.base import next_cursor
+from app.repositories.notification_repository import (
+    get_since,
+    get_unread_count,
+    mark_all_read,
+    mark_as_read,
+)
 from app.schemas.notification import Notification
 from app.schemas.api_response import ApiResponse
 
@@ -11,22 +28,93 @@ router = APIRouter()
 
 
 @router.get("/")
-def read_notifications(
-    db: Session = Depends(deps.get_db),
+async def read_notifications(
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    notifications = (
-        db.query(NotificationModel)
-        .filter(NotificationModel.user_id == current_user.id)
-        .order_by(NotificationModel.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    # Served on the async engine; it has no replicas yet, so this reads the
+    # primary.
+    try:
+        notifications = await async_notification_repository.get_by_user(
+            db, current_user.id, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ApiResponse.json_response(
+        data=notifications,
+        schema=Notification,
+        message="Notifications retrieved successfully",
+        cursor=cursor,
+        next_cursor=next_cursor(notifications, limit),
     )
+
+
+@router.get("/unread-count")
+def read_unread_count(
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    return ApiResponse.success_response(
+        data={"unread": get_unread_count(db, current_user.id)},
+        message="Unread count retrieved successfully",
+    )
+
+
+@router.put("/mark-all-read")
+def mark_all_notifications_read(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    updated = mark_all_read(db, current_user.id)
+    db.commit()
     return ApiResponse.success_response(
-        data=notifications, message="Notifications retrieved successfully"
+        data={"updated": updated}, message="All notifications marked as read"
+    )
+
+
+async def notification_events(
+    request: Request, user_id: int, missed: List[dict]
+) -> AsyncIterator[str]:
+    async with notification_broker.subscribe(user_id) as queue:
+        yield f"retry: {settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS * 1000}\n\n"
+        for message in missed:
+            yield format_sse(message, event="notification", id=message["id"])
+        while not await request.is_disconnected():
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Comment lines keep proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(message, event="notification", id=message["id"])
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Server-sent events for the current user's new notifications."""
+    missed = []
+    if last_event_id and last_event_id.isdigit():
+        rows = await run_in_threadpool(
+            get_since, db, current_user.id, int(last_event_id)
+        )
+        missed = jsonable_encoder([Notification.model_validate(n) for n in rows])
+    # The stream may stay open for hours; do not hold a pooled connection.
+    await run_in_threadpool(db.close)
+
+    return StreamingResponse(
+        notification_events(request, current_user.id, missed),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -48,8 +136,7 @@ def mark_notification_read(
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
 
-    notification.is_read = True
-    db.add(notification)
+    mark_as_read(db, notification)
     db.commit()
     db.refresh(notification)
     return ApiResponse.success_response(
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core import security
+from app.core.response_cache import response_cache
+from app.models.user import User
 from app.schemas.organization import (
+    Dashboard,
     Organization as OrganizationSchema,
     OrganizationCreate,
     RegisterRequest,
@@ -27,18 +32,38 @@ def create_organization(
 
 
 @router.post("/register")
-def register_organization_and_admin(
+async def register_organization_and_admin(
     *,
     db: Session = Depends(deps.get_db),
     request: RegisterRequest,
 ):
-    result = organization_service.register_with_admin(
-        db,
-        organization_name=request.organization_name,
-        email=request.email,
-        password=request.password,
-        full_name=request.full_name,
+    # Hashed on the hasher pool, as in login, without a request thread.
+    hashed_password = await security.aget_password_hash(request.password)
+    result = await run_in_threadpool(
+        lambda: organization_service.register_with_admin(
+            db,
+            organization_name=request.organization_name,
+            email=request.email,
+            hashed_password=hashed_password,
+            full_name=request.full_name,
+        )
     )
     return ApiResponse.success_response(
         data=result, message="Organization and Admin created", status_code=201
     )
+
+
+@router.get("/{organization_id}/dashboard")
+@response_cache.cached("tasks", "projects", "users")
+def get_dashboard(
+    *,
+    request: Request,
+    db: Session = Depends(deps.get_read_db),
+    organization_id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Everything the dashboard shows, in place of per-project stats calls."""
+    dashboard = organization_service.get_dashboard(db, current_user, organization_id)
+    return ApiResponse.json_response(
+        data=dashboard, schema=Dashboard, message="Dashboard retrieved successfully"
+    )
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.response_cache import response_cache
 from app.models.user import User
+from app.schemas.fieldsets import Fieldset
 from app.schemas.project import (
-    Project as ProjectSchema,
+    PROJECT_FIELDS,
     ProjectCreate,
     AddMemberRequest,
 )
+from app.repositories.base import next_cursor
+from app.schemas.task import Task as TaskSchema
 from app.schemas.api_response import ApiResponse
 from app.services import project_service
 
@@ -15,15 +21,25 @@ router = APIRouter()
 
 
 @router.get("/")
+@response_cache.cached("projects")
 def read_projects(
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fieldset: Fieldset = Depends(deps.fieldset_params(PROJECT_FIELDS)),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    projects = project_service.list_projects(db, current_user, skip=skip, limit=limit)
-    return ApiResponse.success_response(
-        data=projects, message="Projects retrieved successfully"
+    projects = project_service.list_projects(
+        db, current_user, skip=skip, limit=limit, cursor=cursor, fieldset=fieldset
+    )
+    return ApiResponse.json_response(
+        data=projects,
+        schema=PROJECT_FIELDS.schema(fieldset),
+        message="Projects retrieved successfully",
+        cursor=cursor,
+        next_cursor=next_cursor(projects, limit),
     )
 
 
@@ -55,9 +71,11 @@ def add_project_member(
 
 
 @router.get("/{project_id}/stats")
+@response_cache.cached("tasks", "projects")
 def get_project_stats(
     *,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    db: Session = Depends(deps.get_read_db),
     project_id: int,
     current_user: User = Depends(deps.get_current_active_user),
 ):
@@ -68,13 +86,15 @@ def get_project_stats(
 
 
 @router.get("/{project_id}/overdue")
+@response_cache.cached("tasks", "projects", "users")
 def get_overdue_tasks(
     *,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    db: Session = Depends(deps.get_read_db),
     project_id: int,
     current_user: User = Depends(deps.get_current_active_user),
 ):
     tasks = project_service.get_overdue_tasks(db, current_user, project_id)
-    return ApiResponse.success_response(
-        data=tasks, message="Overdue tasks retrieved successfully"
+    return ApiResponse.json_response(
+        data=tasks, schema=TaskSchema, message="Overdue tasks retrieved successfully"
     )
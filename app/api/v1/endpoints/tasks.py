@@ -1,41 +1,127 @@
-from typing import Optional
+import os
+from typing import Literal, Optional
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, UploadFile, File
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    UploadFile,
+)
+from fastapi.responses import (
+    FileResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.models.task import TaskStatus, TaskPriority
+from app.config import settings
+from app.core.response_cache import etag_matches, response_cache
 from app.models.user import User
-from app.schemas.task import Task as TaskSchema, TaskCreate, TaskUpdate, CommentCreate
+from app.schemas.fieldsets import Fieldset
+from app.schemas.task import (
+    TASK_FIELDS,
+    CommentCreate,
+    TaskBulkCreate,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskFilters,
+    TaskInDB,
+    TaskUpdate,
+)
+from app.repositories.base import next_cursor
 from app.schemas.api_response import ApiResponse
 from app.services import task_service
+from app.utils.storage import LocalStorage, get_storage
+from app.utils.task_io import csv_chunks, iter_records, ndjson_chunks
 
 router = APIRouter()
 
 
 @router.get("/")
+@response_cache.cached("tasks", "users")
 def read_tasks(
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    project_id: Optional[int] = None,
-    status: Optional[TaskStatus] = None,
-    priority: Optional[TaskPriority] = None,
-    assignee_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    filters: TaskFilters = Depends(deps.task_filters),
+    fieldset: Fieldset = Depends(deps.fieldset_params(TASK_FIELDS)),
     current_user: User = Depends(deps.get_current_active_user),
 ):
+    """List the organization's tasks.
+
+    Filters combine with AND; see ``TaskFilters`` for the parameters. ``q``
+    runs a full-text search over title and description.
+    """
     tasks = task_service.list_tasks(
         db,
         current_user,
         skip=skip,
         limit=limit,
-        project_id=project_id,
-        status=status,
-        priority=priority,
-        assignee_id=assignee_id,
+        cursor=cursor,
+        filters=filters,
+        fieldset=fieldset,
+    )
+    return ApiResponse.json_response(
+        data=tasks,
+        schema=TASK_FIELDS.schema(fieldset),
+        message="Tasks retrieved successfully",
+        cursor=cursor,
+        next_cursor=next_cursor(tasks, limit, filters.sort),
+    )
+
+
+@router.get("/export")
+def export_tasks(
+    db: Session = Depends(deps.get_read_db),
+    format: Literal["ndjson", "csv"] = "ndjson",
+    project_id: Optional[int] = None,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Stream every task of the organization (or one project) as NDJSON or CSV."""
+    rows = task_service.export_tasks(db, current_user, project_id=project_id)
+    if format == "csv":
+        body, media_type = csv_chunks(rows), "text/csv"
+    else:
+        body, media_type = ndjson_chunks(rows), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
+@router.post("/import")
+def import_tasks(
+    *,
+    db: Session = Depends(deps.get_db),
+    file: UploadFile = File(...),
+    format: Optional[Literal["ndjson", "csv"]] = None,
+    project_id: Optional[int] = None,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Create tasks from an NDJSON or CSV upload (as produced by ``/export``).
+
+    The format defaults to CSV for ``.csv`` files and NDJSON otherwise. Rows
+    without a project go to ``project_id``; invalid rows are skipped and
+    listed in the report.
+    """
+    if format is None:
+        format = "csv" if (file.filename or "").endswith(".csv") else "ndjson"
+    records = iter_records(file.file, format, default_project_id=project_id)
+    report = task_service.import_tasks(
+        db, current_user, records, project_id=project_id
     )
     return ApiResponse.success_response(
-        data=tasks, message="Tasks retrieved successfully"
+        data=report,
+        message=f"{report['imported']} tasks imported, {report['failed']} failed",
+        status_code=201,
     )
 
 
@@ -52,6 +138,35 @@ def create_task(
     )
 
 
+@router.post("/bulk")
+def create_tasks(
+    *,
+    db: Session = Depends(deps.get_db),
+    tasks_in: TaskBulkCreate,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    tasks = task_service.create_tasks(db, current_user, tasks_in.tasks)
+    return ApiResponse.json_response(
+        data=tasks,
+        schema=TaskInDB,
+        message=f"{len(tasks)} tasks created successfully",
+        status_code=201,
+    )
+
+
+@router.patch("/bulk")
+def update_tasks(
+    *,
+    db: Session = Depends(deps.get_db),
+    tasks_in: TaskBulkUpdate,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    tasks = task_service.update_tasks(db, current_user, tasks_in.tasks)
+    return ApiResponse.json_response(
+        data=tasks, schema=TaskInDB, message=f"{len(tasks)} tasks updated successfully"
+    )
+
+
 @router.put("/{task_id}")
 def update_task(
     *,
@@ -79,14 +194,62 @@ def create_comment(
 
 
 @router.post("/{task_id}/attachments")
-def upload_attachment(
+async def upload_attachment(
     *,
     db: Session = Depends(deps.get_db),
     task_id: int,
     file: UploadFile = File(...),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    result = task_service.add_attachment(db, current_user, task_id, file)
+    result = await task_service.add_attachment(db, current_user, task_id, file)
     return ApiResponse.success_response(
         data=result, message="Attachment uploaded successfully", status_code=201
     )
+
+
+@router.get("/{task_id}/attachments/{attachment_id}")
+def download_attachment(
+    *,
+    request: Request,
+    db: Session = Depends(deps.get_read_db),
+    task_id: int,
+    attachment_id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    attachment = task_service.get_attachment(db, current_user, task_id, attachment_id)
+    storage = get_storage()
+    media_type = attachment.content_type or "application/octet-stream"
+
+    if not isinstance(storage, LocalStorage):
+        # The object store serves the bytes; the app only signs the URL.
+        return RedirectResponse(
+            storage.download_url(
+                attachment.file_path, attachment.filename, attachment.content_type
+            ),
+            status_code=307,
+        )
+
+    headers = {}
+    if attachment.sha256:
+        # Content-addressed files never change, so the digest is a strong ETag.
+        headers["ETag"] = f'"{attachment.sha256}"'
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    path = storage.local_path(attachment.file_path)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Attachment file not found")
+
+    prefix = settings.ATTACHMENT_ACCEL_REDIRECT_PREFIX
+    if prefix and attachment.file_path.startswith("sha256/"):
+        headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + attachment.file_path
+        headers["Content-Disposition"] = (
+            f"attachment; filename*=utf-8''{quote(attachment.filename)}"
+        )
+        return Response(media_type=media_type, headers=headers)
+
+    # FileResponse answers Range requests and uses sendfile where the server
+    # supports it.
+    return FileResponse(
+        path, media_type=media_type, filename=attachment.filename, headers=headers
+    )
@@ -1,10 +1,14 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core import security
 from app.models.user import User
-from app.schemas.user import User as UserSchema, UserCreate
+from app.schemas.fieldsets import Fieldset
+from app.schemas.user import USER_FIELDS, UserCreate, UserUpdate
+from app.repositories.base import next_cursor
 from app.schemas.api_response import ApiResponse
 from app.services import user_service
 
@@ -13,35 +17,71 @@ router = APIRouter()
 
 @router.get("/")
 def read_users(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fieldset: Fieldset = Depends(deps.fieldset_params(USER_FIELDS)),
     current_user: User = Depends(deps.get_current_active_admin),
 ):
-    users = user_service.list_users(db, current_user, skip=skip, limit=limit)
-    return ApiResponse.success_response(
-        data=users, message="Users retrieved successfully"
+    users = user_service.list_users(
+        db, current_user, skip=skip, limit=limit, cursor=cursor, fieldset=fieldset
+    )
+    return ApiResponse.json_response(
+        data=users,
+        schema=USER_FIELDS.schema(fieldset),
+        message="Users retrieved successfully",
+        cursor=cursor,
+        next_cursor=next_cursor(users, limit),
     )
 
 
 @router.post("/")
-def create_user(
+async def create_user(
     *,
     db: Session = Depends(deps.get_db),
     user_in: UserCreate,
     current_user: User = Depends(deps.get_current_active_admin),
 ):
-    user = user_service.create_user(db, current_user, user_in)
+    # bcrypt is awaited on the hasher pool, as in login, instead of holding a
+    # request thread; the database work still runs in the threadpool.
+    hashed_password = await security.aget_password_hash(user_in.password)
+    user = await run_in_threadpool(
+        user_service.create_user, db, current_user, user_in, hashed_password
+    )
     return ApiResponse.success_response(
         data=user, message="User created successfully", status_code=201
     )
 
 
+@router.put("/{user_id}")
+async def update_user(
+    *,
+    db: Session = Depends(deps.get_db),
+    user_id: int,
+    user_in: UserUpdate,
+    current_user: User = Depends(deps.get_current_active_admin),
+):
+    hashed_password = None
+    if user_in.password:
+        hashed_password = await security.aget_password_hash(user_in.password)
+    user = await run_in_threadpool(
+        user_service.update_user,
+        db,
+        current_user,
+        user_id,
+        user_in,
+        hashed_password,
+    )
+    return ApiResponse.success_response(data=user, message="User updated successfully")
+
+
 @router.get("/me")
 def read_user_me(
+    db: Session = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    user = user_service.get_current_user(current_user)
+    user = user_service.get_current_user(db, current_user)
     return ApiResponse.success_response(
         data=user, message="User retrieved successfully"
     )
@@ -40,6 +40,44 @@ class Settings(BaseSettings):
 
         return f"postgresql://{encoded_user}:{encoded_password}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_STICKY_SECONDS: int = 5
+
+    @property
+    def SQLALCHEMY_REPLICA_URIS(self) -> List[str]:
+        return [u.strip() for u in self.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+
+        uri = self.SQLALCHEMY_DATABASE_URI
+        for prefix, async_prefix in (
+            ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+            ("postgresql://", "postgresql+asyncpg://"),
+            ("postgres://", "postgresql+asyncpg://"),
+            ("sqlite://", "sqlite+aiosqlite://"),
+        ):
+            if uri.startswith(prefix):
+                return async_prefix + uri[len(prefix):]
+        return uri
+
+    # Pool sizes are per worker process: a deployment opens up to
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_USE_NULL_POOL: bool = False
+    DB_CONNECT_TIMEOUT: int = 10
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    DB_ECHO: bool = False
+
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
@@ -48,10 +86,92 @@ class Settings(BaseSettings):
     def REDIS_URI(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
 
+    REDIS_ENABLED: bool = False
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+
+    # Invalidations reach other workers through per-user epochs in Redis;
+    # without Redis, run a single worker or rely on these TTLs.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 30
+    MEMBERSHIP_CACHE_MAX_ENTRIES: int = 50000
+
+    # "redis" shares entries and invalidations across workers; "memory" is
+    # per process and only suitable for a single worker or tests.
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_BACKEND: str = "redis"
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+
+    # Responses below COMPRESSION_MINIMUM_SIZE bytes are not worth the CPU.
+    # zstd and brotli are offered only when their packages are installed.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Attachments: "local" stores under STORAGE_LOCAL_ROOT, "s3" in S3_BUCKET
+    # (S3_ENDPOINT_URL for MinIO and other S3-compatible stores).
+    STORAGE_BACKEND: str = "local"
+    STORAGE_LOCAL_ROOT: str = "storage"
+    STORAGE_CHUNK_SIZE: int = 1024 * 1024
+    S3_BUCKET: str = ""
+    S3_PREFIX: str = "attachments/"
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_URL_EXPIRES_SECONDS: int = 300
+    # When set (e.g. "/_protected/storage/"), local downloads are handed to
+    # nginx with X-Accel-Redirect instead of being streamed by the app.
+    ATTACHMENT_ACCEL_REDIRECT_PREFIX: Optional[str] = None
+    ATTACHMENT_MAX_SIZE_BYTES: int = 5 * 1024 * 1024
+
+    TASK_BULK_MAX_ITEMS: int = 5000
+    TASK_EXPORT_BATCH_SIZE: int = 1000
+    TASK_IMPORT_BATCH_SIZE: int = 1000
+    TASK_IMPORT_MAX_ERRORS: int = 100
+    # project_task_stats is updated on every task write and overdue flag;
+    # this job recounts it to correct any drift.
+    TASK_STATS_RECONCILE_INTERVAL_SECONDS: int = 300
+    TASK_STATS_RECONCILE_BATCH_SIZE: int = 500
+    # Assignees are notified once when a task is due within
+    # TASK_DUE_SOON_HOURS and once when it becomes overdue.
+    TASK_DUE_SOON_HOURS: int = 24
+    TASK_DUE_SCAN_INTERVAL_SECONDS: int = 60
+    TASK_DUE_SCAN_BATCH_SIZE: int = 500
+
+    # Recent activity on the organization dashboard: tasks touched in the
+    # last N days, at most PER_PROJECT from any one project.
+    DASHBOARD_ACTIVITY_DAYS: int = 7
+    DASHBOARD_ACTIVITY_PER_PROJECT: int = 5
+    DASHBOARD_ACTIVITY_LIMIT: int = 20
+
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: int = 15
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100
+    NOTIFICATION_DISPATCH_INTERVAL_SECONDS: float = 1.0
+    NOTIFICATION_DISPATCH_BATCH_SIZE: int = 500
+
+    # Read notifications older than the TTL are purged; unread ones only
+    # when NOTIFICATION_UNREAD_TTL_DAYS is set. "archive" copies rows to
+    # notification_archive before deleting them.
+    NOTIFICATION_READ_TTL_DAYS: Optional[int] = 30
+    NOTIFICATION_UNREAD_TTL_DAYS: Optional[int] = None
+    NOTIFICATION_RETENTION_MODE: str = "delete"
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = 1000
+    NOTIFICATION_RETENTION_INTERVAL_SECONDS: int = 3600
+
+    # Run scheduler jobs (outbox dispatch etc.) inside each API worker.
+    BACKGROUND_JOBS_ENABLED: bool = True
+
+    # bcrypt runs on its own thread pool; calls beyond workers + queue are
+    # rejected with 503 rather than queued.
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
 
     ENVIRONMENT: str = "local"
 
@@ -0,0 +1,48 @@
+import logging
+from typing import Optional
+
+import redis
+
+from app.core.redis import get_redis
+
+logger = logging.getLogger("app")
+
+
+class UserEpochs:
+    """Per-user invalidation counters in Redis, shared by every worker.
+
+    In-process caches keep the epoch a value was cached under next to it
+    and drop the value once the counter has moved on, so invalidating in
+    one worker reaches the others on their next lookup. Without Redis there
+    is only one process to invalidate and the epoch stays 0.
+
+    Counters never expire: an expired counter that was bumped again could
+    land back on a value still held by a stale local entry.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def key(self, user_id: int) -> str:
+        return f"epoch:{self.namespace}:{user_id}"
+
+    def current(self, user_id: int) -> Optional[int]:
+        """The user's epoch, or None when Redis cannot be read."""
+        client = get_redis()
+        if client is None:
+            return 0
+        try:
+            raw = client.get(self.key(user_id))
+        except redis.RedisError as e:
+            logger.warning(f"Cache epoch read failed: {e}")
+            return None
+        return int(raw) if raw is not None else 0
+
+    def bump(self, user_id: int) -> None:
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.incr(self.key(user_id))
+        except redis.RedisError as e:
+            logger.warning(f"Cache epoch bump failed: {e}")
@@ -1,7 +1,10 @@
 from fastapi import Response
 
+from app.config import settings
+
 ACCESS_TOKEN_MAX_AGE = 10 * 60
 REFRESH_TOKEN_MAX_AGE = 7 * 24 * 60 * 60
+READ_PRIMARY_COOKIE = "READ_PRIMARY"
 
 
 def set_access_cookie(response: Response, access_token: str) -> None:
@@ -38,3 +41,15 @@ def clear_cookies(response: Response) -> None:
 def set_cookies(response: Response, access_token: str, refresh_token: str) -> None:
     set_access_cookie(response, access_token)
     set_refresh_cookie(response, refresh_token)
+
+
+def set_read_primary_cookie(response: Response) -> None:
+    response.set_cookie(
+        key=READ_PRIMARY_COOKIE,
+        value="1",
+        httponly=True,
+        secure=False,
+        samesite="lax",
+        path="/",
+        max_age=settings.DB_REPLICA_STICKY_SECONDS,
+    )
@@ -22,9 +22,11 @@ def create_response(
     data: Any = None,
     errors: list = None,
     status_code: int = 200,
+    headers: Optional[dict] = None,
 ) -> JSONResponse:
     return JSONResponse(
         status_code=status_code,
+        headers=headers,
         content={
             "success": success,
             "message": message,
@@ -37,7 +39,10 @@ def create_response(
 async def http_exception_handler(request: Request, exc: HTTPException):
     logger.warning(f"HTTP {exc.status_code}: {exc.detail} - {request.url}")
     return create_response(
-        success=False, message=str(exc.detail), status_code=exc.status_code
+        success=False,
+        message=str(exc.detail),
+        status_code=exc.status_code,
+        headers=getattr(exc, "headers", None),
     )
 
 
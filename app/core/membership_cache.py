@@ -0,0 +1,95 @@
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache_epochs import UserEpochs
+from app.core.ttl_cache import TTLCache
+
+ALLOWED = "allowed"
+FORBIDDEN = "forbidden"
+MISSING = "missing"
+
+REQUEST_KEY = "project_access"
+
+
+class MembershipCache:
+    """Project access decisions keyed by ``(user_id, project_id)``.
+
+    Decisions are kept on the session (``db.info``) for the rest of the
+    request and in a short-TTL in-process LRU shared by later requests. Only
+    allowed/forbidden results are shared: "missing" means the project did not
+    exist in the user's organization, which a later create may change.
+
+    Shared entries carry the user's epoch, as in the principal cache, so an
+    invalidation in one worker reaches the others on their next check.
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        self._local = TTLCache(max_entries=max_entries, ttl=ttl)
+        self._epochs = UserEpochs("membership")
+
+    def get_many(
+        self, db: Session, user_id: int, project_ids: Iterable[int]
+    ) -> Dict[int, str]:
+        request = db.info.get(REQUEST_KEY, {})
+        epoch = None
+        decisions = {}
+        for project_id in project_ids:
+            decision = request.get((user_id, project_id))
+            if decision is None:
+                if epoch is None:
+                    epoch = self._epochs.current(user_id)
+                decision = self._shared(user_id, project_id, epoch)
+            if decision is not None:
+                decisions[project_id] = decision
+        return decisions
+
+    def _shared(
+        self, user_id: int, project_id: int, epoch: Optional[int]
+    ) -> Optional[str]:
+        entry = self._local.get((user_id, project_id))
+        if entry is None or epoch is None:
+            return None
+        cached_epoch, decision = entry
+        if cached_epoch != epoch:
+            self._local.delete((user_id, project_id))
+            return None
+        return decision
+
+    def set_many(self, db: Session, user_id: int, decisions: Dict[int, str]) -> None:
+        request = db.info.setdefault(REQUEST_KEY, {})
+        epoch = self._epochs.current(user_id)
+        for project_id, decision in decisions.items():
+            request[(user_id, project_id)] = decision
+            if decision != MISSING and epoch is not None:
+                self._local.set((user_id, project_id), (epoch, decision))
+
+    def invalidate(self, user_id: int, project_id: Optional[int] = None) -> None:
+        """Forget one user's decision for a project, or all of them.
+
+        Other workers drop all of the user's decisions, not just the one
+        project: the epoch is kept per user.
+        """
+        if project_id is not None:
+            self._local.delete((user_id, project_id))
+        else:
+            self._local.delete_where(lambda key: key[0] == user_id)
+        self._epochs.bump(user_id)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+
+membership_cache = MembershipCache(
+    max_entries=settings.MEMBERSHIP_CACHE_MAX_ENTRIES,
+    ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_request_decisions(session: Session) -> None:
+    # A commit may have changed memberships; later checks in the same
+    # session go back to the shared cache, which writers invalidate.
+    session.info.pop(REQUEST_KEY, None)
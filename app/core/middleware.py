@@ -0,0 +1,251 @@
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.response_cache import etag_matches
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/",
+)
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Supported codings in order of preference."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Highest-q coding we support; ties go to the better compressor."""
+    if not accept_encoding:
+        return None
+    accepted = _parse_accept_encoding(accept_encoding)
+    best, best_q = None, 0.0
+    for name in available_encodings():
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+Compressor = Tuple[Callable[[bytes], bytes], Callable[[], bytes]]
+
+
+def _compressor(encoding: str) -> Compressor:
+    """``(compress, flush)`` for a fresh stream in ``encoding``."""
+    if encoding == "zstd":
+        level = settings.COMPRESSION_ZSTD_LEVEL
+        c = zstandard.ZstdCompressor(level=level).compressobj()
+        return c.compress, c.flush
+    if encoding == "br":
+        c = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return c.process, c.finish
+    c = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return c.compress, c.flush
+
+
+def _compressible(status: int, headers: Headers) -> bool:
+    if status in (204, 206, 304) or "content-encoding" in headers:
+        return False
+    # Byte ranges refer to the identity body; leave files served with
+    # range support alone.
+    if "accept-ranges" in headers or "content-range" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    if content_type.startswith("text/event-stream"):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+class CompressionMiddleware:
+    """Compresses text and JSON responses with zstd, brotli or gzip.
+
+    zstd and brotli are used when their packages are installed and the client
+    accepts them. Bodies under ``minimum_size`` are sent as-is; streamed
+    bodies are compressed chunk by chunk. A strong ETag is weakened since the
+    encoded bytes differ from the ones it was computed over.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingSend(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingSend:
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.compress = None
+        self.flush = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if self.start is not None and message["type"] == "http.response.body":
+            await self._first_body(message)
+            return
+        if self.start is not None:
+            await self.send(self.start)
+            self.start = None
+            self.passthrough = True
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        data = self.compress(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        if not more_body:
+            data += self.flush()
+        await self.send(
+            {"type": "http.response.body", "body": data, "more_body": more_body}
+        )
+
+    async def _first_body(self, message: Message) -> None:
+        start, self.start = self.start, None
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if start["status"] == 304:
+            # Revalidation of a body this client received compressed.
+            _weaken_etag(headers)
+        if not _compressible(start["status"], headers):
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body and len(body) < self.minimum_size:
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        _weaken_etag(headers)
+        self.compress, self.flush = _compressor(self.encoding)
+        data = self.compress(body)
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            data += self.flush()
+            headers["Content-Length"] = str(len(data))
+        await self.send(start)
+        await self.send(
+            {"type": "http.response.body", "body": data, "more_body": more_body}
+        )
+
+
+class ConditionalGetMiddleware:
+    """Answers GETs whose ETag matches ``If-None-Match`` with a bare 304.
+
+    Only responses that already carry an ETag are considered; list endpoints
+    derive theirs from the serialized data, so no extra hashing happens here.
+    """
+
+    KEEP_HEADERS = (b"etag", b"vary", b"cache-control", b"x-cache", b"set-cookie")
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if not if_none_match:
+            await self.app(scope, receive, send)
+            return
+
+        not_modified = False
+
+        async def conditional_send(message: Message) -> None:
+            nonlocal not_modified
+            if message["type"] == "http.response.start":
+                etag = Headers(raw=message["headers"]).get("etag")
+                if (
+                    message["status"] == 200
+                    and etag
+                    and etag_matches(if_none_match, etag.removeprefix("W/"))
+                ):
+                    not_modified = True
+                    headers = [
+                        (k, v)
+                        for k, v in message["headers"]
+                        if k.lower() in self.KEEP_HEADERS
+                    ]
+                    await send(
+                        {
+                            "type": "http.response.start",
+                            "status": 304,
+                            "headers": headers,
+                        }
+                    )
+                    return
+            elif not_modified:
+                if message["type"] == "http.response.body" and not message.get(
+                    "more_body", False
+                ):
+                    await send({"type": "http.response.body", "body": b""})
+                return
+            await send(message)
+
+        await self.app(scope, receive, conditional_send)
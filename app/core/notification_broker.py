@@ -0,0 +1,126 @@
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+import redis
+
+from app.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger("app")
+
+CHANNEL_PREFIX = "notifications:"
+
+
+def format_sse(data: Any, event: Optional[str] = None, id: Optional[int] = None) -> str:
+    lines = []
+    if id is not None:
+        lines.append(f"id: {id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class NotificationBroker:
+    """Fans notifications out to the stream connections of this worker.
+
+    Publishing goes through Redis pub/sub when it is enabled, so every
+    worker receives every message and forwards it to its own subscribers.
+    Without Redis, messages are delivered in-process only. Subscribers are
+    asyncio queues; publishers may run on any thread.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[
+            int, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]
+        ] = {}
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def publish(self, user_id: int, message: Dict[str, Any]) -> None:
+        client = get_redis()
+        if client is not None:
+            try:
+                client.publish(f"{CHANNEL_PREFIX}{user_id}", json.dumps(message))
+                return
+            except redis.RedisError as e:
+                logger.warning(f"Notification publish failed, delivering locally: {e}")
+        self.deliver(user_id, message)
+
+    def deliver(self, user_id: int, message: Dict[str, Any]) -> None:
+        with self._lock:
+            targets = list(self._subscribers.get(user_id, ()))
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(self._offer, queue, message)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: Dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A stalled client loses live events; it catches up from the
+            # database with Last-Event-ID when it reconnects.
+            pass
+
+    def _on_redis_message(self, message: Dict[str, Any]) -> None:
+        channel = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        try:
+            user_id = int(channel[len(CHANNEL_PREFIX):])
+            payload = json.loads(message["data"])
+        except ValueError:
+            return
+        self.deliver(user_id, payload)
+
+    def _ensure_listener(self) -> None:
+        client = get_redis()
+        if client is None:
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.psubscribe(**{f"{CHANNEL_PREFIX}*": self._on_redis_message})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+                exception_handler=self._on_listener_error,
+            )
+
+    def _on_listener_error(self, e, pubsub, thread) -> None:
+        logger.warning(f"Notification listener stopped: {e}")
+        thread.stop()
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        entry = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        try:
+            self._ensure_listener()
+        except redis.RedisError as e:
+            logger.warning(f"Notification listener unavailable: {e}")
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(user_id)
+                if subscribers is not None:
+                    subscribers.discard(entry)
+                    if not subscribers:
+                        del self._subscribers[user_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+
+notification_broker = NotificationBroker(
+    queue_size=settings.NOTIFICATION_STREAM_QUEUE_SIZE
+)
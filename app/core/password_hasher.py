@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.config import settings
+
+
+class PasswordHasherBusy(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent password operations, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+class HashMetrics:
+    """Latency totals for hash and verify calls, including queueing time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "rejected": self.rejected,
+                "in_flight": self.in_flight,
+                "avg_ms": (
+                    round(self.total_seconds / self.calls * 1000, 3)
+                    if self.calls
+                    else 0.0
+                ),
+                "max_ms": round(self.max_seconds * 1000, 3),
+            }
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, size-bounded thread pool.
+
+    bcrypt releases the GIL, so a few threads use real cores without
+    occupying the request threadpool. At most ``workers + max_queue`` calls
+    may be pending; beyond that callers get ``PasswordHasherBusy`` instead of
+    queueing behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_queue: int, context: CryptContext):
+        self.context = context
+        self.metrics = HashMetrics()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self.metrics._lock:
+                self.metrics.rejected += 1
+            raise PasswordHasherBusy()
+
+        start = time.perf_counter()
+        with self.metrics._lock:
+            self.metrics.in_flight += 1
+
+        def finish():
+            with self.metrics._lock:
+                self.metrics.in_flight -= 1
+            self.metrics.record(time.perf_counter() - start)
+            self._slots.release()
+
+        def run():
+            # Book-keeping happens before the result is published so callers
+            # never observe a finished call still counted as in flight.
+            try:
+                return fn(*args)
+            finally:
+                finish()
+
+        try:
+            return self._executor.submit(run)
+        except BaseException:
+            finish()
+            raise
+
+    def hash(self, password: str) -> str:
+        return self._submit(self.context.hash, password).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(
+            self.context.verify, plain_password, hashed_password
+        ).result()
+
+    async def ahash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(self.context.hash, password))
+
+    async def averify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(
+            self._submit(self.context.verify, plain_password, hashed_password)
+        )
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    context=CryptContext(schemes=["bcrypt"], deprecated="auto"),
+)
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import redis
+
+from app.config import settings
+from app.core.cache_epochs import UserEpochs
+from app.core.redis import get_redis
+from app.core.ttl_cache import TTLCache
+from app.models.user import User, UserRole
+
+logger = logging.getLogger("app")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The parts of a user that authorization checks need."""
+
+    id: int
+    email: str
+    full_name: Optional[str]
+    organization_id: Optional[int]
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            organization_id=user.organization_id,
+            role=user.role,
+            is_active=bool(user.is_active),
+        )
+
+    def to_user(self) -> User:
+        """A detached ``User`` carrying the cached columns."""
+        return User(**asdict(self))
+
+
+class PrincipalCache:
+    """Principals keyed by user id and token: in-process LRU, then Redis.
+
+    Redis keeps one hash per user so that invalidation drops every token
+    of that user with a single ``DEL``. Local entries carry the user's
+    epoch (see ``UserEpochs``); invalidation bumps it so that other workers
+    drop their copies on the next lookup instead of serving them until the
+    TTL runs out.
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.ttl = ttl
+        self._local = TTLCache(max_entries=max_entries, ttl=ttl)
+        self._epochs = UserEpochs("principal")
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def _redis_key(user_id: int) -> str:
+        return f"principal:{user_id}"
+
+    def get(self, user_id: int, token: str) -> Optional[Principal]:
+        key = (user_id, self._digest(token))
+        epoch = self._epochs.current(user_id)
+        if epoch is None:
+            return None
+        entry = self._local.get(key)
+        if entry is not None:
+            cached_epoch, principal = entry
+            if cached_epoch == epoch:
+                return principal
+            self._local.delete(key)
+
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            raw = client.hget(self._redis_key(user_id), key[1])
+        except redis.RedisError as e:
+            logger.warning(f"Principal cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+
+        data = json.loads(raw)
+        expires_at = data.pop("expires_at")
+        data["role"] = UserRole(data["role"])
+        principal = Principal(**data)
+        self._local.set(key, (epoch, principal), ttl=expires_at - time.time())
+        return principal
+
+    def set(
+        self,
+        user_id: int,
+        token: str,
+        principal: Principal,
+        token_exp: Optional[float] = None,
+    ) -> None:
+        ttl = float(self.ttl)
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+        epoch = self._epochs.current(user_id)
+        if epoch is None:
+            return
+
+        digest = self._digest(token)
+        self._local.set((user_id, digest), (epoch, principal), ttl=ttl)
+
+        client = get_redis()
+        if client is None:
+            return
+        data = asdict(principal)
+        data["role"] = principal.role.value
+        data["expires_at"] = time.time() + ttl
+        try:
+            pipe = client.pipeline()
+            pipe.hset(self._redis_key(user_id), digest, json.dumps(data))
+            pipe.expire(self._redis_key(user_id), self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Principal cache write failed: {e}")
+
+    def invalidate(self, user_id: int) -> None:
+        self._local.delete_where(lambda key: key[0] == user_id)
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            pipe.delete(self._redis_key(user_id))
+            pipe.incr(self._epochs.key(user_id))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Principal cache invalidation failed: {e}")
+
+    def clear(self) -> None:
+        self._local.clear()
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,25 @@
+import logging
+from typing import Optional
+
+import redis
+
+from app.config import settings
+
+logger = logging.getLogger("app")
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Shared Redis client, or None when Redis is not enabled."""
+    global _client
+    if not settings.REDIS_ENABLED:
+        return None
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URI,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            health_check_interval=30,
+        )
+    return _client
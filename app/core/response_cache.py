@@ -0,0 +1,227 @@
+import functools
+import hashlib
+import json
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import redis
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from app.config import settings
+from app.core.redis import get_redis
+from app.core.ttl_cache import TTLCache
+from app.models.user import User, UserRole
+
+logger = logging.getLogger("app")
+
+
+class MemoryCacheBackend:
+    """Per-process backend; used in tests and single-worker deployments."""
+
+    def __init__(self, max_entries: int = 10000):
+        self._entries = TTLCache(max_entries=max_entries, ttl=float("inf"))
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    def versions(self, tags: Sequence[str]) -> List[int]:
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump(self, tags: Sequence[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        with self._lock:
+            self._versions.clear()
+
+
+class RedisCacheBackend:
+    """Shared backend so that invalidation reaches every worker."""
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(key, value, ex=ttl)
+
+    def versions(self, tags: Sequence[str]) -> List[int]:
+        values = self.client.mget([f"rc:tag:{tag}" for tag in tags])
+        return [int(v) if v is not None else 0 for v in values]
+
+    def bump(self, tags: Sequence[str]) -> None:
+        pipe = self.client.pipeline()
+        for tag in tags:
+            pipe.incr(f"rc:tag:{tag}")
+        pipe.execute()
+
+    def clear(self) -> None:
+        pass
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+# Recomputed for the replayed body, or never shared between users.
+UNCACHED_HEADERS = frozenset({"content-length", "set-cookie", "x-cache"})
+
+
+def encode_entry(response: Response) -> bytes:
+    """A response's status, headers and body as one cache value."""
+    headers = [
+        (name.decode("latin-1"), value.decode("latin-1"))
+        for name, value in response.raw_headers
+        if name.decode("latin-1").lower() not in UNCACHED_HEADERS
+    ]
+    meta = json.dumps({"status": response.status_code, "headers": headers})
+    return meta.encode() + b"\n" + response.body
+
+
+def decode_entry(entry: bytes) -> Tuple[int, List[Tuple[str, str]], bytes]:
+    meta, _, body = entry.partition(b"\n")
+    data = json.loads(meta)
+    return data["status"], [tuple(h) for h in data["headers"]], body
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (c.strip() for c in if_none_match.split(","))
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+class ResponseCache:
+    """Caches GET responses per organization, role and query string.
+
+    Entries are never deleted on write. Each organization-scoped tag
+    (``tasks:<org_id>``) carries a version that is part of every key built
+    from it; invalidating a tag bumps its version and the old entries simply
+    stop being addressed until their TTL runs out.
+    """
+
+    def __init__(self):
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is not None:
+            return self._backend
+        if settings.RESPONSE_CACHE_BACKEND == "memory":
+            self._backend = MemoryCacheBackend()
+            return self._backend
+        client = get_redis()
+        return RedisCacheBackend(client) if client is not None else None
+
+    def use(self, backend) -> None:
+        self._backend = backend
+
+    def clear(self) -> None:
+        if self._backend is not None:
+            self._backend.clear()
+
+    def invalidate(self, organization_id: Optional[int], *tags: str) -> None:
+        backend = self.backend
+        if backend is None or organization_id is None:
+            return
+        try:
+            backend.bump([f"{tag}:{organization_id}" for tag in tags])
+        except redis.RedisError as e:
+            logger.warning(f"Response cache invalidation failed: {e}")
+
+    def _key(self, request: Request, user: User, versions: List[int]) -> str:
+        # Members only see the projects they belong to, so their responses
+        # are not shared with the rest of the role.
+        scope = user.id if user.role == UserRole.MEMBER else "*"
+        query = "&".join(sorted(str(request.query_params).split("&")))
+        raw = (
+            f"{user.organization_id}:{user.role.value}:{scope}:"
+            f"{','.join(map(str, versions))}:{request.url.path}?{query}"
+        )
+        return "rc:v2:" + hashlib.sha256(raw.encode()).hexdigest()
+
+    def _respond(self, request: Request, entry: bytes, hit: bool) -> Response:
+        """Replay a cached entry with its original status and headers.
+
+        The endpoint's own ETag is kept; one is derived from the body only
+        when the endpoint did not set it.
+        """
+        status_code, headers, body = decode_entry(entry)
+        response = Response(content=body, status_code=status_code)
+        for name, value in headers:
+            response.headers.append(name, value)
+        if "etag" not in response.headers:
+            response.headers["ETag"] = etag_for(body)
+        if "cache-control" not in response.headers:
+            response.headers["Cache-Control"] = "private, no-cache"
+        response.headers["X-Cache"] = "HIT" if hit else "MISS"
+        etag = response.headers["etag"]
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(
+                status_code=304,
+                headers={
+                    "ETag": etag,
+                    "Cache-Control": response.headers["cache-control"],
+                    "X-Cache": response.headers["x-cache"],
+                },
+            )
+        return response
+
+    def cached(self, *tags: str, ttl: Optional[int] = None) -> Callable:
+        """Cache a GET endpoint taking ``request`` and ``current_user``."""
+
+        def decorator(endpoint: Callable) -> Callable:
+            @functools.wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                request: Request = kwargs["request"]
+                user: User = kwargs["current_user"]
+                backend = self.backend if settings.RESPONSE_CACHE_ENABLED else None
+                if backend is None:
+                    return endpoint(*args, **kwargs)
+
+                org_tags = [f"{tag}:{user.organization_id}" for tag in tags]
+                try:
+                    key = self._key(request, user, backend.versions(org_tags))
+                    entry = backend.get(key)
+                except redis.RedisError as e:
+                    logger.warning(f"Response cache read failed: {e}")
+                    return endpoint(*args, **kwargs)
+                if entry is not None:
+                    return self._respond(request, entry, hit=True)
+
+                result = endpoint(*args, **kwargs)
+                if not isinstance(result, Response):
+                    result = JSONResponse(content=jsonable_encoder(result))
+                if not 200 <= result.status_code < 300:
+                    return result
+                entry = encode_entry(result)
+                try:
+                    backend.set(
+                        key, entry, ttl or settings.RESPONSE_CACHE_TTL_SECONDS
+                    )
+                except redis.RedisError as e:
+                    logger.warning(f"Response cache write failed: {e}")
+                return self._respond(request, entry, hit=False)
+
+            return wrapper
+
+        return decorator
+
+
+response_cache = ResponseCache()
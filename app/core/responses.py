@@ -0,0 +1,16 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson.
+
+    Content may embed ``orjson.Fragment`` values holding JSON that was
+    already encoded elsewhere (e.g. by pydantic-core); they are copied into
+    the output as-is instead of being decoded and encoded again.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
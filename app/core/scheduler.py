@@ -0,0 +1,71 @@
+import logging
+import threading
+from typing import Callable, List
+
+logger = logging.getLogger("app")
+
+
+class PeriodicJob:
+    """Runs ``fn`` on a daemon thread every ``interval`` seconds.
+
+    ``wake()`` runs the job early, e.g. right after a commit that gave it
+    work. Exceptions are logged and the job keeps its schedule.
+    """
+
+    def __init__(self, name: str, interval: float, fn: Callable[[], None]):
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> None:
+        try:
+            self.fn()
+        except Exception:
+            logger.exception(f"Background job {self.name} failed")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.run_once()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+class Scheduler:
+    def __init__(self):
+        self.jobs: List[PeriodicJob] = []
+
+    def add(self, job: PeriodicJob) -> PeriodicJob:
+        self.jobs.append(job)
+        return job
+
+    def start(self) -> None:
+        for job in self.jobs:
+            job.start()
+        logger.info(f"Started {len(self.jobs)} background jobs")
+
+    def stop(self) -> None:
+        for job in self.jobs:
+            job.stop()
+
+
+scheduler = Scheduler()
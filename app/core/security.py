@@ -1,14 +1,13 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional, Union
 
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+from jose import jwt
 
 from app.config import settings
+from app.core.password_hasher import password_hasher
+from app.core.tokens import ALGORITHM, TokenError, token_verifier
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-ALGORITHM = "HS256"
+pwd_context = password_hasher.context
 
 
 def create_access_token(
@@ -41,15 +40,22 @@ def create_refresh_token(
 
 def verify_token(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
+        return token_verifier.decode(token)
+    except TokenError:
         return None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.averify(plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    return await password_hasher.ahash(password)
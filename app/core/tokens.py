@@ -0,0 +1,90 @@
+import json
+import time
+from typing import Any, Dict
+
+from jwt.algorithms import HMACAlgorithm
+from jwt.exceptions import DecodeError
+from jwt.utils import base64url_decode
+
+from app.config import settings
+from app.core.ttl_cache import TTLCache
+
+ALGORITHM = "HS256"
+
+
+class TokenError(Exception):
+    pass
+
+
+class TokenVerifier:
+    """HS256 verification with the key prepared once and results cached.
+
+    A verified token is immutable, so its claims are kept until the token's
+    ``exp`` and later calls skip the base64/JSON/HMAC work entirely. The
+    cache key is the whole token, signature included, so a tampered token
+    can never hit an entry it did not earn.
+    """
+
+    def __init__(self, secret: str, max_entries: int, max_ttl: float):
+        self._algorithm = HMACAlgorithm(HMACAlgorithm.SHA256)
+        self._key = self._algorithm.prepare_key(secret)
+        self._cache = TTLCache(max_entries=max_entries, ttl=max_ttl)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        payload = self._cache.get(token)
+        if payload is None:
+            payload = self._verify(token)
+            ttl = None
+            if "exp" in payload:
+                ttl = payload["exp"] - time.time()
+            self._cache.set(token, payload, ttl=ttl)
+        elif "exp" in payload and payload["exp"] <= time.time():
+            # The cache runs on the monotonic clock; trust wall time here.
+            self._cache.delete(token)
+            raise TokenError("Signature has expired")
+        return dict(payload)
+
+    def _verify(self, token: str) -> Dict[str, Any]:
+        try:
+            signing_input, signature_segment = token.rsplit(".", 1)
+            header_segment, payload_segment = signing_input.split(".", 1)
+            header = json.loads(base64url_decode(header_segment))
+            signature = base64url_decode(signature_segment)
+        except (ValueError, DecodeError, UnicodeDecodeError) as e:
+            raise TokenError("Malformed token") from e
+
+        if not isinstance(header, dict) or header.get("alg") != ALGORITHM:
+            raise TokenError("Unexpected algorithm")
+        if not self._algorithm.verify(
+            signing_input.encode(), self._key, signature
+        ):
+            raise TokenError("Signature verification failed")
+
+        try:
+            payload = json.loads(base64url_decode(payload_segment))
+        except (ValueError, DecodeError, UnicodeDecodeError) as e:
+            raise TokenError("Malformed payload") from e
+        if not isinstance(payload, dict):
+            raise TokenError("Malformed payload")
+
+        now = time.time()
+        exp = payload.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise TokenError("Invalid exp claim")
+            if exp <= now:
+                raise TokenError("Signature has expired")
+        nbf = payload.get("nbf")
+        if isinstance(nbf, (int, float)) and nbf > now:
+            raise TokenError("Token is not yet valid")
+        return payload
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+token_verifier = TokenVerifier(
+    settings.SECRET_KEY,
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    max_ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
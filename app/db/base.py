@@ -2,6 +2,13 @@
 from app.db.base_class import Base  # noqa
 from app.models.organization import Organization  # noqa
 from app.models.user import User  # noqa
-from app.models.project import Project, ProjectMember  # noqa
+from app.models.project import Project, ProjectMember, ProjectTaskStats  # noqa
 from app.models.task import Task  # noqa
-from app.models.extras import Comment, Attachment, Notification  # noqa
+from app.models.extras import (  # noqa
+    Comment,
+    Attachment,
+    Notification,
+    NotificationOutbox,
+    NotificationCounter,
+    NotificationArchive,
+)
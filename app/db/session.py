@@ -1,11 +1,195 @@
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
 from app.config import settings
 
+
+class PoolMetrics:
+    """Running totals of how long requests waited for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": (
+                    round(self.total_wait / attempts * 1000, 3) if attempts else 0.0
+                ),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records the time spent waiting for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return conn
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.DB_ECHO,
+        "query_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if url.startswith("sqlite"):
+        return options
+
+    if settings.DB_USE_NULL_POOL:
+        # An external pooler (pgbouncer) owns the connections.
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_use_lifo=True,
+        )
+
+    connect_args: Dict[str, Any] = {"connect_timeout": settings.DB_CONNECT_TIMEOUT}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = (
+            f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        )
+    options["connect_args"] = connect_args
+    return options
+
+
+def async_engine_options(url: str) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.DB_ECHO,
+        "query_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if url.startswith("sqlite"):
+        return options
+
+    connect_args: Dict[str, Any] = {"timeout": settings.DB_CONNECT_TIMEOUT}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+        }
+    if settings.DB_USE_NULL_POOL:
+        # pgbouncer in transaction mode cannot keep asyncpg's named
+        # prepared statements across transactions.
+        options["poolclass"] = NullPool
+        connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+    else:
+        options.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_use_lifo=True,
+        )
+    options["connect_args"] = connect_args
+    return options
+
+
+def get_pool_status(bind=None) -> Dict[str, Any]:
+    pool = (bind or engine).pool
+    status: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
+
+
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True,
-    echo=settings.ENVIRONMENT == "local",
+    **engine_options(settings.SQLALCHEMY_DATABASE_URI),
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class ReplicaSessionFactory:
+    """Hands out sessions bound to read replicas in round-robin order."""
+
+    def __init__(self, urls: Optional[List[str]] = None):
+        self._lock = threading.Lock()
+        self.engines = []
+        self._factories = itertools.cycle([])
+        self.configure(urls or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def configure(self, urls: List[str]) -> None:
+        engines = [create_engine(url, **engine_options(url)) for url in urls]
+        with self._lock:
+            old, self.engines = self.engines, engines
+            self._factories = itertools.cycle(
+                [
+                    sessionmaker(autocommit=False, autoflush=False, bind=e)
+                    for e in engines
+                ]
+            )
+        for e in old:
+            e.dispose()
+
+    def __call__(self) -> Session:
+        with self._lock:
+            factory = next(self._factories, None)
+        if factory is None:
+            return SessionLocal()
+        return factory()
+
+
+ReplicaSessionLocal = ReplicaSessionFactory(settings.SQLALCHEMY_REPLICA_URIS)
+
+async_engine = create_async_engine(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URI,
+    **async_engine_options(settings.SQLALCHEMY_ASYNC_DATABASE_URI),
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
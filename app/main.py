@@ -1,9 +1,16 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
 from app.config import settings
+from app.core.cookie_utils import set_read_primary_cookie
+from app.core.middleware import CompressionMiddleware, ConditionalGetMiddleware
+from app.core.password_hasher import password_hasher
+from app.core.scheduler import scheduler
+from app.db.session import ReplicaSessionLocal, get_pool_status
 from app.core.logging import setup_logging, logger
 from app.core.exceptions import (
     http_exception_handler,
@@ -14,9 +21,19 @@ from app.schemas.api_response import ApiResponse
 
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.BACKGROUND_JOBS_ENABLED:
+        scheduler.start()
+    yield
+    scheduler.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 app.add_exception_handler(HTTPException, http_exception_handler)
@@ -32,6 +49,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression wraps the conditional check: 304s are decided on the identity
+# response, and only full bodies get compressed.
+app.add_middleware(ConditionalGetMiddleware)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE
+    )
+
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    if (
+        ReplicaSessionLocal.enabled
+        and request.method in ("POST", "PUT", "PATCH", "DELETE")
+        and response.status_code < 400
+    ):
+        # Pin this client's reads to the primary until replicas catch up.
+        set_read_primary_cookie(response)
+    return response
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 logger.info(f"Starting {settings.PROJECT_NAME} in {settings.ENVIRONMENT} mode")
@@ -42,3 +81,18 @@ def health_check():
     return ApiResponse.success_response(
         data={"status": "ok"}, message="Service is healthy"
     )
+
+
+@app.get("/health/db")
+def database_pool_status():
+    data = get_pool_status()
+    if ReplicaSessionLocal.enabled:
+        data["replicas"] = [get_pool_status(e) for e in ReplicaSessionLocal.engines]
+    return ApiResponse.success_response(data=data, message="Database pool status")
+
+
+@app.get("/health/auth")
+def password_hasher_status():
+    return ApiResponse.success_response(
+        data=password_hasher.metrics.snapshot(), message="Password hasher status"
+    )
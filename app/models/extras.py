@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    ForeignKey,
+    DateTime,
+    Boolean,
+    Index,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -8,7 +17,7 @@ class Comment(Base):
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
 
-    task_id = Column(Integer, ForeignKey("task.id"), nullable=False)
+    task_id = Column(Integer, ForeignKey("task.id"), nullable=False, index=True)
     task = relationship("Task", back_populates="comments")
 
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
@@ -20,15 +29,25 @@ class Comment(Base):
 class Attachment(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
-    file_path = Column(String, nullable=False)  # Local storage path
+    file_path = Column(String, nullable=False)  # Storage key (sha256/ab/cd/...)
+    size = Column(Integer, nullable=True)
+    sha256 = Column(String(64), nullable=True, index=True)
+    content_type = Column(String, nullable=True)
 
-    task_id = Column(Integer, ForeignKey("task.id"), nullable=False)
+    task_id = Column(Integer, ForeignKey("task.id"), nullable=False, index=True)
     task = relationship("Task", back_populates="attachments")
 
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
 class Notification(Base):
+    __table_args__ = (
+        Index("ix_notification_user_id_is_read_id", "user_id", "is_read", "id"),
+        Index("ix_notification_user_id_created_at", "user_id", "created_at"),
+        Index("ix_notification_user_id_id", "user_id", "id"),
+        Index("ix_notification_is_read_created_at", "is_read", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     message = Column(Text, nullable=False)
@@ -38,3 +57,44 @@ class Notification(Base):
     user = relationship("User", back_populates="notifications")
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class NotificationOutbox(Base):
+    """Notifications written with the mutation that caused them.
+
+    Rows are moved into ``notification`` and pushed to subscribers by the
+    background dispatcher, so request paths commit once.
+    """
+
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    title = Column(String, nullable=False)
+    message = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class NotificationCounter(Base):
+    """Per-user unread count, kept in step with ``notification.is_read``."""
+
+    __tablename__ = "notification_counter"
+
+    user_id = Column(
+        Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    unread = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class NotificationArchive(Base):
+    """Notifications past their retention period, kept out of the hot table."""
+
+    __tablename__ = "notification_archive"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    title = Column(String, nullable=False)
+    message = Column(Text, nullable=False)
+    is_read = Column(Boolean, nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
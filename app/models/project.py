@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text
+from sqlalchemy import Column, DateTime, Integer, String, ForeignKey, Text
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.db.base_class import Base
 
 
@@ -19,7 +20,26 @@ class Project(Base):
 class ProjectMember(Base):
     __tablename__ = "project_member"
     project_id = Column(Integer, ForeignKey("project.id"), primary_key=True)
-    user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id"), primary_key=True, index=True)
 
     project = relationship("Project", back_populates="members")
     user = relationship("User", back_populates="project_memberships")
+
+
+class ProjectTaskStats(Base):
+    """Per-project task counts, kept in step with ``task`` on every write.
+
+    ``overdue`` also changes as due dates pass without any write; the
+    reconciliation job recomputes every row, at ``reconciled_at``.
+    """
+
+    __tablename__ = "project_task_stats"
+
+    project_id = Column(
+        Integer, ForeignKey("project.id", ondelete="CASCADE"), primary_key=True
+    )
+    todo = Column(Integer, nullable=False, default=0, server_default="0")
+    in_progress = Column(Integer, nullable=False, default=0, server_default="0")
+    done = Column(Integer, nullable=False, default=0, server_default="0")
+    overdue = Column(Integer, nullable=False, default=0, server_default="0")
+    reconciled_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,5 +1,21 @@
 import enum
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, DateTime
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import (
+    DDL,
+    Column,
+    Integer,
+    String,
+    Text,
+    ForeignKey,
+    Enum,
+    DateTime,
+    Index,
+    event,
+    literal,
+    text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -18,6 +34,18 @@ class TaskPriority(str, enum.Enum):
 
 
 class Task(Base):
+    __table_args__ = (
+        Index("ix_task_project_id_status", "project_id", "status"),
+        # What the due-date scanner still has to look at; tasks leave it
+        # once flagged overdue, so it stays small however many linger.
+        Index(
+            "ix_task_due_date_unflagged",
+            "due_date",
+            postgresql_where=text("status <> 'DONE' AND overdue_at IS NULL"),
+            sqlite_where=text("status <> 'DONE' AND overdue_at IS NULL"),
+        ),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
@@ -28,7 +56,7 @@ class Task(Base):
     project_id = Column(Integer, ForeignKey("project.id"), nullable=False)
     project = relationship("Project", back_populates="tasks")
 
-    assignee_id = Column(Integer, ForeignKey("user.id"), nullable=True)
+    assignee_id = Column(Integer, ForeignKey("user.id"), nullable=True, index=True)
     assignee = relationship("User", back_populates="tasks_assigned")
 
     comments = relationship(
@@ -40,3 +68,85 @@ class Task(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Set by the due-date scanner when it sends the matching notification;
+    # ``overdue_at`` doubles as the overdue flag read by overdue views.
+    due_soon_notified_at = Column(DateTime(timezone=True), nullable=True)
+    overdue_at = Column(DateTime(timezone=True), nullable=True)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite, and columns created before timezone support, hand back naive
+    # datetimes; they hold UTC.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def due_date_changed(old: Optional[datetime], new: Optional[datetime]) -> bool:
+    """Whether ``new`` is a different instant from the stored ``old``."""
+    return _as_utc(old) != _as_utc(new)
+
+
+@event.listens_for(Task.due_date, "set", active_history=True)
+def _reset_due_date_flags(target, value, oldvalue, initiator):
+    # A new due date gets its own due-soon and overdue notifications.
+    # ``oldvalue`` is a symbol, not a datetime, for a task not yet stored.
+    if oldvalue is not None and not isinstance(oldvalue, datetime):
+        return
+    if due_date_changed(oldvalue, value):
+        target.due_soon_notified_at = None
+        target.overdue_at = None
+
+
+# Full-text search. Postgres indexes this expression with GIN, and queries
+# must repeat it exactly for the index to apply, so the constants are
+# rendered inline rather than sent as parameters.
+def _inline(value: str):
+    return literal(value, literal_execute=True)
+
+
+task_search_vector = func.to_tsvector(
+    _inline("english"),
+    func.coalesce(Task.__table__.c.title, _inline(""))
+    + _inline(" ")
+    + func.coalesce(Task.__table__.c.description, _inline("")),
+)
+
+Index("ix_task_search", task_search_vector, postgresql_using="gin").ddl_if(
+    dialect="postgresql"
+)
+
+# The partial index on due_date only serves queries that spell out its
+# ``status <> 'DONE'`` predicate; a bound status parameter does not match.
+task_is_open = Task.status != _inline(TaskStatus.DONE.name)
+
+# SQLite keeps an FTS5 index over title and description in ``task_fts``,
+# an external-content table that triggers keep in step with ``task``.
+TASK_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5("
+    "title, description, content='task', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_au "
+    "AFTER UPDATE OF title, description ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO task_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+for _statement in TASK_FTS_DDL:
+    event.listen(
+        Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS task_fts").execute_if(dialect="sqlite"),
+)
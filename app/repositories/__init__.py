@@ -19,6 +19,7 @@ from app.repositories.notification_repository import (
     CommentRepository,
     AttachmentRepository,
 )
+from app.repositories import task_stats_repository
 
 __all__ = [
     "BaseRepository",
@@ -38,4 +39,5 @@ __all__ = [
     "NotificationRepository",
     "CommentRepository",
     "AttachmentRepository",
+    "task_stats_repository",
 ]
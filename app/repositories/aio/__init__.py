@@ -0,0 +1,35 @@
+"""Async counterparts of the repositories, for endpoints using ``AsyncSession``."""
+
+from app.repositories.aio.base import AsyncBaseRepository
+from app.repositories.aio.task_repository import (
+    async_task_repository,
+    AsyncTaskRepository,
+)
+from app.repositories.aio.project_repository import (
+    async_project_repository,
+    async_project_member_repository,
+    AsyncProjectRepository,
+    AsyncProjectMemberRepository,
+)
+from app.repositories.aio.user_repository import (
+    async_user_repository,
+    AsyncUserRepository,
+)
+from app.repositories.aio.notification_repository import (
+    async_notification_repository,
+    AsyncNotificationRepository,
+)
+
+__all__ = [
+    "AsyncBaseRepository",
+    "async_task_repository",
+    "AsyncTaskRepository",
+    "async_project_repository",
+    "async_project_member_repository",
+    "AsyncProjectRepository",
+    "AsyncProjectMemberRepository",
+    "async_user_repository",
+    "AsyncUserRepository",
+    "async_notification_repository",
+    "AsyncNotificationRepository",
+]
@@ -0,0 +1,79 @@
+from typing import Any, Generic, List, Optional, Type, Union
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.base import (
+    CreateSchemaType,
+    ModelType,
+    UpdateSchemaType,
+    paginate,
+)
+
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    async def get(self, db: AsyncSession, id_: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id_)
+
+    async def get_multi(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[ModelType]:
+        stmt = paginate(
+            select(self.model), self.model.id, skip=skip, limit=limit, cursor=cursor
+        )
+        return list((await db.scalars(stmt)).all())
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        db_obj = self.model(**jsonable_encoder(obj_in))
+        db.add(db_obj)
+        await db.flush()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, dict[str, Any]]
+    ) -> ModelType:
+        if not db_obj:
+            raise ValueError("Database object cannot be None")
+
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        forbidden_fields = {"id", "created_at", "updated_at"}
+        columns = {column.key for column in self.model.__table__.columns}
+
+        for field, value in update_data.items():
+            if field in columns and field not in forbidden_fields:
+                setattr(db_obj, field, value)
+
+        db.add(db_obj)
+        await db.flush()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, db: AsyncSession, *, id_: int) -> Optional[ModelType]:
+        obj = await db.get(self.model, id_)
+        if not obj:
+            return None
+
+        await db.delete(obj)
+        await db.flush()
+        return obj
+
+    async def count(self, db: AsyncSession) -> int:
+        return await db.scalar(select(func.count(self.model.id)))
@@ -0,0 +1,62 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import false
+
+from app.models.extras import Notification
+from app.repositories.aio.base import AsyncBaseRepository
+from app.repositories.base import paginate
+from app.repositories.notification_repository import (
+    decrement_unread_statement,
+    increment_unread_statement,
+    mark_read_statement,
+)
+
+
+class AsyncNotificationRepository(AsyncBaseRepository[Notification, None, None]):
+
+    def __init__(self):
+        super().__init__(Notification)
+
+    async def get_by_user(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        unread_only: bool = False
+    ) -> List[Notification]:
+        stmt = select(Notification).where(Notification.user_id == user_id)
+        if unread_only:
+            stmt = stmt.where(Notification.is_read == false())
+        stmt = paginate(
+            stmt, Notification.id, skip=skip, limit=limit, cursor=cursor, descending=True
+        )
+        return list((await db.scalars(stmt)).all())
+
+    async def create_notification(
+        self, db: AsyncSession, *, user_id: int, title: str, message: str
+    ) -> Notification:
+        notification = Notification(user_id=user_id, title=title, message=message)
+        db.add(notification)
+        await db.execute(
+            increment_unread_statement(db.get_bind().dialect.name, [user_id])
+        )
+        await db.flush()
+        await db.refresh(notification)
+        return notification
+
+    async def mark_as_read(
+        self, db: AsyncSession, notification: Notification
+    ) -> Notification:
+        result = await db.execute(mark_read_statement(notification.id))
+        if result.rowcount == 1:
+            await db.execute(decrement_unread_statement(notification.user_id))
+        await db.refresh(notification)
+        return notification
+
+
+async_notification_repository = AsyncNotificationRepository()
@@ -0,0 +1,87 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project, ProjectMember
+from app.models.task import Task, task_is_open
+from app.repositories import task_stats_repository
+from app.repositories.aio.base import AsyncBaseRepository
+from app.repositories.base import paginate
+from app.schemas.project import ProjectCreate, ProjectUpdate
+
+
+class AsyncProjectRepository(
+    AsyncBaseRepository[Project, ProjectCreate, ProjectUpdate]
+):
+
+    def __init__(self):
+        super().__init__(Project)
+
+    async def get_by_organization(
+        self,
+        db: AsyncSession,
+        organization_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[Project]:
+        stmt = select(Project).where(Project.organization_id == organization_id)
+        stmt = paginate(stmt, Project.id, skip=skip, limit=limit, cursor=cursor)
+        return list((await db.scalars(stmt)).all())
+
+    async def get_member_projects(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[Project]:
+        stmt = (
+            select(Project)
+            .join(ProjectMember)
+            .where(ProjectMember.user_id == user_id)
+        )
+        stmt = paginate(stmt, Project.id, skip=skip, limit=limit, cursor=cursor)
+        return list((await db.scalars(stmt)).all())
+
+    async def get_task_stats(self, db: AsyncSession, project_id: int) -> dict:
+        """Task counts from ``project_task_stats``, a single-row lookup."""
+        stats = await db.scalar(
+            task_stats_repository.stats_statement([project_id])
+        )
+        return task_stats_repository.as_dict(stats)
+
+    async def get_overdue_tasks(self, db: AsyncSession, project_id: int) -> List[Task]:
+        stmt = select(Task).where(
+            Task.project_id == project_id,
+            Task.overdue_at.is_not(None),
+            task_is_open,
+        )
+        return list((await db.scalars(stmt)).all())
+
+
+class AsyncProjectMemberRepository:
+
+    async def get_member(
+        self, db: AsyncSession, project_id: int, user_id: int
+    ) -> Optional[ProjectMember]:
+        return await db.get(ProjectMember, (project_id, user_id))
+
+    async def add_member(
+        self, db: AsyncSession, project_id: int, user_id: int
+    ) -> ProjectMember:
+        member = ProjectMember(project_id=project_id, user_id=user_id)
+        db.add(member)
+        await db.flush()
+        return member
+
+    async def is_member(self, db: AsyncSession, project_id: int, user_id: int) -> bool:
+        return await self.get_member(db, project_id, user_id) is not None
+
+
+async_project_repository = AsyncProjectRepository()
+async_project_member_repository = AsyncProjectMemberRepository()
@@ -0,0 +1,97 @@
+from typing import Any, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.repositories.aio.base import AsyncBaseRepository
+from app.repositories.base import SortOrder, paginate
+from app.repositories.task_repository import SORT_EXPRESSIONS, task_repository
+from app.schemas.task import TaskCreate, TaskFilters, TaskUpdate
+
+
+class AsyncTaskRepository(AsyncBaseRepository[Task, TaskCreate, TaskUpdate]):
+
+    def __init__(self):
+        super().__init__(Task)
+
+    async def get_by_project(
+        self,
+        db: AsyncSession,
+        project_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[Task]:
+        stmt = select(Task).where(Task.project_id == project_id)
+        stmt = paginate(stmt, Task.id, skip=skip, limit=limit, cursor=cursor)
+        return list((await db.scalars(stmt)).all())
+
+    async def get_by_organization(
+        self,
+        db: AsyncSession,
+        organization_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[TaskFilters] = None
+    ) -> List[Task]:
+        """Filter and sort like the sync repository, from the same helpers."""
+        filters = filters or TaskFilters()
+        stmt = (
+            select(Task)
+            .join(Project)
+            .where(Project.organization_id == organization_id)
+            .where(*task_repository._conditions(db, filters))
+        )
+        expression = SORT_EXPRESSIONS[filters.sort.removeprefix("-")]
+        order = SortOrder(filters.sort, expression)
+        stmt = paginate(
+            stmt, Task.id, skip=skip, limit=limit, cursor=cursor, order=order
+        )
+        return list((await db.scalars(stmt)).all())
+
+    async def get_by_assignee(
+        self,
+        db: AsyncSession,
+        assignee_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[Task]:
+        stmt = select(Task).where(Task.assignee_id == assignee_id)
+        stmt = paginate(stmt, Task.id, skip=skip, limit=limit, cursor=cursor)
+        return list((await db.scalars(stmt)).all())
+
+    async def create_task(
+        self,
+        db: AsyncSession,
+        *,
+        title: str,
+        project_id: int,
+        description: Optional[str] = None,
+        status: TaskStatus = TaskStatus.TODO,
+        priority: TaskPriority = TaskPriority.MEDIUM,
+        due_date: Any = None,
+        assignee_id: Optional[int] = None
+    ) -> Task:
+        task = Task(
+            title=title,
+            description=description,
+            status=status,
+            priority=priority,
+            due_date=due_date,
+            project_id=project_id,
+            assignee_id=assignee_id,
+        )
+        db.add(task)
+        await db.flush()
+        await db.refresh(task)
+        return task
+
+
+async_task_repository = AsyncTaskRepository()
@@ -0,0 +1,37 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.repositories.aio.base import AsyncBaseRepository
+from app.repositories.base import paginate
+from app.schemas.user import UserCreate, UserUpdate
+
+
+class AsyncUserRepository(AsyncBaseRepository[User, UserCreate, UserUpdate]):
+
+    def __init__(self):
+        super().__init__(User)
+
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
+        return await db.scalar(select(User).where(User.email == email))
+
+    async def get_by_organization(
+        self,
+        db: AsyncSession,
+        organization_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[User]:
+        stmt = select(User).where(User.organization_id == organization_id)
+        stmt = paginate(stmt, User.id, skip=skip, limit=limit, cursor=cursor)
+        return list((await db.scalars(stmt)).all())
+
+    async def email_exists(self, db: AsyncSession, email: str) -> bool:
+        return await self.get_by_email(db, email) is not None
+
+
+async_user_repository = AsyncUserRepository()
@@ -1,15 +1,160 @@
-from typing import Any, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import json
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Query, Session, load_only, selectinload
+from sqlalchemy import Select, and_, func, or_, select
 from app.db.base_class import Base
+from app.schemas.fieldsets import Fieldset
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+@dataclass(frozen=True)
+class SortOrder:
+    """A list ordering: the key as the client wrote it and its SQL expression.
+
+    ``key`` may carry a ``-`` prefix for descending order. ``expression`` is
+    ``None`` when the list is ordered by id alone. Ties are broken by id in
+    the same direction.
+    """
+
+    key: str = "id"
+    expression: Any = None
+
+    @property
+    def descending(self) -> bool:
+        return self.key.startswith("-")
+
+
+def _cursor_sort(sort: Optional[str]) -> Optional[str]:
+    # Cursors for the default order keep their original ``{"id": n}`` shape.
+    return None if sort in (None, "id") else sort
+
+
+def encode_cursor(last_id: int, sort: Optional[str] = None) -> str:
+    payload = {"id": last_id}
+    if _cursor_sort(sort):
+        payload["sort"] = sort
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: Optional[str] = None) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = payload["id"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError("Invalid cursor")
+    if payload.get("sort") != _cursor_sort(sort):
+        raise ValueError("Cursor does not match the requested sort")
+    return value
+
+
+def next_cursor(
+    items: Sequence[Any], limit: int, sort: Optional[str] = None
+) -> Optional[str]:
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(items[-1].id, sort)
+
+
+def paginate(
+    query: Union[Query, Select],
+    id_column: Any,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    order: Optional[SortOrder] = None
+) -> Query:
+    """Order ``query`` by ``id_column`` and apply keyset or offset paging.
+
+    Works for both legacy ``Query`` objects and 2.0 ``select()`` statements.
+
+    With a cursor the next page is located through the primary key index,
+    so page N costs the same as page 1; ``skip`` is kept for offset callers
+    and rejected alongside a cursor, where it would drop rows silently.
+
+    ``order`` sorts by another expression first. Its cursor still holds only
+    the last id: the page continues after that row's current sort value,
+    read back with a primary key lookup, so values never round-trip through
+    the client.
+    """
+    if order is not None:
+        descending = order.descending
+    expression = order.expression if order is not None else None
+    if cursor and skip:
+        raise ValueError("skip cannot be combined with a cursor")
+    if cursor:
+        last_id = decode_cursor(cursor, order.key if order is not None else None)
+        after_id = id_column < last_id if descending else id_column > last_id
+        if expression is None:
+            query = query.filter(after_id)
+        else:
+            anchor = (
+                select(expression)
+                .where(id_column == last_id)
+                .correlate(None)
+                .scalar_subquery()
+            )
+            after = expression < anchor if descending else expression > anchor
+            query = query.filter(or_(after, and_(expression == anchor, after_id)))
+    ordering = [id_column.desc() if descending else id_column.asc()]
+    if expression is not None:
+        ordering.insert(0, expression.desc() if descending else expression.asc())
+    query = query.order_by(*ordering)
+    if skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def apply_fieldset(
+    query: Union[Query, Select],
+    model: Type[Base],
+    fieldset: Fieldset,
+    relations: Dict[str, Tuple[Any, ...]],
+) -> Query:
+    """Load only the requested columns and eager-load the expanded relations.
+
+    ``relations`` maps an expansion name to the attribute path to load, e.g.
+    ``{"members": (Project.members, ProjectMember.user)}``. The foreign keys
+    an expanded relation is joined on are always loaded with it.
+    """
+    options = []
+    if fieldset.fields is not None:
+        names = set(fieldset.fields) | {"id"}
+        for name in fieldset.expand:
+            names.update(c.key for c in relations[name][0].property.local_columns)
+        options.append(load_only(*(getattr(model, n) for n in sorted(names))))
+    for name in sorted(fieldset.expand):
+        first, *rest = relations[name]
+        loader = selectinload(first)
+        for attr in rest:
+            loader = loader.selectinload(attr)
+        options.append(loader)
+    return query.options(*options) if options else query
+
+
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
@@ -17,10 +162,28 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get(self, db: Session, id_: Any) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id_).first()
 
+    def get_many(self, db: Session, ids: Sequence[Any]) -> List[ModelType]:
+        if not ids:
+            return []
+        return (
+            db.query(self.model)
+            .filter(self.model.id.in_(ids))
+            .order_by(self.model.id)
+            .all()
+        )
+
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        query = db.query(self.model)
+        return paginate(
+            query, self.model.id, skip=skip, limit=limit, cursor=cursor
+        ).all()
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
@@ -1,10 +1,21 @@
-from typing import List
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, List, Optional
 
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from sqlalchemy.sql.expression import false
+from sqlalchemy.sql.expression import false, true
 
-from app.models.extras import Notification, Comment, Attachment
-from app.repositories.base import BaseRepository
+from app.models.extras import (
+    Notification,
+    NotificationArchive,
+    NotificationCounter,
+    NotificationOutbox,
+    Comment,
+    Attachment,
+)
+from app.repositories.base import BaseRepository, paginate
 
 
 def get_by_user(
@@ -13,12 +24,27 @@ def get_by_user(
     *,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     unread_only: bool = False
 ) -> List[Notification]:
     query = db.query(Notification).filter(Notification.user_id == user_id)
     if unread_only:
         query = query.filter(Notification.is_read == false())
-    return query.order_by(Notification.id.desc()).offset(skip).limit(limit).all()
+    return paginate(
+        query, Notification.id, skip=skip, limit=limit, cursor=cursor, descending=True
+    ).all()
+
+
+def get_since(
+        db: Session, user_id: int, after_id: int, *, limit: int = 100
+) -> List[Notification]:
+    return (
+        db.query(Notification)
+        .filter(Notification.user_id == user_id, Notification.id > after_id)
+        .order_by(Notification.id)
+        .limit(limit)
+        .all()
+    )
 
 
 def create_notification(
@@ -26,19 +52,185 @@ def create_notification(
 ) -> Notification:
     notification = Notification(user_id=user_id, title=title, message=message)
     db.add(notification)
+    increment_unread(db, [user_id])
     db.flush()
     db.refresh(notification)
     return notification
 
 
+def enqueue_notifications(db: Session, rows: List[dict]) -> None:
+    """Add outbox rows to the current transaction; the caller commits."""
+    if rows:
+        db.execute(insert(NotificationOutbox), rows)
+
+
+def claim_outbox(db: Session, limit: int) -> List[NotificationOutbox]:
+    # SKIP LOCKED lets several workers drain the outbox without handing
+    # the same row to two of them; other dialects ignore it.
+    return list(
+        db.scalars(
+            select(NotificationOutbox)
+            .order_by(NotificationOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    )
+
+
+def move_outbox_to_notifications(
+        db: Session, rows: List[NotificationOutbox]
+) -> List[Notification]:
+    notifications = list(
+        db.scalars(
+            insert(Notification).returning(Notification),
+            [
+                {
+                    "user_id": row.user_id,
+                    "title": row.title,
+                    "message": row.message,
+                    "is_read": False,
+                    # Enqueue time, so ordering and retention ignore how
+                    # long the row waited in the outbox.
+                    "created_at": row.created_at,
+                }
+                for row in rows
+            ],
+        )
+    )
+    db.execute(
+        delete(NotificationOutbox).where(
+            NotificationOutbox.id.in_([row.id for row in rows])
+        )
+    )
+    increment_unread(db, [row.user_id for row in rows])
+    return notifications
+
+
+def increment_unread_statement(dialect_name: str, user_ids: Iterable[int]):
+    counts = Counter(user_ids)
+    if not counts:
+        return None
+    dialect = postgresql if dialect_name == "postgresql" else sqlite
+    stmt = dialect.insert(NotificationCounter).values(
+        [{"user_id": user_id, "unread": n} for user_id, n in counts.items()]
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[NotificationCounter.user_id],
+        set_={"unread": NotificationCounter.unread + stmt.excluded.unread},
+    )
+
+
+def increment_unread(db: Session, user_ids: Iterable[int]) -> None:
+    stmt = increment_unread_statement(db.get_bind().dialect.name, user_ids)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+def decrement_unread_statement(user_id: int, by: int = 1):
+    return (
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(
+            unread=case(
+                (NotificationCounter.unread > by, NotificationCounter.unread - by),
+                else_=0,
+            )
+        )
+    )
+
+
+def decrement_unread(db: Session, user_id: int, by: int = 1) -> None:
+    db.execute(decrement_unread_statement(user_id, by))
+
+
+def get_unread_count(db: Session, user_id: int) -> int:
+    count = db.scalar(
+        select(NotificationCounter.unread).where(
+            NotificationCounter.user_id == user_id
+        )
+    )
+    return count or 0
+
+
+def mark_all_read(db: Session, user_id: int) -> int:
+    result = db.execute(
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read == false())
+        .values(is_read=true()),
+        execution_options={"synchronize_session": False},
+    )
+    # Only what this statement marked: notifications dispatched meanwhile
+    # are still unread and stay counted.
+    if result.rowcount:
+        decrement_unread(db, user_id, result.rowcount)
+    return result.rowcount
+
+
+def mark_read_statement(notification_id: int):
+    # Conditional, so of two concurrent calls only one sees a row updated
+    # and takes it off the counter.
+    return (
+        update(Notification)
+        .where(Notification.id == notification_id, Notification.is_read == false())
+        .values(is_read=true())
+        .execution_options(synchronize_session=False)
+    )
+
+
 def mark_as_read(db: Session, notification: Notification) -> Notification:
-    notification.is_read = True
-    db.add(notification)
-    db.flush()
+    result = db.execute(mark_read_statement(notification.id))
+    if result.rowcount == 1:
+        decrement_unread(db, notification.user_id)
     db.refresh(notification)
     return notification
 
 
+def purge_before(
+        db: Session,
+        before: datetime,
+        *,
+        read_only: bool,
+        limit: int,
+        archive: bool = False
+) -> int:
+    """Delete (or move to the archive) one batch of notifications created
+    before ``before``. Unread rows removed here are taken off the counters."""
+    stmt = select(Notification.id, Notification.user_id, Notification.is_read).where(
+        Notification.created_at < before
+    )
+    if read_only:
+        stmt = stmt.where(Notification.is_read == true())
+    rows = db.execute(
+        stmt.order_by(Notification.id).limit(limit).with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return 0
+
+    ids = [row.id for row in rows]
+    if archive:
+        db.execute(
+            insert(NotificationArchive).from_select(
+                ["id", "user_id", "title", "message", "is_read", "created_at"],
+                select(
+                    Notification.id,
+                    Notification.user_id,
+                    Notification.title,
+                    Notification.message,
+                    func.coalesce(Notification.is_read, false()),
+                    Notification.created_at,
+                ).where(Notification.id.in_(ids)),
+            )
+        )
+    db.execute(
+        delete(Notification)
+        .where(Notification.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    for user_id, n in Counter(r.user_id for r in rows if not r.is_read).items():
+        decrement_unread(db, user_id, by=n)
+    return len(ids)
+
+
 class NotificationRepository(BaseRepository[Notification, None, None]):
 
     def __init__(self):
@@ -75,9 +267,23 @@ def count_by_task(db: Session, task_id: int) -> int:
     return db.query(Attachment).filter(Attachment.task_id == task_id).count()
 
 def create_attachment(
-        db: Session, *, filename: str, file_path: str, task_id: int
+        db: Session,
+        *,
+        filename: str,
+        file_path: str,
+        task_id: int,
+        size: Optional[int] = None,
+        sha256: Optional[str] = None,
+        content_type: Optional[str] = None
 ) -> Attachment:
-    attachment = Attachment(filename=filename, file_path=file_path, task_id=task_id)
+    attachment = Attachment(
+        filename=filename,
+        file_path=file_path,
+        task_id=task_id,
+        size=size,
+        sha256=sha256,
+        content_type=content_type,
+    )
     db.add(attachment)
     db.flush()
     return attachment
@@ -1,8 +1,14 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import Row, func, select
 from sqlalchemy.orm import Session
 
 from app.repositories.base import BaseRepository
 from app.models.organization import Organization
+from app.models.project import Project, ProjectMember, ProjectTaskStats
+from app.models.task import Task, TaskStatus, task_is_open
+from app.models.user import User
+from app.repositories.task_stats_repository import count_where
 from app.schemas.organization import OrganizationCreate
 
 
@@ -26,4 +32,118 @@ class OrganizationRepository(
         db.refresh(org)
         return org
 
+    def _visible_projects(
+        self, organization_id: int, member_id: Optional[int]
+    ) -> List[object]:
+        """Project conditions: the organization's, or only ``member_id``'s."""
+        conditions = [Project.organization_id == organization_id]
+        if member_id is not None:
+            conditions.append(
+                Project.id.in_(
+                    select(ProjectMember.project_id).where(
+                        ProjectMember.user_id == member_id
+                    )
+                )
+            )
+        return conditions
+
+    def dashboard_projects(
+        self, db: Session, organization_id: int, *, member_id: Optional[int] = None
+    ) -> List[Row]:
+        """Per-project counts from ``project_task_stats``, one row each."""
+        counts = {
+            c: func.coalesce(getattr(ProjectTaskStats, c), 0)
+            for c in ("todo", "in_progress", "done", "overdue")
+        }
+        total = counts["todo"] + counts["in_progress"] + counts["done"]
+        stmt = (
+            select(
+                Project.id,
+                Project.name,
+                *(expression.label(c) for c, expression in counts.items()),
+                total.label("total"),
+            )
+            .outerjoin(ProjectTaskStats)
+            .where(*self._visible_projects(organization_id, member_id))
+            .order_by(Project.id)
+        )
+        return list(db.execute(stmt))
+
+    def dashboard_workload(
+        self,
+        db: Session,
+        organization_id: int,
+        *,
+        member_id: Optional[int] = None
+    ) -> List[Row]:
+        """Open tasks per assignee, busiest first.
+
+        Overdue counts flagged tasks, as ``project_task_stats`` does, so the
+        workload and project figures agree.
+        """
+        stmt = (
+            select(
+                Task.assignee_id.label("user_id"),
+                User.full_name,
+                func.count(Task.id).label("open"),
+                count_where(Task.status == TaskStatus.IN_PROGRESS).label(
+                    "in_progress"
+                ),
+                count_where(Task.overdue_at.is_not(None)).label("overdue"),
+            )
+            .join(Project, Task.project_id == Project.id)
+            .outerjoin(User, Task.assignee_id == User.id)
+            .where(
+                task_is_open,
+                *self._visible_projects(organization_id, member_id),
+            )
+            .group_by(Task.assignee_id, User.full_name)
+            .order_by(func.count(Task.id).desc(), Task.assignee_id)
+        )
+        return list(db.execute(stmt))
+
+    def dashboard_activity(
+        self,
+        db: Session,
+        organization_id: int,
+        since: datetime,
+        *,
+        per_project: int,
+        limit: int,
+        member_id: Optional[int] = None
+    ) -> List[Row]:
+        """Most recently touched tasks, at most ``per_project`` per project.
+
+        ``row_number()`` ranks each project's tasks so that one busy project
+        cannot push every other one off the list.
+        """
+        touched = func.coalesce(Task.updated_at, Task.created_at)
+        ranked = (
+            select(
+                Task.id.label("task_id"),
+                Task.title,
+                Task.project_id,
+                Task.status,
+                Task.assignee_id,
+                touched.label("updated_at"),
+                func.row_number()
+                .over(partition_by=Task.project_id, order_by=touched.desc())
+                .label("rank"),
+            )
+            .join(Project, Task.project_id == Project.id)
+            .where(
+                touched >= since,
+                *self._visible_projects(organization_id, member_id),
+            )
+            .subquery()
+        )
+        stmt = (
+            select(*(c for c in ranked.c if c.name != "rank"))
+            .where(ranked.c.rank <= per_project)
+            .order_by(ranked.c.updated_at.desc(), ranked.c.task_id.desc())
+            .limit(limit)
+        )
+        return list(db.execute(stmt))
+
+
 organization_repository = OrganizationRepository()
@@ -1,41 +1,59 @@
-from typing import Any, List, Optional
-from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Any, Iterable, List, Optional, Set
+from sqlalchemy.orm import Session, selectinload
 
-from app.repositories.base import BaseRepository
+from app.repositories import task_stats_repository
+from app.repositories.base import BaseRepository, apply_fieldset, paginate
 from app.models.project import Project, ProjectMember
-from app.models.task import Task, TaskStatus
-from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.models.task import Task, task_is_open
+from app.schemas.fieldsets import Fieldset
+from app.schemas.project import PROJECT_FIELDS, ProjectCreate, ProjectUpdate
 
 
 class ProjectRepository(BaseRepository[Project, ProjectCreate, ProjectUpdate]):
+    relations = {"members": (Project.members, ProjectMember.user)}
 
     def __init__(self):
         super().__init__(Project)
 
     def get_by_organization(
-        self, db: Session, organization_id: int, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        organization_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None
     ) -> List[Project]:
-        return (
-            db.query(Project)
-            .filter(Project.organization_id == organization_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = db.query(Project).filter(Project.organization_id == organization_id)
+        query = apply_fieldset(
+            query, Project, fieldset or PROJECT_FIELDS.default, self.relations
         )
+        return paginate(
+            query, Project.id, skip=skip, limit=limit, cursor=cursor
+        ).all()
 
     def get_member_projects(
-        self, db: Session, user_id: int, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        user_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None
     ) -> List[Project]:
-        return (
+        query = (
             db.query(Project)
             .join(ProjectMember)
             .filter(ProjectMember.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        query = apply_fieldset(
+            query, Project, fieldset or PROJECT_FIELDS.default, self.relations
+        )
+        return paginate(
+            query, Project.id, skip=skip, limit=limit, cursor=cursor
+        ).all()
 
     def create_project(
         self,
@@ -54,22 +72,20 @@ class ProjectRepository(BaseRepository[Project, ProjectCreate, ProjectUpdate]):
         return project
 
     def get_task_stats(self, db: Session, project_id: int) -> dict:
-        stats = (
-            db.query(Task.status, func.count(Task.id))
-            .filter(Task.project_id == project_id)
-            .group_by(Task.status)
-            .all()
-        )
-        return {k.value: v for k, v in stats}
+        """Task counts from ``project_task_stats``, a single-row lookup."""
+        stats = task_stats_repository.get_stats(db, [project_id]).get(project_id)
+        return task_stats_repository.as_dict(stats)
 
     def get_overdue_tasks(self, db: Session, project_id: int) -> list[type[Task]]:
+        """Open tasks the due-date scanner has flagged overdue."""
         return (
             db.query(Task)
             .filter(
                 Task.project_id == project_id,
-                Task.due_date < datetime.utcnow(),
-                Task.status != TaskStatus.DONE,
+                Task.overdue_at.is_not(None),
+                task_is_open,
             )
+            .options(selectinload(Task.assignee))
             .all()
         )
 
@@ -96,6 +112,16 @@ class ProjectMemberRepository:
     def is_member(self, db: Session, project_id: int, user_id: int) -> bool:
         return self.get_member(db, project_id, user_id) is not None
 
+    def member_project_ids(
+        self, db: Session, user_id: int, project_ids: Iterable[int]
+    ) -> Set[int]:
+        """The subset of ``project_ids`` the user is a member of."""
+        rows = db.query(ProjectMember.project_id).filter(
+            ProjectMember.user_id == user_id,
+            ProjectMember.project_id.in_(list(project_ids)),
+        )
+        return {project_id for (project_id,) in rows}
+
 
 project_repository = ProjectRepository()
 project_member_repository = ProjectMemberRepository()
@@ -1,27 +1,91 @@
-from typing import Any, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import (
+    Integer,
+    Row,
+    case,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.orm import Session
 
-from app.repositories.base import BaseRepository
-from app.models.task import Task, TaskStatus, TaskPriority
+from app.repositories.base import (
+    BaseRepository,
+    SortOrder,
+    apply_fieldset,
+    paginate,
+)
+from app.models.task import (
+    Task,
+    TaskPriority,
+    TaskStatus,
+    due_date_changed,
+    task_is_open,
+    task_search_vector,
+)
 from app.models.project import Project
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.fieldsets import Fieldset
+from app.schemas.task import TASK_FIELDS, TaskCreate, TaskFilters, TaskUpdate
+
+
+EXPORT_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.due_date,
+    Task.project_id,
+    Task.assignee_id,
+    Task.created_at,
+    Task.updated_at,
+)
+
+# Sort keys accepted by ``TaskFilters.sort``. Every expression is non-null
+# so keyset paging can compare against it: tasks without a due date sort
+# after all others, never-updated tasks by their creation time, and enums
+# by their declared order rather than alphabetically.
+SORT_EXPRESSIONS = {
+    "id": None,
+    "created_at": Task.created_at,
+    "updated_at": func.coalesce(Task.updated_at, Task.created_at),
+    "due_date": func.coalesce(
+        Task.due_date, literal(datetime(9999, 12, 31, tzinfo=timezone.utc))
+    ),
+    "priority": case(*[(Task.priority == p, i) for i, p in enumerate(TaskPriority)]),
+    "status": case(*[(Task.status == s, i) for i, s in enumerate(TaskStatus)]),
+    "title": Task.title,
+}
+
+
+def _fts5_query(q: str) -> str:
+    # Each word becomes a quoted FTS5 string, so operators and punctuation
+    # in user input are matched literally; the words are ANDed together.
+    return " ".join('"' + word.replace('"', '""') + '"' for word in q.split())
 
 
 class TaskRepository(BaseRepository[Task, TaskCreate, TaskUpdate]):
+    relations = {"assignee": (Task.assignee,), "project": (Task.project,)}
 
     def __init__(self):
         super().__init__(Task)
 
     def get_by_project(
-        self, db: Session, project_id: int, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        project_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Task]:
-        return (
-            db.query(Task)
-            .filter(Task.project_id == project_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = db.query(Task).filter(Task.project_id == project_id)
+        return paginate(query, Task.id, skip=skip, limit=limit, cursor=cursor).all()
 
     def get_by_organization(
         self,
@@ -30,38 +94,116 @@ class TaskRepository(BaseRepository[Task, TaskCreate, TaskUpdate]):
         *,
         skip: int = 0,
         limit: int = 100,
-        project_id: Optional[int] = None,
-        status: Optional[TaskStatus] = None,
-        priority: Optional[TaskPriority] = None,
-        assignee_id: Optional[int] = None
+        cursor: Optional[str] = None,
+        filters: Optional[TaskFilters] = None,
+        fieldset: Optional[Fieldset] = None
     ) -> List[Task]:
+        filters = filters or TaskFilters()
         query = (
             db.query(Task)
             .join(Project)
             .filter(Project.organization_id == organization_id)
         )
+        query = apply_fieldset(
+            query, Task, fieldset or TASK_FIELDS.default, self.relations
+        )
+        query = query.filter(*self._conditions(db, filters))
+        expression = SORT_EXPRESSIONS[filters.sort.removeprefix("-")]
+        order = SortOrder(filters.sort, expression)
+        return paginate(
+            query, Task.id, skip=skip, limit=limit, cursor=cursor, order=order
+        ).all()
 
-        if project_id:
-            query = query.filter(Task.project_id == project_id)
-        if status:
-            query = query.filter(Task.status == status)
-        if priority:
-            query = query.filter(Task.priority == priority)
-        if assignee_id:
-            query = query.filter(Task.assignee_id == assignee_id)
+    def _conditions(self, db: Session, filters: TaskFilters) -> List[Any]:
+        conditions = []
+        if filters.project_id:
+            conditions.append(Task.project_id == filters.project_id)
+        if filters.assignee_id:
+            conditions.append(Task.assignee_id == filters.assignee_id)
+        if filters.status:
+            conditions.append(Task.status.in_(filters.status))
+        if filters.priority:
+            conditions.append(Task.priority.in_(filters.priority))
+        for column, after, before in (
+            (Task.due_date, filters.due_after, filters.due_before),
+            (Task.created_at, filters.created_after, filters.created_before),
+            (Task.updated_at, filters.updated_after, filters.updated_before),
+        ):
+            if after is not None:
+                conditions.append(column >= after)
+            if before is not None:
+                conditions.append(column < before)
+        if filters.overdue is not None:
+            # Flagged by the due-date scanner, like the overdue views.
+            if filters.overdue:
+                conditions.append(Task.overdue_at.is_not(None))
+                conditions.append(task_is_open)
+            else:
+                conditions.append(
+                    or_(Task.overdue_at.is_(None), Task.status == TaskStatus.DONE)
+                )
+        if filters.q and filters.q.strip():
+            conditions.append(self._search(db, filters.q))
+        return conditions
+
+    def _search(self, db: Session, q: str) -> Any:
+        """Full-text match on title and description.
 
-        return query.offset(skip).limit(limit).all()
+        Postgres uses the GIN index over ``task_search_vector``, SQLite the
+        ``task_fts`` FTS5 table; other databases fall back to a substring scan.
+        """
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            query = func.websearch_to_tsquery(literal("english"), q)
+            return task_search_vector.op("@@")(query)
+        if dialect == "sqlite":
+            matches = text(
+                "SELECT rowid FROM task_fts WHERE task_fts MATCH :terms"
+            ).bindparams(terms=_fts5_query(q))
+            return Task.id.in_(matches.columns(rowid=Integer))
+        for char in ("\\", "%", "_"):
+            q = q.replace(char, "\\" + char)
+        pattern = f"%{q}%"
+        return or_(
+            Task.title.ilike(pattern, escape="\\"),
+            Task.description.ilike(pattern, escape="\\"),
+        )
 
     def get_by_assignee(
-        self, db: Session, assignee_id: int, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        assignee_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Task]:
-        return (
-            db.query(Task)
-            .filter(Task.assignee_id == assignee_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = db.query(Task).filter(Task.assignee_id == assignee_id)
+        return paginate(query, Task.id, skip=skip, limit=limit, cursor=cursor).all()
+
+    def stream_by_organization(
+        self,
+        db: Session,
+        organization_id: int,
+        *,
+        project_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """Yield task rows as plain tuples through a server-side cursor.
+
+        ``yield_per`` keeps only ``batch_size`` rows in memory at a time, so
+        an export costs the same memory for a hundred tasks or a million.
+        """
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .join(Project)
+            .where(Project.organization_id == organization_id)
+            .order_by(Task.id)
+            .execution_options(yield_per=batch_size)
         )
+        if project_id:
+            stmt = stmt.where(Task.project_id == project_id)
+        yield from db.execute(stmt)
 
     def create_task(
         self,
@@ -89,4 +231,90 @@ class TaskRepository(BaseRepository[Task, TaskCreate, TaskUpdate]):
         db.refresh(task)
         return task
 
+    def create_many(self, db: Session, rows: List[Dict[str, Any]]) -> List[Task]:
+        """Batched INSERT ... RETURNING; the result is not in input order.
+
+        Asking for input order makes SQLAlchemy fall back to one statement
+        per row on backends without an insert sentinel, e.g. SQLite.
+        """
+        if not rows:
+            return []
+        return list(db.scalars(insert(Task).returning(Task), rows))
+
+    def update_many(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Bulk UPDATE by primary key; each row holds ``id`` and the new values.
+
+        Rows setting the same columns are sent together as one executemany.
+        Changing ``due_date`` clears the due-date notification flags, as the
+        attribute listener on ``Task.due_date`` does for ORM writes; resending
+        the stored value leaves them alone.
+        """
+        dated = [row["id"] for row in rows if "due_date" in row]
+        if dated:
+            stored = dict(
+                db.execute(
+                    select(Task.id, Task.due_date).where(Task.id.in_(dated))
+                ).all()
+            )
+            rows = [
+                {**row, "due_soon_notified_at": None, "overdue_at": None}
+                if "due_date" in row
+                and due_date_changed(stored.get(row["id"]), row["due_date"])
+                else row
+                for row in rows
+            ]
+        if rows:
+            db.execute(update(Task), rows)
+
+    def claim_overdue(self, db: Session, now: datetime, limit: int) -> List[Row]:
+        """Lock open tasks past due and not yet flagged overdue."""
+        return self._claim(db, [Task.due_date < now], limit)
+
+    def claim_due_soon(
+        self, db: Session, now: datetime, until: datetime, limit: int
+    ) -> List[Row]:
+        """Lock open tasks due before ``until`` not yet notified as due soon."""
+        return self._claim(
+            db,
+            [
+                Task.due_date >= now,
+                Task.due_date < until,
+                Task.due_soon_notified_at.is_(None),
+            ],
+            limit,
+        )
+
+    def _claim(self, db: Session, conditions: List[Any], limit: int) -> List[Row]:
+        # Always within ix_task_due_date_unflagged; rows another scanner
+        # holds are skipped rather than waited on.
+        stmt = (
+            select(
+                Task.id,
+                Task.title,
+                Task.assignee_id,
+                Task.due_date,
+                Task.project_id,
+                Task.status,
+                Project.organization_id,
+            )
+            .join(Project)
+            .where(
+                task_is_open,
+                Task.overdue_at.is_(None),
+                *conditions,
+            )
+            .order_by(Task.due_date)
+            .limit(limit)
+            .with_for_update(of=Task, skip_locked=True)
+        )
+        return list(db.execute(stmt))
+
+    def flag(self, db: Session, ids: List[int], **values: Any) -> None:
+        db.execute(
+            update(Task)
+            .where(Task.id.in_(ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
 task_repository = TaskRepository()
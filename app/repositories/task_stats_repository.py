@@ -0,0 +1,266 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from sqlalchemy import and_, case, event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.project import Project, ProjectTaskStats
+from app.models.task import Task, TaskStatus, task_is_open
+
+STATUS_COLUMNS = {
+    TaskStatus.TODO: "todo",
+    TaskStatus.IN_PROGRESS: "in_progress",
+    TaskStatus.DONE: "done",
+}
+COUNT_COLUMNS = ("todo", "in_progress", "done", "overdue")
+TRACKED = ("project_id", "status", "overdue_at")
+
+
+class TaskState(NamedTuple):
+    """The fields of a task that the project counts depend on.
+
+    Overdue means flagged by the due-date scanner and still open, the same
+    definition the overdue filters and views use.
+    """
+
+    project_id: int
+    status: TaskStatus
+    overdue_at: Optional[datetime]
+
+    @classmethod
+    def of(cls, task: Task) -> "TaskState":
+        return cls(task.project_id, task.status, task.overdue_at)
+
+    @property
+    def overdue(self) -> bool:
+        return self.overdue_at is not None and self.status != TaskStatus.DONE
+
+
+Change = Tuple[Optional[TaskState], Optional[TaskState]]
+
+
+def stats_deltas(changes: Iterable[Change]) -> Dict[int, dict]:
+    """Net count changes per project for ``(before, after)`` task states.
+
+    ``before`` is ``None`` for a created task, ``after`` for a deleted one.
+    """
+    deltas = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+    for before, after in changes:
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            row = deltas[state.project_id]
+            row[STATUS_COLUMNS[state.status]] += sign
+            if state.overdue:
+                row["overdue"] += sign
+    return {pid: row for pid, row in deltas.items() if any(row.values())}
+
+
+def _upsert(dialect_name: str, rows: List[dict], set_=None):
+    """INSERT ``rows``; on conflict apply ``set_(excluded)``, or do nothing."""
+    dialect = postgresql if dialect_name == "postgresql" else sqlite
+    stmt = dialect.insert(ProjectTaskStats).values(rows)
+    if set_ is None:
+        return stmt.on_conflict_do_nothing(
+            index_elements=[ProjectTaskStats.project_id]
+        )
+    return stmt.on_conflict_do_update(
+        index_elements=[ProjectTaskStats.project_id], set_=set_(stmt.excluded)
+    )
+
+
+def apply_deltas_statement(dialect_name: str, deltas: Dict[int, dict]):
+    if not deltas:
+        return None
+    rows = [{"project_id": pid, **row} for pid, row in sorted(deltas.items())]
+    return _upsert(
+        dialect_name,
+        rows,
+        lambda excluded: {
+            c: getattr(ProjectTaskStats, c) + getattr(excluded, c)
+            for c in COUNT_COLUMNS
+        },
+    )
+
+
+def record_task_changes(db: Session, changes: Iterable[Change]) -> None:
+    """Apply task writes to the counts in the caller's transaction.
+
+    ORM flushes are picked up automatically; this is for writes that bypass
+    the unit of work, such as bulk ``insert()``/``update()`` statements.
+    """
+    deltas = stats_deltas(changes)
+    stmt = apply_deltas_statement(db.get_bind().dialect.name, deltas)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+def stats_statement(project_ids: Sequence[int]):
+    """The stats rows of ``project_ids``, for sync and async sessions alike."""
+    return select(ProjectTaskStats).where(
+        ProjectTaskStats.project_id.in_(list(project_ids))
+    )
+
+
+def get_stats(
+    db: Session, project_ids: Sequence[int]
+) -> Dict[int, ProjectTaskStats]:
+    if not project_ids:
+        return {}
+    rows = db.scalars(stats_statement(project_ids))
+    return {row.project_id: row for row in rows}
+
+
+def as_dict(stats: Optional[ProjectTaskStats]) -> dict:
+    """Counts keyed by status value, plus ``overdue`` and ``total``."""
+    counts = {
+        status.value: getattr(stats, column) if stats else 0
+        for status, column in STATUS_COLUMNS.items()
+    }
+    counts["total"] = sum(counts.values())
+    counts["overdue"] = stats.overdue if stats else 0
+    return counts
+
+
+def count_where(condition) -> object:
+    """Number of rows matching ``condition``, 0 rather than NULL when none."""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def recount(db: Session, project_ids: Sequence[int], now: datetime) -> None:
+    """Recompute the counts of ``project_ids`` from the task table."""
+    if not project_ids:
+        return
+    dialect_name = db.get_bind().dialect.name
+    rows = {
+        pid: {"project_id": pid, **dict.fromkeys(COUNT_COLUMNS, 0)}
+        for pid in project_ids
+    }
+    # Lock the counter rows, creating missing ones, before counting: a
+    # concurrent write then waits to add its delta until the recount has
+    # committed, instead of having it overwritten by a count that missed it.
+    db.execute(_upsert(dialect_name, [rows[pid] for pid in sorted(rows)]))
+    db.execute(
+        select(ProjectTaskStats.project_id)
+        .where(ProjectTaskStats.project_id.in_(sorted(rows)))
+        .order_by(ProjectTaskStats.project_id)
+        .with_for_update()
+    ).all()
+    counts = db.execute(
+        select(
+            Task.project_id,
+            count_where(Task.status == TaskStatus.TODO),
+            count_where(Task.status == TaskStatus.IN_PROGRESS),
+            count_where(Task.status == TaskStatus.DONE),
+            count_where(and_(Task.overdue_at.is_not(None), task_is_open)),
+        )
+        .where(Task.project_id.in_(list(project_ids)))
+        .group_by(Task.project_id)
+    )
+    for project_id, *values in counts:
+        rows[project_id].update(zip(COUNT_COLUMNS, values))
+    for row in rows.values():
+        row["reconciled_at"] = now
+    db.execute(
+        _upsert(
+            dialect_name,
+            [rows[pid] for pid in sorted(rows)],
+            lambda excluded: {
+                c: getattr(excluded, c) for c in COUNT_COLUMNS + ("reconciled_at",)
+            },
+        )
+    )
+
+
+def reconcile_batch(
+    db: Session, *, after_id: int, limit: int, now: Optional[datetime] = None
+) -> Optional[int]:
+    """Recount the next ``limit`` projects after ``after_id``.
+
+    Returns the last project id handled, or ``None`` once past the end.
+    """
+    project_ids = list(
+        db.scalars(
+            select(Project.id)
+            .where(Project.id > after_id)
+            .order_by(Project.id)
+            .limit(limit)
+        )
+    )
+    if not project_ids:
+        return None
+    recount(db, project_ids, now or datetime.now(timezone.utc))
+    return project_ids[-1]
+
+
+def _previous_state(task: Task) -> Optional[TaskState]:
+    """The task's state before this flush, or ``None`` if it was not loaded."""
+    attrs = inspect(task).attrs
+    values = []
+    for key in TRACKED:
+        history = attrs[key].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        else:
+            return None
+    return TaskState(*values)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_task_writes(session: Session, flush_context) -> None:
+    # Attribute history still describes the flushed changes here, and new
+    # tasks have their defaults and foreign keys filled in.
+    changes: List[Change] = []
+    stale: Set[int] = set()
+    for task in session.new:
+        if isinstance(task, Task):
+            changes.append((None, TaskState.of(task)))
+    for task in session.dirty:
+        if not isinstance(task, Task):
+            continue
+        attrs = inspect(task).attrs
+        if not any(attrs[key].history.added for key in TRACKED):
+            continue
+        before = _previous_state(task)
+        if before is None:
+            stale.update(attrs.project_id.history.deleted)
+            stale.add(task.project_id)
+        else:
+            changes.append((before, TaskState.of(task)))
+    for task in session.deleted:
+        if not isinstance(task, Task):
+            continue
+        before = _previous_state(task)
+        if before is None:
+            # The row is gone, so only an already loaded id can be used.
+            project_id = inspect(task).dict.get("project_id")
+            if project_id is not None:
+                stale.add(project_id)
+        else:
+            changes.append((before, None))
+    if not changes and not stale:
+        return
+
+    # Rows of projects deleted in this flush go with them.
+    gone = {p.id for p in session.deleted if isinstance(p, Project)}
+    deltas = stats_deltas(changes)
+    stmt = apply_deltas_statement(
+        session.get_bind().dialect.name,
+        {pid: row for pid, row in deltas.items() if pid not in gone | stale},
+    )
+    if stmt is not None:
+        session.execute(stmt)
+    recount(session, sorted(stale - gone), datetime.now(timezone.utc))
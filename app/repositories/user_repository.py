@@ -1,12 +1,14 @@
 from typing import Any, List, Optional
 from sqlalchemy.orm import Session
 
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, apply_fieldset, paginate
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.fieldsets import Fieldset
+from app.schemas.user import USER_FIELDS, UserCreate, UserUpdate
 
 
 class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
+    relations = {"organization": (User.organization,)}
 
     def __init__(self):
         super().__init__(User)
@@ -15,15 +17,20 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         return db.query(User).filter(User.email == email).first()
 
     def get_by_organization(
-        self, db: Session, organization_id: int, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        organization_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None
     ) -> List[User]:
-        return (
-            db.query(User)
-            .filter(User.organization_id == organization_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = db.query(User).filter(User.organization_id == organization_id)
+        query = apply_fieldset(
+            query, User, fieldset or USER_FIELDS.default, self.relations
         )
+        return paginate(query, User.id, skip=skip, limit=limit, cursor=cursor).all()
 
     def create_user(
         self,
@@ -1,12 +1,38 @@
 from datetime import datetime, timezone
-from typing import Any, Generic, Optional, TypeVar
+from functools import lru_cache
+from typing import Any, Generic, List, Optional, Type, TypeVar
 
+import orjson
 from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+from app.core.response_cache import etag_for
+from app.core.responses import ORJSONResponse
 
 T = TypeVar("T")
 
 
+@lru_cache(maxsize=512)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+@lru_cache(maxsize=512)
+def _item_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def encode_data(data: Any, schema: Optional[Type[BaseModel]] = None) -> bytes:
+    """JSON for ``data`` read through ``schema`` from ORM attributes."""
+    if schema is None:
+        return orjson.dumps(jsonable_encoder(data))
+    if isinstance(data, (list, tuple)):
+        adapter = _list_adapter(schema)
+    else:
+        adapter = _item_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
 class ApiResponse(BaseModel, Generic[T]):
     model_config = ConfigDict(from_attributes=True)
 
@@ -18,10 +44,21 @@ class ApiResponse(BaseModel, Generic[T]):
         description="Response timestamp in ISO format",
     )
     status_code: int = Field(..., description="HTTP status code")
+    cursor: Optional[str] = Field(
+        default=None, description="Cursor the current page was requested with"
+    )
+    next_cursor: Optional[str] = Field(
+        default=None, description="Opaque cursor for the next page, if any"
+    )
 
     @classmethod
     def success_response(
-        cls, data: T = None, message: str = "Success", status_code: int = 200
+        cls,
+        data: T = None,
+        message: str = "Success",
+        status_code: int = 200,
+        cursor: Optional[str] = None,
+        next_cursor: Optional[str] = None,
     ) -> "ApiResponse[T]":
         return cls(
             success=True,
@@ -29,6 +66,44 @@ class ApiResponse(BaseModel, Generic[T]):
             data=jsonable_encoder(data),
             status_code=status_code,
             timestamp=datetime.now(timezone.utc).isoformat(),
+            cursor=cursor,
+            next_cursor=next_cursor,
+        )
+
+    @classmethod
+    def json_response(
+        cls,
+        data: Any = None,
+        message: str = "Success",
+        status_code: int = 200,
+        schema: Optional[Type[BaseModel]] = None,
+        cursor: Optional[str] = None,
+        next_cursor: Optional[str] = None,
+    ) -> ORJSONResponse:
+        """Same body as ``success_response`` in a single encoding pass.
+
+        ``data`` is validated against ``schema`` straight from ORM attributes
+        and serialized by pydantic-core; the envelope is built as a dict and
+        rendered by orjson with the data embedded as a pre-encoded fragment.
+        The ETag covers everything but the timestamp, so an unchanged page
+        revalidates with a 304.
+        """
+        encoded = encode_data(data, schema)
+        etag = etag_for(
+            orjson.dumps([message, status_code, cursor, next_cursor]) + encoded
+        )
+        return ORJSONResponse(
+            content={
+                "success": True,
+                "message": message,
+                "data": orjson.Fragment(encoded),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "status_code": status_code,
+                "cursor": cursor,
+                "next_cursor": next_cursor,
+            },
+            status_code=status_code,
+            headers={"ETag": etag, "Cache-Control": "private, no-cache"},
         )
 
     @classmethod
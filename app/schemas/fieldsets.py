@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Type
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    """Columns and relations requested through ``fields=`` and ``expand=``.
+
+    ``fields`` is ``None`` when every column of the resource is wanted.
+    """
+
+    fields: Optional[FrozenSet[str]] = None
+    expand: FrozenSet[str] = frozenset()
+
+
+def _split(value: str) -> FrozenSet[str]:
+    return frozenset(part.strip() for part in value.split(",") if part.strip())
+
+
+class SparseSchema:
+    """A list resource: its column schema and the relations it can expand.
+
+    ``expansions`` maps a relation name to the annotation it is serialized
+    with. Relations in ``default_expand`` are included when the request does
+    not pass ``expand=`` at all; ``expand=`` with an empty value drops them.
+    """
+
+    def __init__(
+        self,
+        base: Type[BaseModel],
+        expansions: Optional[Dict[str, Any]] = None,
+        default_expand: Iterable[str] = (),
+    ):
+        self.base = base
+        self.expansions = expansions or {}
+        self.default = Fieldset(expand=frozenset(default_expand))
+
+    def parse(self, fields: Optional[str], expand: Optional[str]) -> Fieldset:
+        """Raises ``ValueError`` naming the first unknown field or relation."""
+        selected = None
+        if fields is not None:
+            selected = _split(fields)
+            unknown = sorted(selected - set(self.base.model_fields))
+            if unknown:
+                raise ValueError(f"Unknown field: {unknown[0]}")
+        expanded = self.default.expand if expand is None else _split(expand)
+        unknown = sorted(expanded - set(self.expansions))
+        if unknown:
+            raise ValueError(f"Unknown relation: {unknown[0]}")
+        return Fieldset(fields=selected, expand=expanded)
+
+    @lru_cache(maxsize=256)
+    def schema(self, fieldset: Fieldset) -> Type[BaseModel]:
+        fields = self.base.model_fields
+        names = list(fields)
+        if fieldset.fields is not None:
+            names = [n for n in names if n in fieldset.fields or n == "id"]
+        definitions = {name: (fields[name].annotation, fields[name]) for name in names}
+        for name in sorted(fieldset.expand):
+            definitions[name] = (self.expansions[name], None)
+        return create_model(
+            self.base.__name__,
+            __config__=ConfigDict(from_attributes=True),
+            **definitions,
+        )
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -11,5 +14,6 @@ class Notification(BaseModel):
     title: str
     message: str
     is_read: bool
+    created_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
@@ -1,5 +1,10 @@
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 
+from app.models.task import TaskStatus
+
 
 class Organization(BaseModel):
     id: int
@@ -26,3 +31,48 @@ class RegisterRequest(BaseModel):
 class RegisterResponse(BaseModel):
     organization_id: int
     user_id: int
+
+
+class DashboardCounts(BaseModel):
+    todo: int = 0
+    in_progress: int = 0
+    done: int = 0
+    overdue: int = 0
+    total: int = 0
+
+    model_config = {"from_attributes": True}
+
+
+class DashboardProject(DashboardCounts):
+    id: int
+    name: str
+
+
+class DashboardWorkload(BaseModel):
+    """Open tasks of one assignee; ``user_id`` is ``None`` for unassigned."""
+
+    user_id: Optional[int] = None
+    full_name: Optional[str] = None
+    open: int
+    in_progress: int
+    overdue: int
+
+    model_config = {"from_attributes": True}
+
+
+class DashboardActivity(BaseModel):
+    task_id: int
+    title: str
+    project_id: int
+    status: TaskStatus
+    assignee_id: Optional[int] = None
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class Dashboard(BaseModel):
+    totals: DashboardCounts
+    projects: List[DashboardProject]
+    workload: List[DashboardWorkload]
+    recent_activity: List[DashboardActivity]
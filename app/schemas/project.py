@@ -2,6 +2,7 @@ from typing import Optional, List, Dict
 
 from pydantic import BaseModel
 
+from app.schemas.fieldsets import SparseSchema
 from app.schemas.user import User
 
 
@@ -34,6 +35,16 @@ class ProjectInDB(ProjectInDBBase):
     pass
 
 
+class ProjectMember(BaseModel):
+    user_id: int
+    user: Optional[User] = None
+
+    model_config = {"from_attributes": True}
+
+
+PROJECT_FIELDS = SparseSchema(ProjectInDB, {"members": List[ProjectMember]})
+
+
 class AddMemberRequest(BaseModel):
     user_id: int
 
@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 
 from app.models.task import TaskStatus, TaskPriority
+from app.schemas.fieldsets import SparseSchema
+from app.schemas.project import ProjectInDB
 from app.schemas.user import User
 
 
@@ -25,11 +27,76 @@ class TaskUpdate(TaskBase):
     pass
 
 
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate]
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem]
+
+
+TASK_SORT_KEYS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "due_date",
+    "priority",
+    "status",
+    "title",
+)
+
+
+class TaskFilters(BaseModel):
+    """Query parameters accepted by the task list.
+
+    ``status`` and ``priority`` take several values, either repeated
+    (``status=todo&status=done``) or comma separated. ``sort`` names one of
+    ``TASK_SORT_KEYS``, prefixed with ``-`` for descending order; ties are
+    broken by id.
+    """
+
+    project_id: Optional[int] = None
+    assignee_id: Optional[int] = None
+    status: List[TaskStatus] = []
+    priority: List[TaskPriority] = []
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    overdue: Optional[bool] = None
+    q: Optional[str] = Field(default=None, max_length=200)
+    sort: str = "id"
+
+    @field_validator("status", "priority", mode="before")
+    @classmethod
+    def split_values(cls, value):
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list) and all(isinstance(v, str) for v in value):
+            parts = (part.strip() for item in value for part in item.split(","))
+            return [part for part in parts if part]
+        return value
+
+    @field_validator("sort")
+    @classmethod
+    def known_sort(cls, value: str) -> str:
+        if value.removeprefix("-") not in TASK_SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {value.removeprefix('-')}")
+        return value
+
+
 class TaskInDBBase(TaskBase):
     id: int
     project_id: int
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    overdue_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
 
@@ -42,6 +109,13 @@ class TaskInDB(TaskInDBBase):
     pass
 
 
+TASK_FIELDS = SparseSchema(
+    TaskInDBBase,
+    {"assignee": Optional[User], "project": Optional[ProjectInDB]},
+    default_expand=("assignee",),
+)
+
+
 class CommentCreate(BaseModel):
     content: str
 
@@ -60,5 +134,8 @@ class Attachment(BaseModel):
     filename: str
     file_path: str
     task_id: int
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    content_type: Optional[str] = None
 
     model_config = {"from_attributes": True}
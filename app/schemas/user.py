@@ -3,6 +3,8 @@ from typing import Optional
 from pydantic import BaseModel, EmailStr
 
 from app.models.user import UserRole
+from app.schemas.fieldsets import SparseSchema
+from app.schemas.organization import Organization
 
 
 class UserBase(BaseModel):
@@ -23,6 +25,9 @@ class UserUpdate(UserBase):
 
 
 class UserInDBBase(UserBase):
+    # Stored addresses were validated on the way in; re-running email
+    # validation for every row read back is the bulk of list serialization.
+    email: Optional[str] = None
     id: Optional[int] = None
 
     model_config = {"from_attributes": True}
@@ -34,3 +39,6 @@ class User(UserInDBBase):
 
 class UserInDB(UserInDBBase):
     hashed_password: str
+
+
+USER_FIELDS = SparseSchema(User, {"organization": Optional[Organization]})
@@ -1,9 +1,25 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.core.notification_broker import notification_broker
+from app.core.scheduler import PeriodicJob, scheduler
+from app.db.session import SessionLocal
 from app.models.extras import Notification
 from app.repositories.notification_repository import (
+    claim_outbox,
     create_notification as repo_create_notification,
+    enqueue_notifications,
+    move_outbox_to_notifications,
+    purge_before,
 )
+from app.schemas.notification import Notification as NotificationSchema
+
+OUTBOX_PENDING = "notification_outbox_pending"
 
 
 class NotificationService:
@@ -16,29 +32,141 @@ class NotificationService:
         )
         db.commit()
         db.refresh(notification)
+        self.publish(notification)
         return notification
 
-    def notify_assignee(self, db: Session, task, user_id: int) -> None:
-        self.create_notification(
-            db,
-            user_id,
-            title="New Task Assignment",
-            message=f"You have been assigned to task: {task.title}",
+    def publish(self, notification: Notification) -> None:
+        notification_broker.publish(
+            notification.user_id,
+            jsonable_encoder(NotificationSchema.model_validate(notification)),
         )
 
+    def enqueue(self, db: Session, user_id: int, title: str, message: str) -> None:
+        """Queue a notification in the caller's transaction."""
+        self.enqueue_many(
+            db, [{"user_id": user_id, "title": title, "message": message}]
+        )
+
+    def enqueue_many(self, db: Session, rows: List[dict]) -> None:
+        enqueue_notifications(db, rows)
+        if rows:
+            db.info[OUTBOX_PENDING] = True
+
+    def dispatch_pending(self, db: Session, batch_size: int = None) -> int:
+        """Move one batch from the outbox into notifications and push it."""
+        rows = claim_outbox(db, batch_size or settings.NOTIFICATION_DISPATCH_BATCH_SIZE)
+        if not rows:
+            db.rollback()
+            return 0
+        notifications = move_outbox_to_notifications(db, rows)
+        db.commit()
+        for notification in notifications:
+            self.publish(notification)
+        return len(notifications)
+
+    def compact(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Apply the retention TTLs, one committed batch at a time."""
+        now = now or datetime.now(timezone.utc)
+        archive = settings.NOTIFICATION_RETENTION_MODE == "archive"
+        batch_size = settings.NOTIFICATION_RETENTION_BATCH_SIZE
+        removed = 0
+        for ttl_days, read_only in (
+            (settings.NOTIFICATION_READ_TTL_DAYS, True),
+            (settings.NOTIFICATION_UNREAD_TTL_DAYS, False),
+        ):
+            if ttl_days is None:
+                continue
+            before = now - timedelta(days=ttl_days)
+            while True:
+                n = purge_before(
+                    db, before, read_only=read_only, limit=batch_size, archive=archive
+                )
+                db.commit()
+                removed += n
+                if n < batch_size:
+                    break
+        return removed
+
+    def notify_assignee(self, db: Session, task, user_id: int) -> None:
+        self.enqueue_many(db, [self.assignment_message(task, user_id)])
+
     def notify_status_change(self, db: Session, task) -> None:
         if task.assignee_id:
-            self.create_notification(
-                db,
-                task.assignee_id,
-                title="Task Status Updated",
-                message=f"Task '{task.title}' status changed to {task.status.value}",
-            )
+            self.enqueue_many(db, [self.status_change_message(task)])
+
+    @staticmethod
+    def assignment_message(task, user_id: int) -> dict:
+        return {
+            "user_id": user_id,
+            "title": "New Task Assignment",
+            "message": f"You have been assigned to task: {task.title}",
+        }
+
+    @staticmethod
+    def status_change_message(task, status=None) -> dict:
+        status = status or task.status
+        return {
+            "user_id": task.assignee_id,
+            "title": "Task Status Updated",
+            "message": f"Task '{task.title}' status changed to {status.value}",
+        }
+
+    @staticmethod
+    def due_soon_message(task) -> dict:
+        return {
+            "user_id": task.assignee_id,
+            "title": "Task Due Soon",
+            "message": f"Task '{task.title}' is due on {task.due_date:%Y-%m-%d %H:%M}",
+        }
+
+    @staticmethod
+    def overdue_message(task) -> dict:
+        return {
+            "user_id": task.assignee_id,
+            "title": "Task Overdue",
+            "message": f"Task '{task.title}' was due on {task.due_date:%Y-%m-%d %H:%M}",
+        }
 
 
 notification_service = NotificationService()
 
 
+def drain_outbox() -> None:
+    batch_size = settings.NOTIFICATION_DISPATCH_BATCH_SIZE
+    with SessionLocal() as db:
+        while notification_service.dispatch_pending(db, batch_size) == batch_size:
+            pass
+
+
+notification_dispatcher = scheduler.add(
+    PeriodicJob(
+        "notification-dispatcher",
+        settings.NOTIFICATION_DISPATCH_INTERVAL_SECONDS,
+        drain_outbox,
+    )
+)
+
+
+def compact_notifications() -> None:
+    with SessionLocal() as db:
+        notification_service.compact(db)
+
+
+notification_compactor = scheduler.add(
+    PeriodicJob(
+        "notification-compactor",
+        settings.NOTIFICATION_RETENTION_INTERVAL_SECONDS,
+        compact_notifications,
+    )
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session: Session) -> None:
+    if session.info.pop(OUTBOX_PENDING, False):
+        notification_dispatcher.wake()
+
+
 def create_notification(db: Session, user_id: int, title: str, message: str):
     return notification_service.create_notification(db, user_id, title, message)
 
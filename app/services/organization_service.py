@@ -1,11 +1,13 @@
 
 
+from datetime import datetime, timedelta, timezone
+
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.models.organization import Organization
 from app.models.user import User, UserRole
-from app.core.security import get_password_hash
 from app.repositories import organization_repository, user_repository
 from app.schemas.organization import OrganizationCreate
 
@@ -31,7 +33,7 @@ class OrganizationService:
         db: Session,
         organization_name: str,
         email: str,
-        password: str,
+        hashed_password: str,
         full_name: str,
     ) -> dict:
         if organization_repository.name_exists(db, organization_name):
@@ -47,7 +49,7 @@ class OrganizationService:
         new_user = user_repository.create_user(
             db,
             email=email,
-            hashed_password=get_password_hash(password),
+            hashed_password=hashed_password,
             full_name=full_name,
             role=UserRole.ADMIN,
             organization_id=new_org.id,
@@ -62,4 +64,42 @@ class OrganizationService:
             "user_id": new_user.id,
         }
 
+    def get_dashboard(self, db: Session, user: User, organization_id: int) -> dict:
+        """Project counts, workload and recent activity in three queries.
+
+        Admins and managers see every project of the organization, members
+        only the projects they belong to. Project counts come from
+        ``project_task_stats``. Overdue figures count tasks the due-date
+        scanner has flagged, so they trail a passing due date by up to one
+        scan interval.
+        """
+        if organization_id != user.organization_id:
+            raise HTTPException(status_code=404, detail="Organization not found")
+        member_id = None if user.role in [UserRole.ADMIN, UserRole.MANAGER] else user.id
+        now = datetime.now(timezone.utc)
+
+        projects = organization_repository.dashboard_projects(
+            db, organization_id, member_id=member_id
+        )
+        totals = {
+            key: sum(getattr(p, key) for p in projects)
+            for key in ("todo", "in_progress", "done", "overdue", "total")
+        }
+        return {
+            "totals": totals,
+            "projects": projects,
+            "workload": organization_repository.dashboard_workload(
+                db, organization_id, member_id=member_id
+            ),
+            "recent_activity": organization_repository.dashboard_activity(
+                db,
+                organization_id,
+                now - timedelta(days=settings.DASHBOARD_ACTIVITY_DAYS),
+                per_project=settings.DASHBOARD_ACTIVITY_PER_PROJECT,
+                limit=settings.DASHBOARD_ACTIVITY_LIMIT,
+                member_id=member_id,
+            ),
+        }
+
+
 organization_service = OrganizationService()
@@ -1,33 +1,60 @@
 
 
-from typing import Any, List
+from typing import Any, List, Optional
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.core.membership_cache import membership_cache
+from app.core.response_cache import response_cache
+from app.core.scheduler import PeriodicJob, scheduler
+from app.db.session import SessionLocal
 from app.models.project import Project
 from app.models.task import Task
 from app.models.user import User, UserRole
 from app.repositories import (
     project_repository,
     project_member_repository,
+    task_stats_repository,
     user_repository,
 )
+from app.schemas.fieldsets import Fieldset
 from app.schemas.project import ProjectCreate
 
 
 class ProjectService:
 
     def list_projects(
-        self, db: Session, user: User, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        user: User,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
     ) -> List[Project]:
-        if user.role in [UserRole.ADMIN, UserRole.MANAGER]:
-            return project_repository.get_by_organization(
-                db, user.organization_id, skip=skip, limit=limit
-            )
-        else:
-            return project_repository.get_member_projects(
-                db, user.id, skip=skip, limit=limit
-            )
+        try:
+            if user.role in [UserRole.ADMIN, UserRole.MANAGER]:
+                return project_repository.get_by_organization(
+                    db,
+                    user.organization_id,
+                    skip=skip,
+                    limit=limit,
+                    cursor=cursor,
+                    fieldset=fieldset,
+                )
+            else:
+                return project_repository.get_member_projects(
+                    db,
+                    user.id,
+                    skip=skip,
+                    limit=limit,
+                    cursor=cursor,
+                    fieldset=fieldset,
+                )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     def create_project(
         self, db: Session, user: User, project_in: ProjectCreate
@@ -49,6 +76,8 @@ class ProjectService:
 
         project_member_repository.add_member(db, project.id, user.id)
         db.commit()
+        membership_cache.invalidate(user.id, project.id)
+        response_cache.invalidate(user.organization_id, "projects")
         db.refresh(project)
 
         return project
@@ -75,6 +104,8 @@ class ProjectService:
 
         project_member_repository.add_member(db, project_id, user_id)
         db.commit()
+        membership_cache.invalidate(user_id, project_id)
+        response_cache.invalidate(user.organization_id, "projects")
 
         return {"message": "Member added"}
 
@@ -92,4 +123,35 @@ class ProjectService:
 
         return project_repository.get_overdue_tasks(db, project_id)
 
+    def reconcile_task_stats(self, db: Session) -> int:
+        """Recount every project's task stats, one committed batch at a time.
+
+        Corrects any drift from writes that bypassed the ORM and recorded no
+        deltas.
+        """
+        after_id, batches = 0, 0
+        while True:
+            after_id = task_stats_repository.reconcile_batch(
+                db, after_id=after_id, limit=settings.TASK_STATS_RECONCILE_BATCH_SIZE
+            )
+            if after_id is None:
+                return batches
+            db.commit()
+            batches += 1
+
+
 project_service = ProjectService()
+
+
+def reconcile_task_stats() -> None:
+    with SessionLocal() as db:
+        project_service.reconcile_task_stats(db)
+
+
+task_stats_reconciler = scheduler.add(
+    PeriodicJob(
+        "task-stats-reconciler",
+        settings.TASK_STATS_RECONCILE_INTERVAL_SECONDS,
+        reconcile_task_stats,
+    )
+)
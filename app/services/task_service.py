@@ -1,14 +1,39 @@
-import os
-import shutil
-from datetime import datetime, timezone
-from typing import List, Optional
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
-from app.models.task import Task, TaskStatus, TaskPriority
+from app.config import settings
+from app.core.membership_cache import (
+    ALLOWED,
+    FORBIDDEN,
+    MISSING,
+    membership_cache,
+)
+from app.core.response_cache import response_cache
+from app.core.scheduler import PeriodicJob, scheduler
+from app.db.session import SessionLocal
+from app.models.task import Task, TaskStatus, TaskPriority, due_date_changed
 from app.models.user import User, UserRole
+from app.models.extras import Attachment
 from app.repositories import (
+    attachment_repository,
     task_repository,
     project_repository,
     project_member_repository,
@@ -18,24 +43,55 @@ from app.repositories.notification_repository import (
     count_by_task,
     create_attachment,
 )
-from app.schemas.task import TaskCreate, TaskUpdate
-from app.services.notification import create_notification
+from app.repositories.task_stats_repository import TaskState, record_task_changes
+from app.schemas.fieldsets import Fieldset
+from app.schemas.task import (
+    TaskBulkUpdateItem,
+    TaskCreate,
+    TaskFilters,
+    TaskUpdate,
+)
+from app.services.notification_service import notification_service
+from app.utils.storage import FileTooLarge, get_storage, iter_upload
 
 
 class TaskService:
 
     def check_project_membership(self, db: Session, user: User, project_id: int):
-        project = project_repository.get(db, project_id)
-        if not project or project.organization_id != user.organization_id:
-            raise HTTPException(status_code=404, detail="Project not found")
-
+        self._check_allowed(self.project_access(db, user, [project_id]), project_id)
+
+    def project_access(
+        self, db: Session, user: User, project_ids: Iterable[int]
+    ) -> Dict[int, str]:
+        """Access decision for each project, for many projects at once.
+
+        Decisions come from the membership cache where possible; the rest
+        cost one query for the projects and, for members, one for their
+        memberships.
+        """
+        project_ids = set(project_ids)
+        decisions = membership_cache.get_many(db, user.id, project_ids)
+        unknown = project_ids - decisions.keys()
+        if not unknown:
+            return decisions
+
+        projects = [
+            p
+            for p in project_repository.get_many(db, list(unknown))
+            if p.organization_id == user.organization_id
+        ]
+        computed = dict.fromkeys(unknown, MISSING)
         if user.role in [UserRole.ADMIN, UserRole.MANAGER]:
-            return project
-
-        if not project_member_repository.is_member(db, project_id, user.id):
-            raise HTTPException(status_code=403, detail="Not a member of this project")
-
-        return project
+            computed.update(dict.fromkeys((p.id for p in projects), ALLOWED))
+        else:
+            member_of = project_member_repository.member_project_ids(
+                db, user.id, [p.id for p in projects]
+            )
+            for p in projects:
+                computed[p.id] = ALLOWED if p.id in member_of else FORBIDDEN
+        membership_cache.set_many(db, user.id, computed)
+        decisions.update(computed)
+        return decisions
 
     def list_tasks(
         self,
@@ -44,24 +100,25 @@ class TaskService:
         *,
         skip: int = 0,
         limit: int = 100,
-        project_id: Optional[int] = None,
-        status: Optional[TaskStatus] = None,
-        priority: Optional[TaskPriority] = None,
-        assignee_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        filters: Optional[TaskFilters] = None,
+        fieldset: Optional[Fieldset] = None,
     ) -> List[Task]:
-        if project_id:
-            self.check_project_membership(db, user, project_id)
+        if filters and filters.project_id:
+            self.check_project_membership(db, user, filters.project_id)
 
-        return task_repository.get_by_organization(
-            db,
-            user.organization_id,
-            skip=skip,
-            limit=limit,
-            project_id=project_id,
-            status=status,
-            priority=priority,
-            assignee_id=assignee_id,
-        )
+        try:
+            return task_repository.get_by_organization(
+                db,
+                user.organization_id,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+                filters=filters,
+                fieldset=fieldset,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     def create_task(self, db: Session, user: User, task_in: TaskCreate) -> Task:
         self.check_project_membership(db, user, task_in.project_id)
@@ -89,14 +146,12 @@ class TaskService:
             project_id=task_in.project_id,
             assignee_id=task_in.assignee_id or user.id,
         )
+        if task.assignee_id != user.id:
+            notification_service.notify_assignee(db, task, task.assignee_id)
         db.commit()
+        response_cache.invalidate(user.organization_id, "tasks")
         db.refresh(task)
 
-        if task.assignee_id and task.assignee_id != user.id:
-            from app.services.notification_service import notification_service
-
-            notification_service.notify_assignee(db, task, task.assignee_id)
-
         return task
 
     def update_task(
@@ -120,15 +175,261 @@ class TaskService:
             setattr(task, field, value)
 
         db.add(task)
+        if task.status != old_status:
+            notification_service.notify_status_change(db, task)
         db.commit()
+        response_cache.invalidate(user.organization_id, "tasks")
         db.refresh(task)
 
-        if task.status != old_status:
-            from app.services.notification_service import notification_service
+        return task
 
-            notification_service.notify_status_change(db, task)
+    def create_tasks(
+        self, db: Session, user: User, tasks_in: List[TaskCreate]
+    ) -> List[Task]:
+        """Create all of ``tasks_in`` in one transaction, or none of them.
+
+        Projects and assignees are checked with one query each rather than
+        per task, the rows go in with a single INSERT ... RETURNING and the
+        assignment notifications with one outbox write.
+        """
+        self._check_bulk_size(tasks_in)
+        access, assignees = self._creation_context(db, user, tasks_in)
+        rows = []
+        for index, task_in in enumerate(tasks_in):
+            with self._bulk_item(index):
+                rows.append(self._task_row(user, task_in, access, assignees))
+
+        tasks = self._insert_tasks(db, user, rows)
+        db.commit()
+        response_cache.invalidate(user.organization_id, "tasks")
+        return task_repository.get_many(db, [task.id for task in tasks])
 
-        return task
+    def update_tasks(
+        self, db: Session, user: User, tasks_in: List[TaskBulkUpdateItem]
+    ) -> List[Task]:
+        """Apply partial updates to many tasks in one transaction.
+
+        Same rules as ``update_task``; the tasks are loaded with one query and
+        written back with one executemany UPDATE per set of changed columns.
+        """
+        self._check_bulk_size(tasks_in)
+        ids = [t.id for t in tasks_in]
+        if len(set(ids)) != len(ids):
+            raise HTTPException(status_code=400, detail="Duplicate task ids")
+        tasks = {task.id: task for task in task_repository.get_many(db, ids)}
+        access = self.project_access(
+            db, user, {task.project_id for task in tasks.values()}
+        )
+
+        rows, notifications, changes = [], [], []
+        for index, task_in in enumerate(tasks_in):
+            task = tasks.get(task_in.id)
+            # Only fields the client sent; TaskUpdate defaults status to TODO.
+            values = task_in.model_dump(exclude_unset=True)
+            status = values.get("status")
+            with self._bulk_item(index):
+                if not task:
+                    raise HTTPException(status_code=404, detail="Task not found")
+                self._check_allowed(access, task.project_id)
+                if status and status != task.status:
+                    self._validate_status_transition(task.status, status)
+                if values.get("due_date"):
+                    self._validate_due_date(values["due_date"])
+            if len(values) > 1:
+                rows.append(values)
+                before = TaskState.of(task)
+                after = before._replace(status=values.get("status", task.status))
+                # A new due date clears the overdue flag, see update_many.
+                if "due_date" in values and due_date_changed(
+                    task.due_date, values["due_date"]
+                ):
+                    after = after._replace(overdue_at=None)
+                changes.append((before, after))
+            if status and status != task.status and task.assignee_id:
+                notifications.append(
+                    notification_service.status_change_message(task, status)
+                )
+
+        task_repository.update_many(db, rows)
+        record_task_changes(db, changes)
+        notification_service.enqueue_many(db, notifications)
+        db.commit()
+        response_cache.invalidate(user.organization_id, "tasks")
+        return task_repository.get_many(db, ids)
+
+    def export_tasks(
+        self, db: Session, user: User, *, project_id: Optional[int] = None
+    ) -> Iterator[Row]:
+        """Rows of the organization's tasks, optionally one project's.
+
+        Access is checked here, before the caller starts streaming; the rows
+        themselves are fetched lazily in batches.
+        """
+        if project_id:
+            self.check_project_membership(db, user, project_id)
+        return task_repository.stream_by_organization(
+            db,
+            user.organization_id,
+            project_id=project_id,
+            batch_size=settings.TASK_EXPORT_BATCH_SIZE,
+        )
+
+    def import_tasks(
+        self,
+        db: Session,
+        user: User,
+        records: Iterable[Any],
+        *,
+        project_id: Optional[int] = None,
+    ) -> dict:
+        """Create tasks from parsed records, one committed batch at a time.
+
+        Each record goes through the same rules as ``create_tasks``. Unlike
+        the bulk endpoint an invalid row does not fail the import: it is
+        skipped and reported with its 1-based row number. Memory is bounded
+        by TASK_IMPORT_BATCH_SIZE and the number of errors kept.
+        """
+        if project_id:
+            self.check_project_membership(db, user, project_id)
+        report = {"imported": 0, "failed": 0, "errors": []}
+
+        def fail(row: int, error: str) -> None:
+            report["failed"] += 1
+            if len(report["errors"]) < settings.TASK_IMPORT_MAX_ERRORS:
+                report["errors"].append({"row": row, "error": error})
+
+        batch = []
+        for row, record in enumerate(records, start=1):
+            if isinstance(record, Exception):
+                fail(row, str(record))
+                continue
+            try:
+                task_in = TaskCreate.model_validate(record)
+            except ValidationError as e:
+                first = e.errors()[0]
+                location = ".".join(str(part) for part in first["loc"])
+                fail(row, f"{location}: {first['msg']}")
+                continue
+            if project_id and task_in.project_id != project_id:
+                fail(row, "Project outside the import scope")
+                continue
+            batch.append((row, task_in))
+            if len(batch) >= settings.TASK_IMPORT_BATCH_SIZE:
+                report["imported"] += self._import_batch(db, user, batch, fail)
+                batch = []
+        if batch:
+            report["imported"] += self._import_batch(db, user, batch, fail)
+
+        if report["imported"]:
+            response_cache.invalidate(user.organization_id, "tasks")
+        return report
+
+    def _import_batch(
+        self,
+        db: Session,
+        user: User,
+        batch: List[Tuple[int, TaskCreate]],
+        fail: Callable[[int, str], None],
+    ) -> int:
+        access, assignees = self._creation_context(
+            db, user, [task_in for _, task_in in batch]
+        )
+        rows = []
+        for row, task_in in batch:
+            try:
+                rows.append(self._task_row(user, task_in, access, assignees))
+            except HTTPException as e:
+                fail(row, e.detail)
+        tasks = self._insert_tasks(db, user, rows)
+        db.commit()
+        return len(tasks)
+
+    def _creation_context(
+        self, db: Session, user: User, tasks_in: List[TaskCreate]
+    ) -> Tuple[Dict[int, str], Set[int]]:
+        """Project access and valid assignees for a batch of new tasks."""
+        access = self.project_access(db, user, {t.project_id for t in tasks_in})
+        assignees = self._org_user_ids(
+            db,
+            user,
+            {t.assignee_id for t in tasks_in if t.assignee_id not in (None, user.id)},
+        )
+        return access, assignees
+
+    def _task_row(
+        self,
+        user: User,
+        task_in: TaskCreate,
+        access: Dict[int, str],
+        assignees: Set[int],
+    ) -> dict:
+        """``create_task``'s checks against preloaded context, as an insert row."""
+        self._check_allowed(access, task_in.project_id)
+        if task_in.assignee_id and task_in.assignee_id != user.id:
+            if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
+                raise HTTPException(
+                    status_code=403,
+                    detail="Members can only assign tasks to themselves",
+                )
+            if task_in.assignee_id not in assignees:
+                raise HTTPException(status_code=400, detail="Invalid assignee")
+        if task_in.due_date:
+            self._validate_due_date(task_in.due_date)
+        return {
+            "title": task_in.title,
+            "description": task_in.description,
+            "status": task_in.status or TaskStatus.TODO,
+            "priority": task_in.priority or TaskPriority.MEDIUM,
+            "due_date": task_in.due_date,
+            "project_id": task_in.project_id,
+            "assignee_id": task_in.assignee_id or user.id,
+        }
+
+    def _insert_tasks(self, db: Session, user: User, rows: List[dict]) -> List[Task]:
+        tasks = task_repository.create_many(db, rows)
+        record_task_changes(db, [(None, TaskState.of(task)) for task in tasks])
+        notification_service.enqueue_many(
+            db,
+            [
+                notification_service.assignment_message(task, task.assignee_id)
+                for task in tasks
+                if task.assignee_id != user.id
+            ],
+        )
+        return tasks
+
+    def _check_bulk_size(self, items: Sequence) -> None:
+        if not items:
+            raise HTTPException(status_code=400, detail="No tasks given")
+        if len(items) > settings.TASK_BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.TASK_BULK_MAX_ITEMS} tasks per request",
+            )
+
+    @contextmanager
+    def _bulk_item(self, index: int):
+        try:
+            yield
+        except HTTPException as e:
+            raise HTTPException(
+                status_code=e.status_code, detail=f"tasks[{index}]: {e.detail}"
+            )
+
+    def _check_allowed(self, access: Dict[int, str], project_id: int) -> None:
+        if access.get(project_id, MISSING) == MISSING:
+            raise HTTPException(status_code=404, detail="Project not found")
+        if access[project_id] != ALLOWED:
+            raise HTTPException(status_code=403, detail="Not a member of this project")
+
+    def _org_user_ids(self, db: Session, user: User, user_ids: Set[int]) -> Set[int]:
+        from app.repositories import user_repository
+
+        return {
+            u.id
+            for u in user_repository.get_many(db, list(user_ids))
+            if u.organization_id == user.organization_id
+        }
 
     def add_comment(self, db: Session, user: User, task_id: int, content: str) -> dict:
         task = task_repository.get(db, task_id)
@@ -138,53 +439,76 @@ class TaskService:
         self.check_project_membership(db, user, task.project_id)
 
         create_comment(db, content=content, task_id=task_id, user_id=user.id)
-        db.commit()
-
         if task.assignee_id and task.assignee_id != user.id:
-            from app.services.notification_service import notification_service
-
-            create_notification(
+            notification_service.enqueue(
                 db,
                 task.assignee_id,
                 "New Comment",
                 f"{user.full_name} commented on {task.title}",
             )
+        db.commit()
 
         return {"message": "Comment added"}
 
-    def add_attachment(
+    async def add_attachment(
         self, db: Session, user: User, task_id: int, file: UploadFile
     ) -> dict:
+        await run_in_threadpool(self._check_can_attach, db, user, task_id)
+
+        try:
+            stored = await get_storage().save(
+                iter_upload(file, settings.STORAGE_CHUNK_SIZE),
+                max_size=settings.ATTACHMENT_MAX_SIZE_BYTES,
+            )
+        except FileTooLarge:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    "File size exceeds "
+                    f"{settings.ATTACHMENT_MAX_SIZE_BYTES // (1024 * 1024)}MB limit"
+                ),
+            )
+
+        def record():
+            create_attachment(
+                db,
+                filename=file.filename,
+                file_path=stored.key,
+                task_id=task_id,
+                size=stored.size,
+                sha256=stored.sha256,
+                content_type=file.content_type,
+            )
+            db.commit()
+
+        await run_in_threadpool(record)
+        return {"message": "Attachment uploaded", "filename": file.filename}
+
+    def get_attachment(
+        self, db: Session, user: User, task_id: int, attachment_id: int
+    ) -> Attachment:
         task = task_repository.get(db, task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
 
         self.check_project_membership(db, user, task.project_id)
 
-        existing_count = count_by_task(db, task_id)
-        if existing_count >= 3:
-            raise HTTPException(
-                status_code=400, detail="Maximum 3 attachments per task allowed"
-            )
-
-        MAX_SIZE_BYTES = 5 * 1024 * 1024
-        file.file.seek(0, 2)
-        file_size = file.file.tell()
-        file.file.seek(0)
-        if file_size > MAX_SIZE_BYTES:
-            raise HTTPException(status_code=400, detail="File size exceeds 5MB limit")
+        attachment = attachment_repository.get(db, attachment_id)
+        if not attachment or attachment.task_id != task_id:
+            raise HTTPException(status_code=404, detail="Attachment not found")
+        return attachment
 
-        os.makedirs("storage", exist_ok=True)
-        file_path = f"storage/{file.filename}"
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+    def _check_can_attach(self, db: Session, user: User, task_id: int) -> None:
+        task = task_repository.get(db, task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
 
-        create_attachment(
-            db, filename=file.filename, file_path=file_path, task_id=task_id
-        )
-        db.commit()
+        self.check_project_membership(db, user, task.project_id)
 
-        return {"message": "Attachment uploaded", "filename": file.filename}
+        if count_by_task(db, task_id) >= 3:
+            raise HTTPException(
+                status_code=400, detail="Maximum 3 attachments per task allowed"
+            )
 
     def _validate_due_date(self, due_date: datetime) -> None:
         now = datetime.now(timezone.utc)
@@ -204,5 +528,81 @@ class TaskService:
                 status_code=400, detail="Cannot move task status backward"
             )
 
+    def scan_due_dates(self, db: Session, now: Optional[datetime] = None) -> dict:
+        """Send due-soon and overdue notifications for tasks that need one.
+
+        Each batch locks its tasks, sets their flag and queues the assignees'
+        notifications in one transaction, so a task is notified once however
+        many workers scan. Tasks get ``overdue_at`` even when unassigned.
+        """
+        now = now or datetime.now(timezone.utc)
+        until = now + timedelta(hours=settings.TASK_DUE_SOON_HOURS)
+        size = settings.TASK_DUE_SCAN_BATCH_SIZE
+        return {
+            "due_soon": self._notify_due(
+                db,
+                lambda: task_repository.claim_due_soon(db, now, until, size),
+                {"due_soon_notified_at": now},
+                notification_service.due_soon_message,
+            ),
+            "overdue": self._notify_due(
+                db,
+                lambda: task_repository.claim_overdue(db, now, size),
+                {"overdue_at": now},
+                notification_service.overdue_message,
+            ),
+        }
+
+    def _notify_due(
+        self,
+        db: Session,
+        claim: Callable[[], List[Row]],
+        flag: Dict[str, datetime],
+        message: Callable[[Row], dict],
+    ) -> int:
+        notified = 0
+        while True:
+            tasks = claim()
+            if not tasks:
+                db.rollback()
+                return notified
+            task_repository.flag(db, [t.id for t in tasks], **flag)
+            if "overdue_at" in flag:
+                # A bulk UPDATE; the flush listener does not see it.
+                record_task_changes(
+                    db,
+                    [
+                        (
+                            TaskState(t.project_id, t.status, None),
+                            TaskState(t.project_id, t.status, flag["overdue_at"]),
+                        )
+                        for t in tasks
+                    ],
+                )
+            notification_service.enqueue_many(
+                db, [message(t) for t in tasks if t.assignee_id]
+            )
+            db.commit()
+            # Overdue lists read the flag and are response-cached.
+            for organization_id in {t.organization_id for t in tasks}:
+                response_cache.invalidate(organization_id, "tasks")
+            notified += len(tasks)
+            if len(tasks) < settings.TASK_DUE_SCAN_BATCH_SIZE:
+                return notified
+
 
 task_service = TaskService()
+
+
+def scan_due_dates() -> None:
+    with SessionLocal() as db:
+        task_service.scan_due_dates(db)
+
+
+due_date_scanner = scheduler.add(
+    PeriodicJob(
+        "task-due-date-scanner",
+        settings.TASK_DUE_SCAN_INTERVAL_SECONDS,
+        scan_due_dates,
+    )
+)
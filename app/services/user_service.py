@@ -1,25 +1,49 @@
 
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from app.models.user import User
-from app.core.security import get_password_hash
+from app.core.membership_cache import membership_cache
+from app.core.principal_cache import principal_cache
+from app.core.response_cache import response_cache
 from app.repositories import user_repository
-from app.schemas.user import UserCreate
+from app.schemas.fieldsets import Fieldset
+from app.schemas.user import UserCreate, UserUpdate
 
 
 class UserService:
 
     def list_users(
-        self, db: Session, current_user: User, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        current_user: User,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
     ) -> List[User]:
-        return user_repository.get_by_organization(
-            db, current_user.organization_id, skip=skip, limit=limit
-        )
+        try:
+            return user_repository.get_by_organization(
+                db,
+                current_user.organization_id,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+                fieldset=fieldset,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-    def create_user(self, db: Session, current_user: User, user_in: UserCreate) -> User:
+    def create_user(
+        self,
+        db: Session,
+        current_user: User,
+        user_in: UserCreate,
+        hashed_password: str,
+    ) -> User:
         if user_in.organization_id != current_user.organization_id:
             raise HTTPException(
                 status_code=400, detail="Cannot create user for another organization"
@@ -34,14 +58,49 @@ class UserService:
         obj_in_data = jsonable_encoder(user_in)
         del obj_in_data["password"]
 
-        user = User(**obj_in_data, hashed_password=get_password_hash(user_in.password))
+        user = User(**obj_in_data, hashed_password=hashed_password)
         db.add(user)
         db.commit()
         db.refresh(user)
 
         return user
 
-    def get_current_user(self, user: User) -> User:
+    def update_user(
+        self,
+        db: Session,
+        current_user: User,
+        user_id: int,
+        user_in: UserUpdate,
+        hashed_password: Optional[str] = None,
+    ) -> User:
+        user = user_repository.get(db, user_id)
+        if not user or user.organization_id != current_user.organization_id:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        update_data = user_in.model_dump(exclude_unset=True)
+        update_data.pop("organization_id", None)
+        if update_data.get("email") and update_data["email"] != user.email:
+            if user_repository.email_exists(db, update_data["email"]):
+                raise HTTPException(
+                    status_code=400,
+                    detail="The user with this username already exists in the system",
+                )
+        if update_data.pop("password", None):
+            update_data["hashed_password"] = hashed_password
+
+        user = user_repository.update(db, db_obj=user, obj_in=update_data)
+        db.commit()
+        db.refresh(user)
+        principal_cache.invalidate(user.id)
+        membership_cache.invalidate(user.id)
+        response_cache.invalidate(user.organization_id, "users")
+
+        return user
+
+    def get_current_user(self, db: Session, current_user: User) -> User:
+        user = user_repository.get(db, current_user.id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
         return user
 
 
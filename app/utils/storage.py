@@ -0,0 +1,206 @@
+import hashlib
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, Optional, Tuple
+
+import anyio
+from fastapi import UploadFile
+
+from app.config import settings
+
+
+class FileTooLarge(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    key: str
+    sha256: str
+    size: int
+    deduplicated: bool
+
+
+async def iter_upload(file: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def content_key(sha256: str) -> str:
+    """``sha256/ab/cd/abcd…``: two directory levels keep any one directory
+    small even with millions of objects."""
+    return f"sha256/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+async def spool(
+    chunks: AsyncIterator[bytes], out: BinaryIO, max_size: Optional[int]
+) -> tuple:
+    """Copy ``chunks`` into ``out`` off the event loop, hashing as it goes."""
+    digest = hashlib.sha256()
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise FileTooLarge()
+        digest.update(chunk)
+        await anyio.to_thread.run_sync(out.write, chunk)
+    return digest.hexdigest(), size
+
+
+class LocalStorage:
+    """Content-addressed files under ``root``; identical uploads share one file."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    async def save(
+        self, chunks: AsyncIterator[bytes], max_size: Optional[int] = None
+    ) -> StoredObject:
+        """Spool to a temporary file, then move it under its content key.
+
+        Every filesystem call runs in a worker thread; cleanup after a
+        failure or cancellation is shielded so the temporary file is removed.
+        """
+        tmp_path, out = await anyio.to_thread.run_sync(self._open_tmp)
+        try:
+            try:
+                sha256, size = await spool(chunks, out, max_size)
+            finally:
+                with anyio.CancelScope(shield=True):
+                    await anyio.to_thread.run_sync(out.close)
+            key = content_key(sha256)
+            deduplicated = await anyio.to_thread.run_sync(
+                self._commit, tmp_path, key
+            )
+            return StoredObject(key, sha256, size, deduplicated=deduplicated)
+        except BaseException:
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(self._discard, tmp_path)
+            raise
+
+    def _open_tmp(self) -> Tuple[str, BinaryIO]:
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+        return tmp_path, open(tmp_path, "wb")
+
+    def _commit(self, tmp_path: str, key: str) -> bool:
+        """Move ``tmp_path`` to ``key``; True when the content already existed."""
+        final_path = self.path(key)
+        if os.path.exists(final_path):
+            os.remove(tmp_path)
+            return True
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(tmp_path, final_path)
+        return False
+
+    @staticmethod
+    def _discard(tmp_path: str) -> None:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def local_path(self, key: str) -> str:
+        # Rows written before content addressing hold a path relative to
+        # the working directory rather than a key.
+        if not key.startswith("sha256/"):
+            return key
+        return self.path(key)
+
+
+class S3Storage:
+    """Content-addressed objects in an S3-compatible bucket.
+
+    Uploads are spooled to a temporary file while hashing, since the key is
+    only known once the last byte has been read; an object that already
+    exists is not uploaded again. ``client`` is a boto3 S3 client or anything
+    with the same ``head_object``/``upload_fileobj`` methods.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", client=None):
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client(
+                "s3", endpoint_url=settings.S3_ENDPOINT_URL or None
+            )
+        return self._client
+
+    def object_name(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_name(key))
+        except Exception as e:
+            status = getattr(e, "response", {}).get("Error", {}).get("Code")
+            if status in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def download_url(
+        self, key: str, filename: str, content_type: Optional[str] = None
+    ) -> str:
+        params = {
+            "Bucket": self.bucket,
+            "Key": self.object_name(key),
+            "ResponseContentDisposition": f'attachment; filename="{filename}"',
+        }
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=settings.S3_URL_EXPIRES_SECONDS
+        )
+
+    async def save(
+        self, chunks: AsyncIterator[bytes], max_size: Optional[int] = None
+    ) -> StoredObject:
+        with tempfile.SpooledTemporaryFile(
+            max_size=settings.STORAGE_CHUNK_SIZE * 4
+        ) as out:
+            sha256, size = await spool(chunks, out, max_size)
+            key = content_key(sha256)
+            if await anyio.to_thread.run_sync(self.exists, key):
+                return StoredObject(key, sha256, size, deduplicated=True)
+            out.seek(0)
+            await anyio.to_thread.run_sync(
+                lambda: self.client.upload_fileobj(
+                    out, self.bucket, self.object_name(key)
+                )
+            )
+        return StoredObject(key, sha256, size, deduplicated=False)
+
+
+_storage = None
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        if settings.STORAGE_BACKEND == "s3":
+            _storage = S3Storage(settings.S3_BUCKET, prefix=settings.S3_PREFIX)
+        else:
+            _storage = LocalStorage(settings.STORAGE_LOCAL_ROOT)
+    return _storage
+
+
+def set_storage(storage) -> None:
+    global _storage
+    _storage = storage
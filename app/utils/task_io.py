@@ -0,0 +1,151 @@
+import csv
+import enum
+import io
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+import orjson
+
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "project_id",
+    "assignee_id",
+    "created_at",
+    "updated_at",
+)
+
+# Rows are gathered into chunks of about this size before being handed to
+# the server, instead of one tiny write per task.
+CHUNK_SIZE = 64 * 1024
+
+# Spreadsheets evaluate cells starting with these as formulas, so CSV cells
+# that do get a leading "'" on export, removed again on import.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _needs_escape(value: str) -> bool:
+    # A value that already starts with the escape character is escaped again
+    # when the rest would be, so import strips exactly what export added.
+    if value.startswith(FORMULA_PREFIXES):
+        return True
+    return value.startswith("'") and _needs_escape(value[1:])
+
+
+def _csv_cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    value = _plain(value)
+    if isinstance(value, str) and _needs_escape(value):
+        return "'" + value
+    return value
+
+
+def _csv_value(value: str) -> str:
+    if value.startswith("'") and _needs_escape(value[1:]):
+        return value[1:]
+    return value
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[bytes]:
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def ndjson_chunks(rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """One JSON object per line, in ``EXPORT_FIELDS`` order."""
+
+    def lines():
+        for row in rows:
+            record = dict(zip(EXPORT_FIELDS, map(_plain, row)))
+            yield orjson.dumps(record).decode() + "\n"
+
+    return _chunked(lines())
+
+
+def csv_chunks(rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """CSV with a header row; empty cells stand for nulls.
+
+    Text that a spreadsheet would run as a formula is prefixed with "'".
+    """
+
+    def lines():
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow([_csv_cell(v) for v in row])
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+        yield out.getvalue()
+
+    return _chunked(lines())
+
+
+def iter_records(
+    file: BinaryIO, fmt: str, default_project_id: Optional[int] = None
+) -> Iterator[Union[Dict[str, Any], ImportFormatError]]:
+    """Parse an uploaded CSV or NDJSON file one record at a time.
+
+    The file is read incrementally, so memory does not grow with its size.
+    Records that cannot be parsed at all are yielded as ``ImportFormatError``
+    instances so the caller can report them against their row number.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        records = _csv_records(text)
+    else:
+        records = _ndjson_records(text)
+    for record in records:
+        if isinstance(record, dict) and default_project_id is not None:
+            record.setdefault("project_id", default_project_id)
+        yield record
+
+
+def _csv_records(text: io.TextIOBase) -> Iterator[Any]:
+    for record in csv.DictReader(text):
+        if None in record:
+            yield ImportFormatError("Too many columns")
+            continue
+        yield {
+            k: _csv_value(v) for k, v in record.items() if v not in ("", None)
+        }
+
+
+def _ndjson_records(text: io.TextIOBase) -> Iterator[Any]:
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield ImportFormatError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield ImportFormatError("Expected a JSON object")
+            continue
+        yield {k: v for k, v in record.items() if v is not None}
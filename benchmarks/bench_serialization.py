@@ -0,0 +1,81 @@
+"""
+Serialization benchmark for large list responses.
+
+    python -m benchmarks.bench_serialization
+
+Loads N tasks (with assignees) from an in-memory SQLite database and times
+rendering the response body through the old path (jsonable_encoder in
+success_response, then FastAPI encoding the ApiResponse model) and through
+ApiResponse.json_response.
+"""
+
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.api_response import ApiResponse
+from app.schemas.task import Task as TaskSchema
+
+ROWS = (100, 1000)
+ROUNDS = 20
+
+
+def load_tasks(n):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    org = Organization(name="bench")
+    db.add(org)
+    db.flush()
+    user = User(
+        email="bench@example.com",
+        hashed_password="x",
+        full_name="Bench User",
+        organization_id=org.id,
+    )
+    project = Project(name="bench", organization_id=org.id)
+    db.add_all([user, project])
+    db.flush()
+    db.add_all(
+        Task(
+            title=f"Task {i}",
+            description="x" * 80,
+            project_id=project.id,
+            assignee_id=user.id,
+        )
+        for i in range(n)
+    )
+    db.commit()
+    return db.query(Task).options(selectinload(Task.assignee)).all()
+
+
+def main():
+    for n in ROWS:
+        tasks = load_tasks(n)
+
+        def old_path():
+            response = ApiResponse.success_response(data=tasks, message="ok")
+            JSONResponse(content=jsonable_encoder(response))
+
+        def new_path():
+            ApiResponse.json_response(data=tasks, schema=TaskSchema, message="ok")
+
+        for name, fn in (("jsonable_encoder", old_path), ("json_response", new_path)):
+            seconds = min(timeit.repeat(fn, number=ROUNDS, repeat=3)) / ROUNDS
+            print(
+                f"{n:>5} rows  {name:<17} {seconds * 1000:8.2f} ms/response"
+                f"  {n / seconds:12.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""notification_retention
+
+Revision ID: 7a2d5e9c1b3f
+Revises: d41b7f0e2c86
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "7a2d5e9c1b3f"
+down_revision = "d41b7f0e2c86"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_notification_user_id_id", "notification", ["user_id", "id"]),
+    ("ix_notification_is_read_created_at", "notification", ["is_read", "created_at"]),
+]
+
+
+def upgrade():
+    op.create_table(
+        "notification_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("is_read", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_notification_archive_user_id",
+        "notification_archive",
+        ["user_id"],
+        unique=False,
+    )
+
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=concurrently
+            )
+
+
+def downgrade():
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
+
+    op.drop_index("ix_notification_archive_user_id", table_name="notification_archive")
+    op.drop_table("notification_archive")
@@ -0,0 +1,68 @@
+"""add_query_indexes
+
+Revision ID: 8f3a61c2d9e4
+Revises: 50f09d0ca8bd
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "8f3a61c2d9e4"
+down_revision = "50f09d0ca8bd"
+branch_labels = None
+depends_on = None
+
+
+OPEN_TASKS = sa.text("status <> 'DONE'")
+
+INDEXES = [
+    ("ix_task_project_id_status", "task", ["project_id", "status"], {}),
+    ("ix_task_assignee_id", "task", ["assignee_id"], {}),
+    (
+        "ix_task_due_date_open",
+        "task",
+        ["due_date"],
+        {"postgresql_where": OPEN_TASKS, "sqlite_where": OPEN_TASKS},
+    ),
+    (
+        "ix_notification_user_id_is_read_id",
+        "notification",
+        ["user_id", "is_read", "id"],
+        {},
+    ),
+    (
+        "ix_notification_user_id_created_at",
+        "notification",
+        ["user_id", "created_at"],
+        {},
+    ),
+    ("ix_comment_task_id", "comment", ["task_id"], {}),
+    ("ix_attachment_task_id", "attachment", ["task_id"], {}),
+    ("ix_project_member_user_id", "project_member", ["user_id"], {}),
+]
+
+
+def upgrade():
+    # Build the indexes without blocking writes on Postgres; CONCURRENTLY
+    # cannot run inside the migration transaction.
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=concurrently,
+                **kwargs,
+            )
+
+
+def downgrade():
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
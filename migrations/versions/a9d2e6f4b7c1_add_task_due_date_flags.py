@@ -0,0 +1,58 @@
+"""add_task_due_date_flags
+
+Revision ID: a9d2e6f4b7c1
+Revises: f6a1d3b8c2e5
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a9d2e6f4b7c1"
+down_revision = "f6a1d3b8c2e5"
+branch_labels = None
+depends_on = None
+
+
+UNFLAGGED = "status <> 'DONE' AND overdue_at IS NULL"
+
+
+def upgrade():
+    op.add_column(
+        "task",
+        sa.Column("due_soon_notified_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "task", sa.Column("overdue_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    # Tasks already overdue are flagged without notifying anyone about them.
+    op.execute(
+        "UPDATE task SET overdue_at = CURRENT_TIMESTAMP "
+        "WHERE status <> 'DONE' AND due_date < CURRENT_TIMESTAMP"
+    )
+
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_task_due_date_unflagged",
+            "task",
+            ["due_date"],
+            unique=False,
+            postgresql_where=sa.text(UNFLAGGED),
+            sqlite_where=sa.text(UNFLAGGED),
+            postgresql_concurrently=concurrently,
+        )
+
+
+def downgrade():
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_task_due_date_unflagged",
+            table_name="task",
+            postgresql_concurrently=concurrently,
+        )
+    op.drop_column("task", "overdue_at")
+    op.drop_column("task", "due_soon_notified_at")
@@ -0,0 +1,32 @@
+"""add_attachment_content_metadata
+
+Revision ID: b5e8c3a1f7d4
+Revises: 7a2d5e9c1b3f
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b5e8c3a1f7d4"
+down_revision = "7a2d5e9c1b3f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("attachment", sa.Column("size", sa.Integer(), nullable=True))
+    op.add_column("attachment", sa.Column("sha256", sa.String(64), nullable=True))
+    op.add_column("attachment", sa.Column("content_type", sa.String(), nullable=True))
+    op.create_index(
+        op.f("ix_attachment_sha256"), "attachment", ["sha256"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_attachment_sha256"), table_name="attachment")
+    op.drop_column("attachment", "content_type")
+    op.drop_column("attachment", "sha256")
+    op.drop_column("attachment", "size")
@@ -0,0 +1,56 @@
+"""count_overdue_from_flag
+
+Revision ID: c7e1f4a2b9d3
+Revises: a9d2e6f4b7c1
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c7e1f4a2b9d3"
+down_revision = "a9d2e6f4b7c1"
+branch_labels = None
+depends_on = None
+
+
+OPEN_TASKS = "status <> 'DONE'"
+
+
+def _recount_overdue(condition):
+    op.execute(
+        "UPDATE project_task_stats SET overdue = ("
+        "SELECT COUNT(*) FROM task "
+        "WHERE task.project_id = project_task_stats.project_id "
+        f"AND task.{OPEN_TASKS} AND {condition})"
+    )
+
+
+def upgrade():
+    # Overdue now means flagged by the due-date scanner, as in the filters
+    # and views; nothing reads the plain open-task due_date index any more.
+    _recount_overdue("task.overdue_at IS NOT NULL")
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_task_due_date_open",
+            table_name="task",
+            postgresql_concurrently=concurrently,
+        )
+
+
+def downgrade():
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_task_due_date_open",
+            "task",
+            ["due_date"],
+            unique=False,
+            postgresql_where=sa.text(OPEN_TASKS),
+            sqlite_where=sa.text(OPEN_TASKS),
+            postgresql_concurrently=concurrently,
+        )
+    _recount_overdue("task.due_date < CURRENT_TIMESTAMP")
@@ -0,0 +1,38 @@
+"""add_notification_counter
+
+Revision ID: d41b7f0e2c86
+Revises: 3c7e9b14a5f2
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d41b7f0e2c86"
+down_revision = "3c7e9b14a5f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "notification_counter",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("unread", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO notification_counter (user_id, unread)
+        SELECT user_id, COUNT(*) FROM notification
+        WHERE is_read IS NOT TRUE
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("notification_counter")
@@ -0,0 +1,64 @@
+"""add_task_search
+
+Revision ID: e2c4a7d9f1b6
+Revises: b5e8c3a1f7d4
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+
+
+revision = "e2c4a7d9f1b6"
+down_revision = "b5e8c3a1f7d4"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR = (
+    "to_tsvector('english', "
+    "coalesce(title, '') || ' ' || coalesce(description, ''))"
+)
+
+FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5("
+    "title, description, content='task', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_au "
+    "AFTER UPDATE OF title, description ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO task_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_task_search "
+                f"ON task USING gin ({SEARCH_VECTOR})"
+            )
+    elif dialect == "sqlite":
+        for statement in FTS_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO task_fts(task_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_task_search")
+    elif dialect == "sqlite":
+        for trigger in ("task_fts_au", "task_fts_ad", "task_fts_ai"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS task_fts")
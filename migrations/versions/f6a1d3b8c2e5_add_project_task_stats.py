@@ -0,0 +1,55 @@
+"""add_project_task_stats
+
+Revision ID: f6a1d3b8c2e5
+Revises: e2c4a7d9f1b6
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "f6a1d3b8c2e5"
+down_revision = "e2c4a7d9f1b6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "project_task_stats",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("todo", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("in_progress", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("done", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("overdue", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "reconciled_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO project_task_stats (project_id, todo, in_progress, done, overdue)
+        SELECT
+            project.id,
+            COUNT(CASE WHEN task.status = 'TODO' THEN 1 END),
+            COUNT(CASE WHEN task.status = 'IN_PROGRESS' THEN 1 END),
+            COUNT(CASE WHEN task.status = 'DONE' THEN 1 END),
+            COUNT(
+                CASE WHEN task.status <> 'DONE'
+                AND task.due_date < CURRENT_TIMESTAMP THEN 1 END
+            )
+        FROM project LEFT JOIN task ON task.project_id = project.id
+        GROUP BY project.id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("project_task_stats")
@@ -0,0 +1,32 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_in_process_caches():
+    """Each test builds a fresh database, so cached rows from the last test
+    (same ids, different people) must not leak into the next one."""
+    from app.core.membership_cache import membership_cache
+    from app.core.principal_cache import principal_cache
+    from app.core.response_cache import response_cache
+    from app.core.tokens import token_verifier
+
+    principal_cache.clear()
+    membership_cache.clear()
+    token_verifier.clear()
+    response_cache.clear()
+    yield
+    principal_cache.clear()
+    membership_cache.clear()
+    token_verifier.clear()
+    response_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def attachment_storage(tmp_path):
+    """Uploads go to a per-test directory instead of ./storage."""
+    from app.utils.storage import LocalStorage, set_storage
+
+    storage = LocalStorage(str(tmp_path / "storage"))
+    set_storage(storage)
+    yield storage
+    set_storage(None)
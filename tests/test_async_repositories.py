@@ -0,0 +1,172 @@
+"""
+Tests for the async repository layer, run against aiosqlite
+"""
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.organization import Organization
+from app.models.project import Project, ProjectTaskStats
+from app.models.task import TaskPriority, TaskStatus
+from app.models.user import User, UserRole
+from app.repositories.aio import (
+    async_notification_repository,
+    async_project_member_repository,
+    async_project_repository,
+    async_task_repository,
+    async_user_repository,
+)
+from app.repositories.base import encode_cursor
+from app.schemas.task import TaskFilters
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+async def seeded(db):
+    org = Organization(name="Async Org")
+    db.add(org)
+    await db.flush()
+    user = User(
+        email="async@test.com",
+        hashed_password="x",
+        full_name="Async User",
+        role=UserRole.MEMBER,
+        organization_id=org.id,
+    )
+    project = Project(name="Async Project", organization_id=org.id)
+    db.add_all([user, project])
+    await db.commit()
+    return org, user, project
+
+
+class TestAsyncRepositories:
+
+    async def test_task_pagination_by_organization(self, db, seeded):
+        org, user, project = seeded
+        for i in range(5):
+            await async_task_repository.create_task(
+                db, title=f"Task {i}", project_id=project.id, assignee_id=user.id
+            )
+        await db.commit()
+
+        first = await async_task_repository.get_by_organization(db, org.id, limit=3)
+        assert [t.title for t in first] == ["Task 0", "Task 1", "Task 2"]
+
+        rest = await async_task_repository.get_by_organization(
+            db, org.id, limit=3, cursor=encode_cursor(first[-1].id)
+        )
+        assert [t.title for t in rest] == ["Task 3", "Task 4"]
+
+    async def test_task_filters_and_stats(self, db, seeded):
+        org, user, project = seeded
+        task = await async_task_repository.create_task(
+            db, title="Done", project_id=project.id, status=TaskStatus.DONE
+        )
+        await async_task_repository.create_task(db, title="Open", project_id=project.id)
+        await db.commit()
+
+        done = await async_task_repository.get_by_organization(
+            db, org.id, filters=TaskFilters(status=["done"])
+        )
+        assert [t.id for t in done] == [task.id]
+        assert await async_project_repository.get_task_stats(db, project.id) == {
+            "todo": 1,
+            "in-progress": 0,
+            "done": 1,
+            "total": 2,
+            "overdue": 0,
+        }
+
+    async def test_task_search_and_sort(self, db, seeded):
+        org, user, project = seeded
+        for title, priority in (
+            ("Write report", TaskPriority.LOW),
+            ("Review report", TaskPriority.HIGH),
+            ("Plan sprint", TaskPriority.HIGH),
+        ):
+            await async_task_repository.create_task(
+                db, title=title, project_id=project.id, priority=priority
+            )
+        await db.commit()
+
+        filters = TaskFilters(q="report", sort="-priority")
+        found = await async_task_repository.get_by_organization(
+            db, org.id, limit=1, filters=filters
+        )
+        assert [t.title for t in found] == ["Review report"]
+
+        rest = await async_task_repository.get_by_organization(
+            db, org.id, cursor=encode_cursor(found[-1].id, "-priority"),
+            filters=filters,
+        )
+        assert [t.title for t in rest] == ["Write report"]
+
+    async def test_task_stats_read_from_stats_table(self, db, seeded):
+        org, user, project = seeded
+        await async_task_repository.create_task(db, title="Open", project_id=project.id)
+        await db.commit()
+
+        # Counts come from the maintained row, not from counting tasks.
+        await db.execute(
+            update(ProjectTaskStats)
+            .where(ProjectTaskStats.project_id == project.id)
+            .values(todo=7, overdue=2)
+        )
+        await db.commit()
+
+        stats = await async_project_repository.get_task_stats(db, project.id)
+        assert stats["todo"] == 7
+        assert stats["total"] == 7
+        assert stats["overdue"] == 2
+
+    async def test_membership_and_member_projects(self, db, seeded):
+        org, user, project = seeded
+        assert not await async_project_member_repository.is_member(
+            db, project.id, user.id
+        )
+        await async_project_member_repository.add_member(db, project.id, user.id)
+        await db.commit()
+
+        assert await async_project_member_repository.is_member(db, project.id, user.id)
+        projects = await async_project_repository.get_member_projects(db, user.id)
+        assert [p.id for p in projects] == [project.id]
+
+    async def test_user_lookup(self, db, seeded):
+        org, user, project = seeded
+        assert await async_user_repository.email_exists(db, "async@test.com")
+        users = await async_user_repository.get_by_organization(db, org.id)
+        assert [u.id for u in users] == [user.id]
+
+    async def test_notifications_newest_first(self, db, seeded):
+        org, user, project = seeded
+        for i in range(3):
+            await async_notification_repository.create_notification(
+                db, user_id=user.id, title=f"N{i}", message="m"
+            )
+        await db.commit()
+
+        latest = await async_notification_repository.get_by_user(db, user.id, limit=2)
+        assert [n.title for n in latest] == ["N2", "N1"]
+
+        await async_notification_repository.mark_as_read(db, latest[0])
+        unread = await async_notification_repository.get_by_user(
+            db, user.id, unread_only=True
+        )
+        assert [n.title for n in unread] == ["N1", "N0"]
@@ -65,6 +65,51 @@ class TestSecurity:
         token = create_access_token(subject="user123", expires_delta=timedelta(hours=1))
         assert token is not None
 
+    def test_verify_token_round_trip(self):
+        """Test verified tokens return their claims"""
+        from app.core.security import create_access_token, verify_token
+
+        payload = verify_token(create_access_token(subject=42))
+        assert payload["sub"] == "42"
+        assert payload["type"] == "access"
+
+    def test_verify_token_rejects_invalid(self):
+        """Test tampered, expired, unsigned and malformed tokens are rejected"""
+        import base64
+        import json
+        from app.core.security import create_access_token, verify_token
+
+        token = create_access_token(subject=1)
+        header, payload, signature = token.split(".")
+        forged = base64.urlsafe_b64encode(
+            json.dumps({"sub": "2", "exp": 9999999999}).encode()
+        ).rstrip(b"=").decode()
+        unsigned = base64.urlsafe_b64encode(b'{"alg":"none"}').rstrip(b"=").decode()
+
+        assert verify_token(f"{header}.{forged}.{signature}") is None
+        assert verify_token(f"{unsigned}.{payload}.") is None
+        assert verify_token("not-a-token") is None
+        assert (
+            verify_token(create_access_token(1, expires_delta=timedelta(seconds=-1)))
+            is None
+        )
+
+    def test_verified_tokens_are_cached(self, monkeypatch):
+        """Test repeat verification skips signature checking"""
+        from app.core.security import create_access_token
+        from app.core.tokens import TokenVerifier
+        from app.config import settings
+
+        verifier = TokenVerifier(settings.SECRET_KEY, max_entries=10, max_ttl=60)
+        token = create_access_token(subject=1)
+        assert verifier.decode(token)["sub"] == "1"
+
+        def fail(_):
+            raise AssertionError("token verified twice")
+
+        monkeypatch.setattr(verifier, "_verify", fail)
+        assert verifier.decode(token)["sub"] == "1"
+
 
 class TestLogging:
     """Test logging module"""
@@ -134,3 +179,93 @@ class TestModels:
         assert TaskPriority.LOW.value == "low"
         assert TaskPriority.MEDIUM.value == "medium"
         assert TaskPriority.HIGH.value == "high"
+
+
+class TestDatabasePool:
+    """Test connection pool configuration and metrics"""
+
+    def test_engine_options_queue_pool(self):
+        """Test pool settings are applied to Postgres engines"""
+        from app.config import settings
+        from app.db.session import TimedQueuePool, engine_options
+
+        options = engine_options("postgresql://u:p@db/app")
+        assert options["poolclass"] is TimedQueuePool
+        assert options["pool_size"] == settings.DB_POOL_SIZE
+        assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+        assert options["echo"] is settings.DB_ECHO
+
+    def test_engine_options_null_pool(self, monkeypatch):
+        """Test NullPool mode for external poolers"""
+        from sqlalchemy.pool import NullPool
+        from app.config import settings
+        from app.db.session import engine_options
+
+        monkeypatch.setattr(settings, "DB_USE_NULL_POOL", True)
+        options = engine_options("postgresql://u:p@db/app")
+        assert options["poolclass"] is NullPool
+        assert "pool_size" not in options
+
+    def test_engine_options_sqlite(self):
+        """Test SQLite engines keep SQLAlchemy's default pool"""
+        from app.db.session import engine_options
+
+        assert "poolclass" not in engine_options("sqlite://")
+
+    def test_pool_status_tracks_checkouts(self, tmp_path):
+        """Test pool metrics report checked out connections and waits"""
+        from sqlalchemy import create_engine
+        from app.db.session import TimedQueuePool, get_pool_status
+
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=TimedQueuePool,
+            pool_size=2,
+            max_overflow=0,
+        )
+        with engine.connect():
+            status = get_pool_status(engine)
+            assert status["checked_out"] == 1
+            assert status["checkouts"] == 1
+        assert get_pool_status(engine)["checked_out"] == 0
+        engine.dispose()
+
+
+class TestPasswordHasher:
+    """Test the bounded bcrypt worker pool"""
+
+    def test_async_hash_and_verify(self):
+        """Test the async interface round-trips a password"""
+        import asyncio
+        from app.core.security import aget_password_hash, averify_password
+
+        async def run():
+            hashed = await aget_password_hash("secret")
+            return await averify_password("secret", hashed), await averify_password(
+                "wrong", hashed
+            )
+
+        assert asyncio.run(run()) == (True, False)
+
+    def test_rejects_when_queue_full(self):
+        """Test calls beyond workers + queue fail fast with 503"""
+        import threading
+        from passlib.context import CryptContext
+        from app.core.password_hasher import PasswordHasher, PasswordHasherBusy
+
+        hasher = PasswordHasher(
+            workers=1, max_queue=0, context=CryptContext(schemes=["bcrypt"])
+        )
+        release = threading.Event()
+        blocked = hasher._submit(release.wait)
+        with pytest.raises(PasswordHasherBusy) as exc_info:
+            hasher.hash("secret")
+        assert exc_info.value.status_code == 503
+
+        release.set()
+        blocked.result()
+        assert hasher.verify("secret", hasher.hash("secret")) is True
+        metrics = hasher.metrics.snapshot()
+        assert metrics["rejected"] == 1
+        assert metrics["calls"] == 3
+        assert metrics["in_flight"] == 0
@@ -3,17 +3,22 @@ Comprehensive Integration Tests for Full API Coverage
 Uses proper test database setup with fixtures
 """
 
+import os
+import tempfile
+
 import pytest
 from datetime import datetime, timedelta, timezone
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 from io import BytesIO
+from unittest.mock import patch
 
 from app.main import app
 from app.db.base_class import Base
-from app.api.deps import get_db
+from app.api.deps import get_async_db, get_db
 from app.models.user import User, UserRole
 from app.models.organization import Organization
 from app.models.project import Project, ProjectMember
@@ -22,14 +27,24 @@ from app.models.extras import Comment, Attachment, Notification
 from app.core.security import get_password_hash
 
 
-# Test database setup
-SQLALCHEMY_DATABASE_URL = "sqlite://"
+# Test database setup. A file rather than ":memory:", so that endpoints on
+# the async engine see the same data as the sync session.
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# TestClient runs each request on its own event loop; aiosqlite connections
+# are tied to one, so none are pooled.
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{DATABASE_PATH}", poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 @pytest.fixture(scope="function")
@@ -54,7 +69,12 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     yield TestClient(app)
     app.dependency_overrides.clear()
 
@@ -151,6 +171,59 @@ def member_token(client, test_member):
     return response.json()["data"].get("access_token")
 
 
+class SharedRedis:
+    """The few Redis commands the caches use, on dicts shared by workers."""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    def expire(self, key, ttl):
+        pass
+
+    def delete(self, key):
+        self.values.pop(key, None)
+        self.hashes.pop(key, None)
+
+    def pipeline(self):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            def __getattr__(self, name):
+                return lambda *args: self.calls.append((name, args))
+
+            def execute(self):
+                return [getattr(redis, name)(*args) for name, args in self.calls]
+
+        return Pipeline()
+
+
+@pytest.fixture
+def shared_redis(monkeypatch):
+    from app.core import cache_epochs, principal_cache
+
+    redis = SharedRedis()
+    for module in (cache_epochs, principal_cache):
+        monkeypatch.setattr(module, "get_redis", lambda: redis)
+    return redis
+
+
 class TestTasksEndpoint:
     """Comprehensive task endpoint tests"""
 
@@ -452,6 +525,31 @@ class TestNotificationsEndpoint:
         )
         assert response.status_code == 200
 
+    def test_list_reads_through_async_session(
+        self, client, admin_token, test_admin, db_session
+    ):
+        """Test the list is served by the async repository"""
+        from sqlalchemy import event
+
+        db_session.add(Notification(title="Async", message="m", user_id=test_admin.id))
+        db_session.commit()
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            response = client.get(
+                "/api/v1/notifications/",
+                headers={"Authorization": f"Bearer {admin_token}"},
+            )
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+        assert response.status_code == 200
+        assert [n["title"] for n in response.json()["data"]] == ["Async"]
+        assert any("FROM notification" in s for s in statements)
+
     def test_mark_notification_read(self, client, admin_token, test_admin, db_session):
         """Test marking notification as read"""
         notif = Notification(
@@ -470,6 +568,73 @@ class TestNotificationsEndpoint:
         )
         assert response.status_code == 200
 
+    def test_unread_count_follows_create_and_read(
+        self, client, admin_token, test_admin, db_session
+    ):
+        """Test the unread counter is kept in step with notifications"""
+        from app.services.notification_service import notification_service
+
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        url = "/api/v1/notifications/unread-count"
+        assert client.get(url, headers=headers).json()["data"]["unread"] == 0
+
+        first = notification_service.create_notification(
+            db_session, test_admin.id, "a", "b"
+        )
+        notification_service.enqueue_many(
+            db_session,
+            [{"user_id": test_admin.id, "title": "c", "message": "d"}] * 2,
+        )
+        db_session.commit()
+        notification_service.dispatch_pending(db_session)
+        assert client.get(url, headers=headers).json()["data"]["unread"] == 3
+
+        client.put(f"/api/v1/notifications/{first.id}/read", headers=headers)
+        client.put(f"/api/v1/notifications/{first.id}/read", headers=headers)
+        assert client.get(url, headers=headers).json()["data"]["unread"] == 2
+
+    def test_mark_all_read(self, client, admin_token, test_admin, db_session):
+        """Test marking every notification read in one call"""
+        from app.services.notification_service import notification_service
+
+        for i in range(3):
+            notification_service.create_notification(
+                db_session, test_admin.id, f"n{i}", "m"
+            )
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.put("/api/v1/notifications/mark-all-read", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["data"]["updated"] == 3
+
+        db_session.expire_all()
+        assert db_session.query(Notification).filter_by(is_read=False).count() == 0
+        response = client.get("/api/v1/notifications/unread-count", headers=headers)
+        assert response.json()["data"]["unread"] == 0
+
+    def test_concurrent_mark_read_decrements_once(self, test_admin, db_session):
+        """Test two callers holding the same unread row count it once"""
+        from app.repositories.notification_repository import (
+            decrement_unread,
+            get_unread_count,
+            mark_as_read,
+            mark_read_statement,
+        )
+        from app.services.notification_service import notification_service
+
+        for i in range(2):
+            notification_service.create_notification(
+                db_session, test_admin.id, f"n{i}", "m"
+            )
+        db_session.commit()
+        notification = db_session.query(Notification).first()
+        # Another request marks it read after this one loaded it unread.
+        db_session.execute(mark_read_statement(notification.id))
+        decrement_unread(db_session, test_admin.id)
+        assert notification.is_read is False
+        mark_as_read(db_session, notification)
+        db_session.commit()
+        assert get_unread_count(db_session, test_admin.id) == 1
+
 
 class TestUsersEndpoint:
     """Comprehensive user endpoint tests"""
@@ -505,6 +670,39 @@ class TestUsersEndpoint:
         )
         assert response.status_code == 200
 
+    def test_password_is_hashed_without_blocking_call(
+        self, client, admin_token, test_org, test_member
+    ):
+        """Test create and update await the hasher instead of blocking on it"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        with patch(
+            "app.core.password_hasher.PasswordHasher.hash",
+            side_effect=AssertionError("blocking hash"),
+        ):
+            created = client.post(
+                "/api/v1/users/",
+                headers=headers,
+                json={
+                    "email": "hashed@test.com",
+                    "password": "password123",
+                    "full_name": "Hashed User",
+                    "role": "member",
+                    "organization_id": test_org.id,
+                },
+            )
+            updated = client.put(
+                f"/api/v1/users/{test_member.id}",
+                headers=headers,
+                json={"password": "newpassword123"},
+            )
+        assert created.status_code == 200, created.text
+        assert updated.status_code == 200, updated.text
+        login = client.post(
+            "/api/v1/auth/login",
+            json={"email": test_member.email, "password": "newpassword123"},
+        )
+        assert login.status_code == 200
+
 
 class TestNotificationService:
     """Test notification service"""
@@ -530,8 +728,11 @@ class TestNotificationService:
     def test_notify_assignee(self, db_session, test_task, test_admin):
         """Test notify assignee function"""
         from app.services.notification import notify_assignee
+        from app.services.notification_service import notification_service
 
         notify_assignee(db_session, test_task, test_admin.id)
+        db_session.commit()
+        assert notification_service.dispatch_pending(db_session) == 1
 
         notifs = (
             db_session.query(Notification)
@@ -546,3 +747,1806 @@ class TestNotificationService:
 
         notify_status_change(db_session, test_task)
         # Should not fail
+
+
+class TestCursorPagination:
+    """Keyset pagination on list endpoints"""
+
+    def test_cursor_roundtrip(self):
+        from app.repositories.base import encode_cursor, decode_cursor
+
+        assert decode_cursor(encode_cursor(42)) == 42
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_tasks_cursor_walks_all_pages(
+        self, client, admin_token, test_project, test_admin, db_session
+    ):
+        for i in range(5):
+            db_session.add(
+                Task(
+                    title=f"Paged Task {i}",
+                    project_id=test_project.id,
+                    assignee_id=test_admin.id,
+                )
+            )
+        db_session.commit()
+
+        seen = []
+        cursor = None
+        for _ in range(5):
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get(
+                "/api/v1/tasks/",
+                params=params,
+                headers={"Authorization": f"Bearer {admin_token}"},
+            )
+            assert response.status_code == 200
+            body = response.json()
+            seen.extend(t["id"] for t in body["data"])
+            cursor = body.get("next_cursor")
+            if not cursor:
+                break
+
+        assert seen == sorted(seen)
+        assert len(seen) == len(set(seen)) == 5
+
+    def test_notifications_cursor_newest_first(
+        self, client, admin_token, test_admin, db_session
+    ):
+        for i in range(3):
+            db_session.add(
+                Notification(title=f"N{i}", message="m", user_id=test_admin.id)
+            )
+        db_session.commit()
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        first = client.get(
+            "/api/v1/notifications/", params={"limit": 2}, headers=headers
+        ).json()
+        assert [n["title"] for n in first["data"]] == ["N2", "N1"]
+
+        second = client.get(
+            "/api/v1/notifications/",
+            params={"limit": 2, "cursor": first["next_cursor"]},
+            headers=headers,
+        ).json()
+        assert [n["title"] for n in second["data"]] == ["N0"]
+        assert second.get("next_cursor") is None
+
+    def test_skip_with_cursor_rejected(self, client, admin_token):
+        from app.repositories.base import encode_cursor
+
+        response = client.get(
+            "/api/v1/tasks/",
+            params={"cursor": encode_cursor(1), "skip": 5},
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+        assert response.status_code == 400
+        assert response.json()["message"] == "skip cannot be combined with a cursor"
+
+    def test_invalid_cursor_rejected(self, client, admin_token):
+        response = client.get(
+            "/api/v1/tasks/",
+            params={"cursor": "garbage"},
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+        assert response.status_code == 400
+
+
+class TestReadReplicaRouting:
+    """GET endpoints read from replicas with read-your-writes stickiness"""
+
+    @pytest.fixture
+    def replica(self, tmp_path, test_org, test_project):
+        from app.db.session import ReplicaSessionLocal
+
+        url = f"sqlite:///{tmp_path / 'replica.db'}"
+        replica_engine = create_engine(url)
+        Base.metadata.create_all(bind=replica_engine)
+        with sessionmaker(bind=replica_engine)() as session:
+            session.add(Organization(id=test_org.id, name=test_org.name))
+            session.add(
+                Project(
+                    id=test_project.id,
+                    name=test_project.name,
+                    organization_id=test_org.id,
+                )
+            )
+            session.add(Task(title="Replica Task", project_id=test_project.id))
+            session.commit()
+        replica_engine.dispose()
+
+        ReplicaSessionLocal.configure([url])
+        yield
+        ReplicaSessionLocal.configure([])
+
+    def test_get_reads_from_replica(self, client, admin_token, test_task, replica):
+        response = client.get(
+            "/api/v1/tasks/", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert [t["title"] for t in response.json()["data"]] == ["Replica Task"]
+
+    def test_write_pins_reads_to_primary(
+        self, client, admin_token, test_org, test_task, replica
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.post(
+            "/api/v1/projects/",
+            headers=headers,
+            json={"name": "Sticky", "organization_id": test_org.id},
+        )
+        assert "READ_PRIMARY" in response.cookies
+
+        response = client.get("/api/v1/tasks/", headers=headers)
+        assert [t["title"] for t in response.json()["data"]] == ["Test Task"]
+
+    def test_tool_context_reader_switches_after_write(self):
+        from unittest.mock import MagicMock
+        from app.agent.tools.base import ToolContext
+
+        primary, replica = MagicMock(), MagicMock()
+        ToolContext.set_context(primary, MagicMock(), read_db=replica)
+        try:
+            assert ToolContext.reader() is replica
+            ToolContext.mark_written()
+            assert ToolContext.reader() is primary
+        finally:
+            ToolContext.clear_context()
+        assert ToolContext.read_db is None
+
+    def test_tool_context_is_per_run(self):
+        import threading
+        from unittest.mock import MagicMock
+        from app.agent.tools.base import ToolContext
+
+        primary, replica = MagicMock(), MagicMock()
+        ToolContext.set_context(primary, MagicMock(), read_db=replica)
+        try:
+
+            def other_run():
+                ToolContext.set_context(MagicMock(), MagicMock(), read_db=MagicMock())
+                ToolContext.mark_written()
+
+            thread = threading.Thread(target=other_run)
+            thread.start()
+            thread.join()
+            assert ToolContext.db is primary
+            assert ToolContext.reader() is replica
+        finally:
+            ToolContext.clear_context()
+
+
+class TestPrincipalCache:
+    """Authenticated user resolution is cached and invalidated on change"""
+
+    def test_ttl_cache_expiry_and_lru(self, monkeypatch):
+        from app.core import ttl_cache
+        from app.core.ttl_cache import TTLCache
+
+        now = [100.0]
+        monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+        cache = TTLCache(max_entries=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        now[0] += 11
+        assert cache.get("a") is None
+
+    def test_repeat_requests_served_from_cache(
+        self, client, admin_token, test_admin, test_project
+    ):
+        from sqlalchemy import event
+
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        assert client.get("/api/v1/projects/", headers=headers).status_code == 200
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.get("/api/v1/projects/", headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        assert response.status_code == 200
+        assert any("FROM project" in s for s in statements)
+        assert not any('FROM "user"' in s or "FROM user" in s for s in statements)
+
+    def test_me_is_the_same_on_hit_and_miss(self, client, admin_token, test_admin):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        miss = client.get("/api/v1/users/me", headers=headers).json()["data"]
+        hit = client.get("/api/v1/users/me", headers=headers).json()["data"]
+        assert hit == miss
+        assert miss["email"] == test_admin.email
+
+    def test_deactivation_invalidates_principal(
+        self, client, admin_token, member_token, test_member
+    ):
+        member_headers = {"Authorization": f"Bearer {member_token}"}
+        assert client.get("/api/v1/users/me", headers=member_headers).status_code == 200
+
+        response = client.put(
+            f"/api/v1/users/{test_member.id}",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"is_active": False},
+        )
+        assert response.status_code == 200
+
+        response = client.get("/api/v1/users/me", headers=member_headers)
+        assert response.status_code == 400
+
+
+    def test_invalidation_reaches_other_workers(self, shared_redis):
+        from app.core.principal_cache import Principal, PrincipalCache
+
+        principal = Principal(
+            id=7,
+            email="w@test.com",
+            full_name=None,
+            organization_id=1,
+            role=UserRole.MEMBER,
+            is_active=True,
+        )
+        worker_a = PrincipalCache(max_entries=10, ttl=60)
+        worker_b = PrincipalCache(max_entries=10, ttl=60)
+        worker_a.set(7, "token", principal)
+        assert worker_b.get(7, "token") == principal
+
+        worker_a.invalidate(7)
+        assert worker_b.get(7, "token") is None
+        assert worker_a.get(7, "token") is None
+
+
+class TestResponseCache:
+    """GET responses are cached per org/role and invalidated by mutations"""
+
+    @pytest.fixture(autouse=True)
+    def memory_cache(self, monkeypatch):
+        from app.config import settings
+        from app.core.response_cache import MemoryCacheBackend, response_cache
+
+        monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+        response_cache.use(MemoryCacheBackend())
+        yield
+        response_cache.use(None)
+
+    def test_repeat_get_hits_cache_and_honors_etag(
+        self, client, admin_token, test_project
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        first = client.get("/api/v1/projects/", headers=headers)
+        assert first.headers["X-Cache"] == "MISS"
+
+        second = client.get("/api/v1/projects/", headers=headers)
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+
+        not_modified = client.get(
+            "/api/v1/projects/",
+            headers={**headers, "If-None-Match": first.headers["ETag"]},
+        )
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+    def test_hit_replays_status_and_headers(self):
+        from fastapi import Request
+        from fastapi.responses import Response
+        from app.core.response_cache import response_cache
+
+        @response_cache.cached("projects")
+        def endpoint(request, current_user):
+            return Response(
+                content=b"{}",
+                status_code=203,
+                media_type="application/json",
+                headers={"ETag": '"own"', "X-Extra": "1"},
+            )
+
+        user = User(id=1, organization_id=1, role=UserRole.ADMIN)
+        scope = {
+            "type": "http", "method": "GET", "path": "/x",
+            "query_string": b"", "headers": [],
+        }
+        miss = endpoint(request=Request(scope), current_user=user)
+        hit = endpoint(request=Request(scope), current_user=user)
+        assert hit.headers["X-Cache"] == "HIT"
+        for response in (miss, hit):
+            assert response.status_code == 203
+            assert response.headers["ETag"] == '"own"'
+            assert response.headers["X-Extra"] == "1"
+            assert response.headers["Content-Type"] == "application/json"
+
+    def test_task_mutation_invalidates_list(
+        self, client, admin_token, test_project, test_task
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        url = f"/api/v1/tasks/?project_id={test_project.id}"
+        assert len(client.get(url, headers=headers).json()["data"]) == 1
+        assert client.get(url, headers=headers).headers["X-Cache"] == "HIT"
+
+        client.post(
+            "/api/v1/tasks/",
+            headers=headers,
+            json={"title": "Another", "project_id": test_project.id},
+        )
+
+        response = client.get(url, headers=headers)
+        assert response.headers["X-Cache"] == "MISS"
+        assert len(response.json()["data"]) == 2
+
+    def test_members_do_not_share_entries(
+        self, client, admin_token, member_token, test_project
+    ):
+        admin = client.get(
+            "/api/v1/projects/", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        member = client.get(
+            "/api/v1/projects/", headers={"Authorization": f"Bearer {member_token}"}
+        )
+        assert member.headers["X-Cache"] == "MISS"
+        assert len(admin.json()["data"]) == 1
+        assert member.json()["data"] == []
+
+
+class TestNotificationStream:
+    """New notifications are pushed to subscribed stream connections"""
+
+    def test_format_sse(self):
+        from app.core.notification_broker import format_sse
+
+        assert (
+            format_sse({"id": 3}, event="notification", id=3)
+            == 'id: 3\nevent: notification\ndata: {"id":3}\n\n'
+        )
+
+    async def test_create_notification_publishes_to_subscriber(
+        self, db_session, test_admin
+    ):
+        import asyncio
+        from app.core.notification_broker import notification_broker
+        from app.services.notification_service import notification_service
+
+        async with notification_broker.subscribe(test_admin.id) as queue:
+            notification = await asyncio.to_thread(
+                notification_service.create_notification,
+                db_session,
+                test_admin.id,
+                "Hello",
+                "World",
+            )
+            message = await asyncio.wait_for(queue.get(), 1)
+        assert message["id"] == notification.id
+        assert message["title"] == "Hello"
+        assert notification_broker.subscriber_count() == 0
+
+    async def test_event_stream_replays_missed_then_streams_live(self, test_admin):
+        import asyncio
+        from app.api.v1.endpoints.notifications import notification_events
+        from app.core.notification_broker import notification_broker
+
+        class ConnectedRequest:
+            async def is_disconnected(self):
+                return False
+
+        missed = [{"id": 1, "title": "a", "message": "b", "is_read": False}]
+        events = notification_events(ConnectedRequest(), test_admin.id, missed)
+        assert (await anext(events)).startswith("retry:")
+        assert (await anext(events)).startswith("id: 1\n")
+
+        live = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0)
+        notification_broker.deliver(
+            test_admin.id, {"id": 2, "title": "c", "message": "d", "is_read": False}
+        )
+        assert (await asyncio.wait_for(live, 1)).startswith("id: 2\n")
+        await events.aclose()
+        assert notification_broker.subscriber_count() == 0
+
+
+class TestNotificationOutbox:
+    """Mutations queue notifications in their own transaction"""
+
+    def test_status_change_commits_once_and_dispatches(
+        self, client, admin_token, db_session, test_task, test_member
+    ):
+        from app.models.extras import NotificationOutbox
+        from app.services.notification_service import notification_service
+
+        test_task.assignee_id = test_member.id
+        db_session.add(
+            ProjectMember(project_id=test_task.project_id, user_id=test_member.id)
+        )
+        db_session.commit()
+
+        with patch(
+            "app.services.notification_service.notification_dispatcher.wake"
+        ) as wake:
+            response = client.put(
+                f"/api/v1/tasks/{test_task.id}",
+                headers={"Authorization": f"Bearer {admin_token}"},
+                json={"status": "in-progress"},
+            )
+        assert response.status_code == 200
+        wake.assert_called_once()
+        assert db_session.query(NotificationOutbox).count() == 1
+        assert db_session.query(Notification).count() == 0
+
+        assert notification_service.dispatch_pending(db_session) == 1
+        assert db_session.query(NotificationOutbox).count() == 0
+        notification = db_session.query(Notification).one()
+        assert notification.user_id == test_member.id
+        assert notification.is_read is False
+
+    def test_rollback_discards_queued_notifications(self, db_session, test_admin):
+        from app.models.extras import NotificationOutbox
+        from app.services.notification_service import notification_service
+
+        notification_service.enqueue(db_session, test_admin.id, "t", "m")
+        db_session.rollback()
+        assert db_session.query(NotificationOutbox).count() == 0
+        assert notification_service.dispatch_pending(db_session) == 0
+
+    def test_dispatch_batches(self, db_session, test_admin):
+        from app.services.notification_service import notification_service
+
+        notification_service.enqueue_many(
+            db_session,
+            [
+                {"user_id": test_admin.id, "title": f"n{i}", "message": "m"}
+                for i in range(5)
+            ],
+        )
+        db_session.commit()
+        assert notification_service.dispatch_pending(db_session, batch_size=3) == 3
+        assert notification_service.dispatch_pending(db_session, batch_size=3) == 2
+        assert db_session.query(Notification).count() == 5
+
+    def test_dispatch_keeps_enqueue_time(self, db_session, test_admin):
+        from app.models.extras import NotificationOutbox
+        from app.services.notification_service import notification_service
+
+        notification_service.enqueue(db_session, test_admin.id, "t", "m")
+        db_session.commit()
+        queued = db_session.query(NotificationOutbox).one()
+        queued.created_at = datetime(2020, 1, 1)
+        db_session.commit()
+
+        notification_service.dispatch_pending(db_session)
+        notification = db_session.query(Notification).one()
+        assert notification.created_at.replace(tzinfo=None) == datetime(2020, 1, 1)
+
+
+class TestNotificationRetention:
+    """Old notifications are compacted in bounded batches"""
+
+    @pytest.fixture
+    def history(self, db_session, test_admin):
+        from app.repositories.notification_repository import increment_unread
+
+        old = datetime.now(timezone.utc) - timedelta(days=90)
+        rows = [
+            Notification(
+                user_id=test_admin.id,
+                title=f"n{i}",
+                message="m",
+                is_read=i < 3,
+                created_at=old,
+            )
+            for i in range(4)
+        ]
+        rows.append(Notification(user_id=test_admin.id, title="new", message="m"))
+        db_session.add_all(rows)
+        increment_unread(db_session, [test_admin.id, test_admin.id])
+        db_session.commit()
+        return rows
+
+    def test_compact_deletes_old_read_notifications(
+        self, db_session, history, monkeypatch
+    ):
+        from app.config import settings
+        from app.services.notification_service import notification_service
+
+        monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_BATCH_SIZE", 2)
+        assert notification_service.compact(db_session) == 3
+        remaining = {n.title for n in db_session.query(Notification).all()}
+        assert remaining == {"n3", "new"}
+
+    def test_compact_archives_and_adjusts_unread_counter(
+        self, db_session, history, test_admin, monkeypatch
+    ):
+        from app.config import settings
+        from app.models.extras import NotificationArchive
+        from app.repositories.notification_repository import get_unread_count
+        from app.services.notification_service import notification_service
+
+        monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_MODE", "archive")
+        monkeypatch.setattr(settings, "NOTIFICATION_UNREAD_TTL_DAYS", 60)
+        assert notification_service.compact(db_session) == 4
+        assert db_session.query(NotificationArchive).count() == 4
+        assert [n.title for n in db_session.query(Notification).all()] == ["new"]
+        assert get_unread_count(db_session, test_admin.id) == 1
+
+
+class TestAttachmentStorage:
+    """Uploads are streamed into content-addressed storage"""
+
+    @pytest.fixture
+    def upload(
+        self, client, admin_token, test_task, test_project, db_session, test_admin
+    ):
+        db_session.add(
+            ProjectMember(project_id=test_project.id, user_id=test_admin.id)
+        )
+        db_session.commit()
+
+        def post(name, content, content_type="text/plain"):
+            return client.post(
+                f"/api/v1/tasks/{test_task.id}/attachments",
+                headers={"Authorization": f"Bearer {admin_token}"},
+                files={"file": (name, BytesIO(content), content_type)},
+            )
+
+        return post
+
+    def test_identical_content_is_stored_once(
+        self, upload, db_session, attachment_storage
+    ):
+        import hashlib
+        import os
+
+        assert upload("a.txt", b"same bytes").status_code == 200
+        assert upload("b.txt", b"same bytes").status_code == 200
+
+        rows = db_session.query(Attachment).order_by(Attachment.id).all()
+        digest = hashlib.sha256(b"same bytes").hexdigest()
+        assert [r.filename for r in rows] == ["a.txt", "b.txt"]
+        key = f"sha256/{digest[:2]}/{digest[2:4]}/{digest}"
+        assert {r.file_path for r in rows} == {key}
+        assert rows[0].size == 10
+        assert rows[0].content_type == "text/plain"
+        with open(attachment_storage.path(rows[0].file_path), "rb") as f:
+            assert f.read() == b"same bytes"
+        assert os.listdir(os.path.join(attachment_storage.root, "tmp")) == []
+
+    def test_oversized_upload_rejected_without_leftovers(
+        self, upload, db_session, attachment_storage, monkeypatch
+    ):
+        import os
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "ATTACHMENT_MAX_SIZE_BYTES", 8)
+        monkeypatch.setattr(settings, "STORAGE_CHUNK_SIZE", 4)
+        assert upload("big.bin", b"0123456789").status_code == 400
+        assert db_session.query(Attachment).count() == 0
+        assert os.listdir(os.path.join(attachment_storage.root, "tmp")) == []
+
+    async def test_local_storage_keeps_file_io_off_the_loop(
+        self, tmp_path, monkeypatch
+    ):
+        import os
+        import threading
+        from app.utils import storage as storage_module
+        from app.utils.storage import LocalStorage
+
+        loop_thread = threading.current_thread()
+        threads = []
+        real_replace = os.replace
+
+        def replace(src, dst):
+            threads.append(threading.current_thread())
+            real_replace(src, dst)
+
+        monkeypatch.setattr(storage_module.os, "replace", replace)
+
+        async def chunks():
+            yield b"off the loop"
+
+        stored = await LocalStorage(str(tmp_path)).save(chunks())
+        assert not stored.deduplicated
+        assert threads and loop_thread not in threads
+
+    async def test_s3_storage_deduplicates(self):
+        from app.utils.storage import S3Storage
+
+        class MissingKey(Exception):
+            response = {"Error": {"Code": "404"}}
+
+        class LocalS3:
+            def __init__(self):
+                self.objects = {}
+
+            def head_object(self, Bucket, Key):
+                if (Bucket, Key) not in self.objects:
+                    raise MissingKey()
+                return {}
+
+            def upload_fileobj(self, fileobj, bucket, key):
+                self.objects[(bucket, key)] = fileobj.read()
+
+        async def chunks(data):
+            for i in range(0, len(data), 3):
+                yield data[i : i + 3]
+
+        s3 = LocalS3()
+        storage = S3Storage("bucket", prefix="att/", client=s3)
+        first = await storage.save(chunks(b"hello world"))
+        second = await storage.save(chunks(b"hello world"))
+
+        assert first.deduplicated is False and second.deduplicated is True
+        assert first.key == second.key
+        assert s3.objects == {("bucket", f"att/{first.key}"): b"hello world"}
+
+
+class TestAttachmentDownload:
+    """Attachments are served to project members only"""
+
+    @pytest.fixture
+    def attachment(self, client, admin_token, test_task, db_session, test_admin):
+        db_session.add(
+            ProjectMember(project_id=test_task.project_id, user_id=test_admin.id)
+        )
+        db_session.commit()
+        client.post(
+            f"/api/v1/tasks/{test_task.id}/attachments",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            files={"file": ("notes.txt", BytesIO(b"0123456789"), "text/plain")},
+        )
+        return db_session.query(Attachment).one()
+
+    def test_download_with_range_and_etag(
+        self, client, admin_token, test_task, attachment
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        url = f"/api/v1/tasks/{test_task.id}/attachments/{attachment.id}"
+
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert response.content == b"0123456789"
+        assert response.headers["etag"] == f'"{attachment.sha256}"'
+        assert "notes.txt" in response.headers["content-disposition"]
+
+        partial = client.get(url, headers={**headers, "Range": "bytes=2-5"})
+        assert partial.status_code == 206
+        assert partial.content == b"2345"
+
+        cached = client.get(
+            url, headers={**headers, "If-None-Match": response.headers["etag"]}
+        )
+        assert cached.status_code == 304
+
+    def test_accel_redirect_hands_off_to_nginx(
+        self, client, admin_token, test_task, attachment, monkeypatch
+    ):
+        from app.config import settings
+
+        monkeypatch.setattr(
+            settings, "ATTACHMENT_ACCEL_REDIRECT_PREFIX", "/_protected/storage/"
+        )
+        response = client.get(
+            f"/api/v1/tasks/{test_task.id}/attachments/{attachment.id}",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+        assert response.status_code == 200
+        assert response.content == b""
+        assert (
+            response.headers["x-accel-redirect"]
+            == f"/_protected/storage/{attachment.file_path}"
+        )
+
+    def test_non_member_cannot_download(
+        self, client, member_token, test_task, attachment
+    ):
+        response = client.get(
+            f"/api/v1/tasks/{test_task.id}/attachments/{attachment.id}",
+            headers={"Authorization": f"Bearer {member_token}"},
+        )
+        assert response.status_code == 403
+
+    def test_attachment_must_belong_to_task(
+        self, client, admin_token, test_project, test_admin, attachment, db_session
+    ):
+        other = Task(
+            title="Other", project_id=test_project.id, assignee_id=test_admin.id
+        )
+        db_session.add(other)
+        db_session.commit()
+        response = client.get(
+            f"/api/v1/tasks/{other.id}/attachments/{attachment.id}",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+        assert response.status_code == 404
+
+
+class TestSchemaSerialization:
+    """List endpoints serialize through the Pydantic schemas in one pass"""
+
+    def test_json_response_matches_success_response_envelope(self, test_task):
+        import json
+        from app.schemas.api_response import ApiResponse
+        from app.schemas.task import TaskInDB
+
+        fast = json.loads(
+            ApiResponse.json_response(
+                data=[test_task], schema=TaskInDB, message="ok", next_cursor="c"
+            ).body
+        )
+        slow = ApiResponse.success_response(
+            data=[TaskInDB.model_validate(test_task)], message="ok", next_cursor="c"
+        ).model_dump(mode="json", exclude_none=False)
+        fast.pop("timestamp"), slow.pop("timestamp")
+        assert fast == slow
+
+    def test_task_list_includes_assignee(
+        self, client, admin_token, test_task, test_admin
+    ):
+        response = client.get(
+            "/api/v1/tasks/", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.headers["content-type"] == "application/json"
+        task = response.json()["data"][0]
+        assert task["assignee"]["email"] == test_admin.email
+        assert task["status"] == "todo"
+
+    def test_user_list_hides_password_hash(self, client, admin_token, test_admin):
+        response = client.get(
+            "/api/v1/users/", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        users = response.json()["data"]
+        assert users and all("hashed_password" not in u for u in users)
+
+
+class TestSparseFieldsets:
+    """fields= and expand= narrow list responses and the queries behind them"""
+
+    def _get(self, client, token, url):
+        response = client.get(url, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    def test_fields_project_columns_and_drop_default_expansion(
+        self, client, admin_token, test_task, db_session
+    ):
+        from sqlalchemy import event
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        db_session.expire_all()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            body = self._get(
+                client, admin_token, "/api/v1/tasks/?fields=title,status&expand="
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert body["data"] == [
+            {"id": test_task.id, "title": "Test Task", "status": "todo"}
+        ]
+        first = next(i for i, s in enumerate(statements) if "FROM task" in s)
+        assert "task.description" not in statements[first]
+        assert not any('FROM "user"' in s for s in statements[first:])
+
+    def test_expand_related_objects(
+        self, client, admin_token, test_task, test_admin, test_project, db_session
+    ):
+        db_session.add(ProjectMember(project_id=test_project.id, user_id=test_admin.id))
+        db_session.commit()
+
+        tasks = self._get(
+            client, admin_token, "/api/v1/tasks/?fields=title&expand=project,assignee"
+        )["data"]
+        assert tasks[0]["project"]["name"] == "Test Project"
+        assert tasks[0]["assignee"]["email"] == test_admin.email
+
+        projects = self._get(
+            client, admin_token, "/api/v1/projects/?fields=name&expand=members"
+        )["data"]
+        assert projects[0]["members"][0]["user"]["email"] == test_admin.email
+        assert "description" not in projects[0]
+
+        users = self._get(
+            client, admin_token, "/api/v1/users/?fields=email&expand=organization"
+        )["data"]
+        assert users[0]["organization"]["name"] == "Test Organization"
+        assert set(users[0]) == {"id", "email", "organization"}
+
+    def test_unknown_field_or_relation_is_rejected(self, client, admin_token):
+        for query in ("fields=title,secret", "expand=comments"):
+            response = client.get(
+                f"/api/v1/tasks/?{query}",
+                headers={"Authorization": f"Bearer {admin_token}"},
+            )
+            assert response.status_code == 400
+
+
+class TestCompressionAndConditionalGet:
+    """Large responses are compressed; unchanged pages revalidate with a 304"""
+
+    @pytest.fixture
+    def many_tasks(self, db_session, test_project):
+        for i in range(30):
+            db_session.add(
+                Task(
+                    title=f"Task {i}",
+                    description="Lorem ipsum dolor sit amet " * 4,
+                    project_id=test_project.id,
+                )
+            )
+        db_session.commit()
+
+    def test_choose_encoding(self):
+        from app.core.middleware import available_encodings, choose_encoding
+
+        assert choose_encoding(None) is None
+        assert choose_encoding("identity") is None
+        assert choose_encoding("gzip;q=0.5, deflate") == "gzip"
+        assert choose_encoding("gzip;q=0") is None
+        assert choose_encoding("*") == available_encodings()[0]
+
+    def test_large_list_is_gzipped(self, client, admin_token, many_tasks):
+        response = client.get(
+            "/api/v1/tasks/",
+            headers={
+                "Authorization": f"Bearer {admin_token}",
+                "Accept-Encoding": "gzip",
+            },
+        )
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.headers["etag"].startswith("W/")
+        assert len(response.json()["data"]) == 30
+
+    def test_zstd_preferred_when_available(self, client, admin_token, many_tasks):
+        import json
+
+        zstandard = pytest.importorskip("zstandard")
+        response = client.get(
+            "/api/v1/tasks/",
+            headers={
+                "Authorization": f"Bearer {admin_token}",
+                "Accept-Encoding": "gzip, zstd",
+            },
+        )
+        assert response.headers["content-encoding"] == "zstd"
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(
+            response.content
+        )
+        assert len(json.loads(body)["data"]) == 30
+
+    def test_small_response_is_not_compressed(self, client):
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    def test_unchanged_list_returns_304(
+        self, client, admin_token, many_tasks, db_session
+    ):
+        headers = {
+            "Authorization": f"Bearer {admin_token}",
+            "Accept-Encoding": "gzip",
+        }
+        first = client.get("/api/v1/tasks/", headers=headers)
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        again = client.get(
+            "/api/v1/tasks/", headers={**headers, "If-None-Match": etag}
+        )
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+
+        task = db_session.query(Task).first()
+        task.title = "Renamed"
+        db_session.commit()
+        changed = client.get(
+            "/api/v1/tasks/", headers={**headers, "If-None-Match": etag}
+        )
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+
+class TestBulkTasks:
+    """POST/PATCH /tasks/bulk validate once and write in batches"""
+
+    def _auth(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_bulk_create_is_one_insert_and_one_outbox_write(
+        self, client, admin_token, test_project, test_member, db_session
+    ):
+        from sqlalchemy import event
+        from app.models.extras import NotificationOutbox
+
+        payload = {
+            "tasks": [
+                {"title": f"Imported {i}", "project_id": test_project.id}
+                for i in range(2000)
+            ]
+        }
+        payload["tasks"][0]["assignee_id"] = test_member.id
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.post(
+                "/api/v1/tasks/bulk", json=payload, headers=self._auth(admin_token)
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert response.status_code == 201, response.text
+        body = response.json()
+        assert body["status_code"] == 201
+        assert len(body["data"]) == 2000
+        assert body["data"][0]["assignee_id"] == test_member.id
+        assert db_session.query(Task).count() == 2000
+        assert db_session.query(NotificationOutbox).count() == 1
+        task_inserts = [s for s in statements if s.startswith("INSERT INTO task")]
+        assert 0 < len(task_inserts) <= 5
+
+    def test_bulk_create_is_all_or_nothing(
+        self, client, member_token, test_member, test_project, test_org, db_session
+    ):
+        other = Project(name="Other", organization_id=test_org.id)
+        db_session.add(other)
+        db_session.add(
+            ProjectMember(project_id=test_project.id, user_id=test_member.id)
+        )
+        db_session.commit()
+
+        response = client.post(
+            "/api/v1/tasks/bulk",
+            json={
+                "tasks": [
+                    {"title": "Mine", "project_id": test_project.id},
+                    {"title": "Not mine", "project_id": other.id},
+                ]
+            },
+            headers=self._auth(member_token),
+        )
+        assert response.status_code == 403
+        assert response.json()["message"].startswith("tasks[1]:")
+        assert db_session.query(Task).count() == 0
+
+    def test_bulk_update_applies_transition_rules(
+        self, client, admin_token, test_project, test_member, db_session
+    ):
+        from app.models.extras import NotificationOutbox
+
+        tasks = [
+            Task(
+                title=f"T{i}",
+                project_id=test_project.id,
+                assignee_id=test_member.id,
+                status=TaskStatus.IN_PROGRESS,
+            )
+            for i in range(3)
+        ]
+        db_session.add_all(tasks)
+        db_session.commit()
+        ids = [t.id for t in tasks]
+
+        rejected = client.patch(
+            "/api/v1/tasks/bulk",
+            json={
+                "tasks": [
+                    {"id": ids[0], "status": "done"},
+                    {"id": ids[1], "status": "todo"},
+                ]
+            },
+            headers=self._auth(admin_token),
+        )
+        assert rejected.status_code == 400
+        assert rejected.json()["message"] == (
+            "tasks[1]: Cannot move task status backward"
+        )
+
+        response = client.patch(
+            "/api/v1/tasks/bulk",
+            json={
+                "tasks": [
+                    {"id": ids[0], "status": "done"},
+                    {"id": ids[1], "status": "done", "priority": "high"},
+                    {"id": ids[2], "title": "Renamed"},
+                ]
+            },
+            headers=self._auth(admin_token),
+        )
+        assert response.status_code == 200, response.text
+        data = {t["id"]: t for t in response.json()["data"]}
+        assert data[ids[0]]["status"] == "done"
+        assert data[ids[1]]["priority"] == "high"
+        assert data[ids[2]]["title"] == "Renamed"
+        assert data[ids[2]]["status"] == "in-progress"
+        assert data[ids[0]]["updated_at"] is not None
+        assert db_session.query(NotificationOutbox).count() == 2
+
+    def test_bulk_update_rejects_unknown_and_duplicate_ids(
+        self, client, admin_token, test_task
+    ):
+        for tasks in (
+            [{"id": test_task.id, "title": "a"}, {"id": test_task.id, "title": "b"}],
+            [{"id": test_task.id + 1000, "title": "a"}],
+        ):
+            response = client.patch(
+                "/api/v1/tasks/bulk",
+                json={"tasks": tasks},
+                headers=self._auth(admin_token),
+            )
+            assert response.status_code in (400, 404)
+
+
+class TestTaskImportExport:
+    """Streaming NDJSON/CSV export and batched import with a row report"""
+
+    def _auth(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_export_ndjson_and_csv(self, client, admin_token, test_task):
+        import csv
+        import io
+        import json
+
+        response = client.get(
+            "/api/v1/tasks/export", headers=self._auth(admin_token)
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = response.text.splitlines()
+        assert [json.loads(line)["title"] for line in lines] == ["Test Task"]
+
+        response = client.get(
+            "/api/v1/tasks/export?format=csv", headers=self._auth(admin_token)
+        )
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert rows[0]["title"] == "Test Task"
+        assert rows[0]["status"] == "todo"
+        assert rows[0]["description"] == "A test task"
+
+    def test_export_is_scoped_to_accessible_project(
+        self, client, member_token, test_task, test_project
+    ):
+        response = client.get(
+            f"/api/v1/tasks/export?project_id={test_project.id}",
+            headers=self._auth(member_token),
+        )
+        assert response.status_code == 403
+
+    def test_export_streams_in_batches(self, client, admin_token, test_project):
+        from app.config import settings
+
+        with patch.object(settings, "TASK_EXPORT_BATCH_SIZE", 7):
+            tasks = [
+                {"title": f"T{i}", "project_id": test_project.id} for i in range(50)
+            ]
+            client.post(
+                "/api/v1/tasks/bulk",
+                json={"tasks": tasks},
+                headers=self._auth(admin_token),
+            )
+            response = client.get(
+                "/api/v1/tasks/export", headers=self._auth(admin_token)
+            )
+        assert len(response.text.splitlines()) == 50
+
+    def test_import_reports_bad_rows_and_keeps_good_ones(
+        self, client, admin_token, test_project, db_session
+    ):
+        from app.config import settings
+
+        lines = [
+            '{"title": "One"}',
+            '{"title": "Two", "status": "bogus"}',
+            "not json",
+            '{"title": "Three", "project_id": 999}',
+            '{"title": "Four", "due_date": "2000-01-01T00:00:00"}',
+            '{"title": "Five", "priority": "high"}',
+        ]
+        with patch.object(settings, "TASK_IMPORT_BATCH_SIZE", 2):
+            response = client.post(
+                f"/api/v1/tasks/import?project_id={test_project.id}",
+                files={"file": ("tasks.ndjson", "\n".join(lines).encode())},
+                headers=self._auth(admin_token),
+            )
+        assert response.status_code == 200, response.text
+        report = response.json()["data"]
+        assert report["imported"] == 2
+        assert [e["row"] for e in report["errors"]] == [2, 3, 4, 5]
+        assert report["errors"][0]["error"].startswith("status:")
+        titles = {t.title for t in db_session.query(Task)}
+        assert titles == {"One", "Five"}
+
+    def test_csv_round_trip(self, client, admin_token, test_task, db_session):
+        exported = client.get(
+            "/api/v1/tasks/export?format=csv", headers=self._auth(admin_token)
+        ).content
+        response = client.post(
+            "/api/v1/tasks/import",
+            files={"file": ("tasks.csv", exported)},
+            headers=self._auth(admin_token),
+        )
+        assert response.json()["data"]["imported"] == 1
+        copies = db_session.query(Task).filter(Task.title == "Test Task").all()
+        assert len(copies) == 2
+        assert copies[1].description == copies[0].description
+
+    def test_csv_escapes_formulas(self, client, admin_token, test_task, db_session):
+        import csv
+        import io
+
+        test_task.title = "=HYPERLINK(\"http://x\")"
+        test_task.description = "'-quoted"
+        db_session.commit()
+        exported = client.get(
+            "/api/v1/tasks/export?format=csv", headers=self._auth(admin_token)
+        ).content
+        row = next(csv.DictReader(io.StringIO(exported.decode())))
+        assert row["title"] == "'=HYPERLINK(\"http://x\")"
+        assert row["description"] == "''-quoted"
+
+        client.post(
+            "/api/v1/tasks/import",
+            files={"file": ("tasks.csv", exported)},
+            headers=self._auth(admin_token),
+        )
+        copy = db_session.query(Task).order_by(Task.id.desc()).first()
+        assert copy.id != test_task.id
+        assert copy.title == test_task.title
+        assert copy.description == "'-quoted"
+
+
+class TestMembershipCache:
+    """Project access decisions are cached and dropped on membership changes"""
+
+    def _auth(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_repeated_checks_skip_membership_queries(
+        self, client, member_token, test_member, test_project, db_session
+    ):
+        from sqlalchemy import event
+
+        db_session.add(
+            ProjectMember(project_id=test_project.id, user_id=test_member.id)
+        )
+        db_session.commit()
+        url = f"/api/v1/tasks/?project_id={test_project.id}"
+        assert client.get(url, headers=self._auth(member_token)).status_code == 200
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.get(url, headers=self._auth(member_token))
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        assert response.status_code == 200
+        assert not any("FROM project_member" in s for s in statements)
+
+    def test_add_member_invalidates_cached_denial(
+        self, client, admin_token, member_token, test_member, test_project
+    ):
+        url = f"/api/v1/tasks/?project_id={test_project.id}"
+        assert client.get(url, headers=self._auth(member_token)).status_code == 403
+
+        client.post(
+            f"/api/v1/projects/{test_project.id}/members",
+            json={"user_id": test_member.id},
+            headers=self._auth(admin_token),
+        )
+        assert client.get(url, headers=self._auth(member_token)).status_code == 200
+
+    def test_role_change_invalidates_cached_access(
+        self, client, admin_token, member_token, test_member, test_project
+    ):
+        url = f"/api/v1/tasks/?project_id={test_project.id}"
+        promote = client.put(
+            f"/api/v1/users/{test_member.id}",
+            json={"role": "manager"},
+            headers=self._auth(admin_token),
+        )
+        assert promote.status_code == 200, promote.text
+        assert client.get(url, headers=self._auth(member_token)).status_code == 200
+
+        client.put(
+            f"/api/v1/users/{test_member.id}",
+            json={"role": "member"},
+            headers=self._auth(admin_token),
+        )
+        assert client.get(url, headers=self._auth(member_token)).status_code == 403
+
+    def test_invalidation_reaches_other_workers(self, shared_redis):
+        from types import SimpleNamespace
+        from app.core.membership_cache import FORBIDDEN, MembershipCache
+
+        worker_a = MembershipCache(max_entries=10, ttl=60)
+        worker_b = MembershipCache(max_entries=10, ttl=60)
+        worker_b.set_many(SimpleNamespace(info={}), 7, {3: FORBIDDEN})
+        assert worker_b.get_many(SimpleNamespace(info={}), 7, [3]) == {3: FORBIDDEN}
+
+        worker_a.invalidate(7, 3)
+        assert worker_b.get_many(SimpleNamespace(info={}), 7, [3]) == {}
+
+    def test_project_access_is_batched(
+        self, db_session, test_member, test_project, test_org
+    ):
+        from sqlalchemy import event
+        from app.services import task_service
+
+        other = Project(name="Other", organization_id=test_org.id)
+        db_session.add(other)
+        db_session.add(
+            ProjectMember(project_id=test_project.id, user_id=test_member.id)
+        )
+        db_session.commit()
+        ids = [test_project.id, other.id, 999]
+        db_session.refresh(test_member)
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            access = task_service.project_access(db_session, test_member, ids)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        assert access == {
+            test_project.id: "allowed",
+            other.id: "forbidden",
+            999: "missing",
+        }
+        assert len(statements) == 2
+
+
+class TestTaskFiltering:
+    """GET /tasks filters, sorts and searches in the database"""
+
+    def _auth(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def _seed(self, db_session, project):
+        now = datetime.now(timezone.utc)
+        tasks = [
+            Task(
+                title="Fix login redirect",
+                description="Users land on a blank page after signing in",
+                status=TaskStatus.TODO,
+                priority=TaskPriority.HIGH,
+                due_date=now - timedelta(days=2),
+                project_id=project.id,
+            ),
+            Task(
+                title="Write release notes",
+                status=TaskStatus.DONE,
+                priority=TaskPriority.LOW,
+                due_date=now - timedelta(days=1),
+                project_id=project.id,
+            ),
+            Task(
+                title="Upgrade database driver",
+                description="The login service pins an old version",
+                status=TaskStatus.IN_PROGRESS,
+                priority=TaskPriority.MEDIUM,
+                due_date=now + timedelta(days=3),
+                project_id=project.id,
+            ),
+            Task(
+                title="Plan offsite",
+                status=TaskStatus.TODO,
+                priority=TaskPriority.LOW,
+                project_id=project.id,
+            ),
+        ]
+        db_session.add_all(tasks)
+        db_session.commit()
+        return tasks
+
+    def _titles(self, response):
+        assert response.status_code == 200, response.text
+        return [t["title"] for t in response.json()["data"]]
+
+    def test_multi_value_status_and_priority(
+        self, client, admin_token, test_project, db_session
+    ):
+        self._seed(db_session, test_project)
+        response = client.get(
+            "/api/v1/tasks/?status=todo,in-progress&priority=high&priority=medium",
+            headers=self._auth(admin_token),
+        )
+        assert self._titles(response) == [
+            "Fix login redirect",
+            "Upgrade database driver",
+        ]
+
+    def test_due_range_and_overdue(
+        self, client, admin_token, test_project, db_session
+    ):
+        from app.services.task_service import task_service
+
+        self._seed(db_session, test_project)
+        task_service.scan_due_dates(db_session)
+        after = (datetime.now(timezone.utc) - timedelta(days=1, hours=12)).isoformat()
+        response = client.get(
+            "/api/v1/tasks/",
+            params={"due_after": after},
+            headers=self._auth(admin_token),
+        )
+        assert self._titles(response) == [
+            "Write release notes",
+            "Upgrade database driver",
+        ]
+
+        response = client.get(
+            "/api/v1/tasks/?overdue=true", headers=self._auth(admin_token)
+        )
+        assert self._titles(response) == ["Fix login redirect"]
+        response = client.get(
+            "/api/v1/tasks/?overdue=false", headers=self._auth(admin_token)
+        )
+        assert "Fix login redirect" not in self._titles(response)
+        assert len(response.json()["data"]) == 3
+
+    def test_sort_keys(self, client, admin_token, test_project, db_session):
+        self._seed(db_session, test_project)
+        response = client.get(
+            "/api/v1/tasks/?sort=-priority", headers=self._auth(admin_token)
+        )
+        assert self._titles(response) == [
+            "Fix login redirect",
+            "Upgrade database driver",
+            "Plan offsite",
+            "Write release notes",
+        ]
+        response = client.get(
+            "/api/v1/tasks/?sort=due_date", headers=self._auth(admin_token)
+        )
+        assert self._titles(response)[-1] == "Plan offsite"
+
+        response = client.get(
+            "/api/v1/tasks/?sort=colour", headers=self._auth(admin_token)
+        )
+        assert response.status_code == 422
+
+    def test_cursor_follows_sort(self, client, admin_token, test_project, db_session):
+        self._seed(db_session, test_project)
+        seen, cursor = [], None
+        while True:
+            params = {"sort": "-priority", "limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get(
+                "/api/v1/tasks/", params=params, headers=self._auth(admin_token)
+            )
+            seen += self._titles(response)
+            cursor = response.json()["next_cursor"]
+            if not cursor:
+                break
+        assert seen == [
+            "Fix login redirect",
+            "Upgrade database driver",
+            "Plan offsite",
+            "Write release notes",
+        ]
+
+        first = client.get(
+            "/api/v1/tasks/?sort=title&limit=1", headers=self._auth(admin_token)
+        ).json()["next_cursor"]
+        response = client.get(
+            f"/api/v1/tasks/?cursor={first}", headers=self._auth(admin_token)
+        )
+        assert response.status_code == 400
+
+    def test_full_text_search(self, client, admin_token, test_project, db_session):
+        tasks = self._seed(db_session, test_project)
+        response = client.get(
+            "/api/v1/tasks/?q=login", headers=self._auth(admin_token)
+        )
+        assert self._titles(response) == [
+            "Fix login redirect",
+            "Upgrade database driver",
+        ]
+        response = client.get(
+            "/api/v1/tasks/?q=signing page", headers=self._auth(admin_token)
+        )
+        assert self._titles(response) == ["Fix login redirect"]
+
+        tasks[3].description = "Book a venue near the login office"
+        db_session.commit()
+        response = client.get(
+            '/api/v1/tasks/?q=login "office', headers=self._auth(admin_token)
+        )
+        assert self._titles(response) == ["Plan offsite"]
+
+
+class TestProjectTaskStats:
+    """project_task_stats follows task writes and is read instead of counting"""
+
+    def _auth(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def _stats(self, client, token, project_id):
+        response = client.get(
+            f"/api/v1/projects/{project_id}/stats", headers=self._auth(token)
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["data"]
+
+    def test_counts_follow_single_and_bulk_writes(
+        self, client, admin_token, test_project, test_task
+    ):
+        assert self._stats(client, admin_token, test_project.id) == {
+            "todo": 1,
+            "in-progress": 0,
+            "done": 0,
+            "total": 1,
+            "overdue": 0,
+        }
+
+        client.put(
+            f"/api/v1/tasks/{test_task.id}",
+            json={"status": "in-progress"},
+            headers=self._auth(admin_token),
+        )
+        created = client.post(
+            "/api/v1/tasks/bulk",
+            json={
+                "tasks": [
+                    {"title": f"Bulk {i}", "project_id": test_project.id}
+                    for i in range(3)
+                ]
+            },
+            headers=self._auth(admin_token),
+        ).json()["data"]
+        client.patch(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [{"id": created[0]["id"], "status": "done"}]},
+            headers=self._auth(admin_token),
+        )
+
+        stats = self._stats(client, admin_token, test_project.id)
+        assert stats["todo"] == 2
+        assert stats["in-progress"] == 1
+        assert stats["done"] == 1
+        assert stats["total"] == 4
+
+    def test_stats_read_does_not_scan_tasks(
+        self, client, admin_token, test_project, test_task
+    ):
+        from sqlalchemy import event
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            self._stats(client, admin_token, test_project.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        assert any("FROM project_task_stats" in s for s in statements)
+        assert not any("FROM task" in s for s in statements)
+
+    def test_orm_delete_and_overdue(self, db_session, test_project, test_task):
+        from app.repositories import project_repository
+        from app.services.task_service import task_service
+
+        overdue = Task(
+            title="Late",
+            project_id=test_project.id,
+            due_date=datetime.now(timezone.utc) - timedelta(days=1),
+        )
+        db_session.add(overdue)
+        db_session.commit()
+        stats = project_repository.get_task_stats(db_session, test_project.id)
+        assert (stats["todo"], stats["overdue"]) == (2, 0)
+
+        # Counted once the scanner flags it, like the overdue filters.
+        task_service.scan_due_dates(db_session)
+        stats = project_repository.get_task_stats(db_session, test_project.id)
+        assert (stats["todo"], stats["overdue"]) == (2, 1)
+
+        overdue.due_date = datetime.now(timezone.utc) + timedelta(days=1)
+        db_session.commit()
+        stats = project_repository.get_task_stats(db_session, test_project.id)
+        assert stats["overdue"] == 0
+        task_service.scan_due_dates(
+            db_session, now=overdue.due_date + timedelta(hours=1)
+        )
+        stats = project_repository.get_task_stats(db_session, test_project.id)
+        assert stats["overdue"] == 1
+
+        db_session.delete(overdue)
+        db_session.commit()
+        stats = project_repository.get_task_stats(db_session, test_project.id)
+        assert (stats["todo"], stats["overdue"]) == (1, 0)
+
+    def test_reconcile_picks_up_writes_behind_the_counts(
+        self, db_session, test_project, test_task
+    ):
+        from sqlalchemy import update
+        from app.repositories import project_repository
+        from app.services.project_service import project_service
+
+        # Flag the task with a bulk UPDATE that records no deltas.
+        db_session.execute(
+            update(Task)
+            .where(Task.id == test_task.id)
+            .values(overdue_at=datetime.now(timezone.utc))
+        )
+        db_session.commit()
+        stats = project_repository.get_task_stats(db_session, test_project.id)
+        assert stats["overdue"] == 0
+
+        assert project_service.reconcile_task_stats(db_session) == 1
+        stats = project_repository.get_task_stats(db_session, test_project.id)
+        assert stats["overdue"] == 1
+        assert stats["total"] == 1
+
+
+class TestOrganizationDashboard:
+    """GET /organizations/{id}/dashboard aggregates every visible project"""
+
+    def _auth(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def _seed(self, db_session, test_org, test_project, test_admin, test_member):
+        from app.services.task_service import task_service
+
+        other = Project(name="Other", organization_id=test_org.id)
+        db_session.add(other)
+        db_session.flush()
+        past = datetime.now(timezone.utc) - timedelta(days=1)
+        db_session.add_all(
+            [
+                Task(title="A", project_id=test_project.id, assignee_id=test_member.id),
+                Task(
+                    title="B",
+                    project_id=test_project.id,
+                    assignee_id=test_member.id,
+                    status=TaskStatus.IN_PROGRESS,
+                    due_date=past,
+                ),
+                Task(title="C", project_id=test_project.id, status=TaskStatus.DONE),
+                Task(title="D", project_id=other.id, assignee_id=test_admin.id),
+                ProjectMember(project_id=test_project.id, user_id=test_member.id),
+            ]
+        )
+        db_session.commit()
+        task_service.scan_due_dates(db_session)
+        return other
+
+    def test_admin_sees_whole_organization(
+        self,
+        client,
+        admin_token,
+        db_session,
+        test_org,
+        test_project,
+        test_admin,
+        test_member,
+    ):
+        other = self._seed(db_session, test_org, test_project, test_admin, test_member)
+        response = client.get(
+            f"/api/v1/organizations/{test_org.id}/dashboard",
+            headers=self._auth(admin_token),
+        )
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+
+        assert data["totals"] == {
+            "todo": 2,
+            "in_progress": 1,
+            "done": 1,
+            "overdue": 1,
+            "total": 4,
+        }
+        assert [(p["id"], p["total"]) for p in data["projects"]] == [
+            (test_project.id, 3),
+            (other.id, 1),
+        ]
+        workload = {w["user_id"]: w for w in data["workload"]}
+        assert workload[test_member.id]["open"] == 2
+        assert workload[test_member.id]["in_progress"] == 1
+        assert workload[test_member.id]["overdue"] == 1
+        assert workload[test_admin.id]["open"] == 1
+        assert data["workload"][0]["user_id"] == test_member.id
+        assert {a["title"] for a in data["recent_activity"]} == {"A", "B", "C", "D"}
+
+    def test_member_sees_only_their_projects(
+        self,
+        client,
+        member_token,
+        db_session,
+        test_org,
+        test_project,
+        test_admin,
+        test_member,
+    ):
+        self._seed(db_session, test_org, test_project, test_admin, test_member)
+        response = client.get(
+            f"/api/v1/organizations/{test_org.id}/dashboard",
+            headers=self._auth(member_token),
+        )
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+        assert [p["id"] for p in data["projects"]] == [test_project.id]
+        assert data["totals"]["total"] == 3
+        assert test_admin.id not in {w["user_id"] for w in data["workload"]}
+        assert "D" not in {a["title"] for a in data["recent_activity"]}
+
+    def test_activity_is_capped_per_project(
+        self, client, admin_token, db_session, test_org, test_project
+    ):
+        from app.config import settings
+
+        db_session.add_all(
+            Task(title=f"T{i}", project_id=test_project.id) for i in range(8)
+        )
+        db_session.commit()
+        response = client.get(
+            f"/api/v1/organizations/{test_org.id}/dashboard",
+            headers=self._auth(admin_token),
+        )
+        activity = response.json()["data"]["recent_activity"]
+        assert len(activity) == settings.DASHBOARD_ACTIVITY_PER_PROJECT
+
+    def test_overdue_figures_agree_before_a_scan(
+        self, client, admin_token, db_session, test_org, test_project, test_admin
+    ):
+        db_session.add(
+            Task(
+                title="Late",
+                project_id=test_project.id,
+                assignee_id=test_admin.id,
+                due_date=datetime.now(timezone.utc) - timedelta(hours=1),
+            )
+        )
+        db_session.commit()
+        response = client.get(
+            f"/api/v1/organizations/{test_org.id}/dashboard",
+            headers=self._auth(admin_token),
+        )
+        data = response.json()["data"]
+        assert data["totals"]["overdue"] == 0
+        assert [w["overdue"] for w in data["workload"]] == [0]
+
+    def test_other_organization_is_not_found(self, client, admin_token, test_org):
+        response = client.get(
+            f"/api/v1/organizations/{test_org.id + 1}/dashboard",
+            headers=self._auth(admin_token),
+        )
+        assert response.status_code == 404
+
+
+class TestDueDateScanner:
+    """Due-soon and overdue notifications go out once per task"""
+
+    def _seed(self, db_session, project, assignee):
+        now = datetime.utcnow()
+        tasks = {
+            "soon": Task(
+                title="Soon",
+                project_id=project.id,
+                assignee_id=assignee.id,
+                due_date=now + timedelta(hours=2),
+            ),
+            "late": Task(
+                title="Late",
+                project_id=project.id,
+                assignee_id=assignee.id,
+                due_date=now - timedelta(hours=2),
+            ),
+            "later": Task(
+                title="Later",
+                project_id=project.id,
+                assignee_id=assignee.id,
+                due_date=now + timedelta(days=30),
+            ),
+            "finished": Task(
+                title="Finished",
+                project_id=project.id,
+                assignee_id=assignee.id,
+                status=TaskStatus.DONE,
+                due_date=now - timedelta(days=1),
+            ),
+        }
+        db_session.add_all(tasks.values())
+        db_session.commit()
+        return tasks
+
+    def test_scan_notifies_once(self, db_session, test_project, test_member):
+        from app.models.extras import NotificationOutbox
+        from app.services.task_service import task_service
+
+        self._seed(db_session, test_project, test_member)
+        assert task_service.scan_due_dates(db_session) == {
+            "due_soon": 1,
+            "overdue": 1,
+        }
+        messages = {n.title for n in db_session.query(NotificationOutbox)}
+        assert messages == {"Task Due Soon", "Task Overdue"}
+
+        assert task_service.scan_due_dates(db_session) == {
+            "due_soon": 0,
+            "overdue": 0,
+        }
+        assert db_session.query(NotificationOutbox).count() == 2
+
+    def test_overdue_list_reads_flag(
+        self, client, admin_token, db_session, test_project, test_member
+    ):
+        from app.services.task_service import task_service
+
+        tasks = self._seed(db_session, test_project, test_member)
+        task_service.scan_due_dates(db_session)
+        response = client.get(
+            f"/api/v1/projects/{test_project.id}/overdue",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+        assert response.status_code == 200, response.text
+        assert [t["id"] for t in response.json()["data"]] == [tasks["late"].id]
+
+    def test_new_due_date_notifies_again(
+        self, client, admin_token, db_session, test_project, test_member
+    ):
+        from app.services.task_service import task_service
+
+        tasks = self._seed(db_session, test_project, test_member)
+        task_service.scan_due_dates(db_session)
+        response = client.put(
+            f"/api/v1/tasks/{tasks['soon'].id}",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"due_date": (datetime.utcnow() + timedelta(hours=5)).isoformat()},
+        )
+        assert response.status_code == 200, response.text
+        assert task_service.scan_due_dates(db_session) == {
+            "due_soon": 1,
+            "overdue": 0,
+        }
+
+    def test_resending_due_date_keeps_flags(
+        self, client, admin_token, db_session, test_project, test_member
+    ):
+        from app.services.task_service import task_service
+
+        tasks = self._seed(db_session, test_project, test_member)
+        task_service.scan_due_dates(db_session)
+        soon = tasks["soon"]
+        due_date = soon.due_date.replace(tzinfo=timezone.utc)
+        response = client.put(
+            f"/api/v1/tasks/{soon.id}",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"due_date": due_date.isoformat()},
+        )
+        assert response.status_code == 200, response.text
+        response = client.patch(
+            "/api/v1/tasks/bulk",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"tasks": [{"id": soon.id, "due_date": due_date.isoformat()}]},
+        )
+        assert response.status_code == 200, response.text
+        assert task_service.scan_due_dates(db_session) == {
+            "due_soon": 0,
+            "overdue": 0,
+        }